@@ -0,0 +1,136 @@
+"""
+Representação compacta de cromossomos para o algoritmo genético da mochila.
+
+Cada cromossomo é guardado em um único inteiro Python, onde o bit i indica se o item i
+está na mochila. Isso ocupa cerca de num_items / 8 bytes por indivíduo, contra 8 bytes
+por gene (um ponteiro por elemento) de uma List[int]. Cruzamento e mutação viram
+operações de máscara (AND/OR/XOR) e as somas de peso e valor usam tabelas pré-calculadas
+por byte do cromossomo.
+"""
+import random
+from array import array
+from typing import List, Tuple, Sequence
+
+
+class CromossomoCompacto:
+    """Cromossomo de `tamanho` genes guardado nos bits de um inteiro (bit i = gene i)."""
+    __slots__ = ("bits", "tamanho")
+
+    def __init__(self, bits: int, tamanho: int):
+        self.bits = bits
+        self.tamanho = tamanho
+
+    @classmethod
+    def de_lista(cls, individuo: Sequence[int]) -> "CromossomoCompacto":
+        """Converte um cromossomo List[int] para a forma compacta."""
+        bits = 0
+        for i, gene in enumerate(individuo):
+            if gene == 1:
+                bits |= 1 << i
+        return cls(bits, len(individuo))
+
+    def para_lista(self) -> List[int]:
+        """Converte de volta para List[int], o formato usado no histórico e no Streamlit."""
+        return [(self.bits >> i) & 1 for i in range(self.tamanho)]
+
+    def contar_itens(self) -> int:
+        """Número de itens selecionados (popcount)."""
+        return self.bits.bit_count()
+
+    def __len__(self) -> int:
+        return self.tamanho
+
+    def __getitem__(self, i: int) -> int:
+        if not 0 <= i < self.tamanho:
+            raise IndexError("Índice de gene fora do cromossomo.")
+        return (self.bits >> i) & 1
+
+    def __eq__(self, outro: object) -> bool:
+        if not isinstance(outro, CromossomoCompacto):
+            return NotImplemented
+        return self.bits == outro.bits and self.tamanho == outro.tamanho
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.tamanho))
+
+    def __repr__(self) -> str:
+        return f"CromossomoCompacto({self.bits:0{self.tamanho}b}, tamanho={self.tamanho})"
+
+
+class TabelaSomasCompactas:
+    """
+    Tabelas de somas de peso e valor por byte do cromossomo.
+    Para o byte j e cada um dos 256 padrões de bits, guarda a soma dos pesos (e valores) dos
+    itens 8j..8j+7 selecionados por aquele padrão. Somar um cromossomo custa então uma
+    consulta por byte não nulo, em vez de uma operação por gene.
+    """
+
+    def __init__(self, pesos: Sequence[int], valores: Sequence[int]):
+        self.num_items = len(pesos)
+        self.num_bytes = (self.num_items + 7) // 8
+        self.pesos = array("q", bytes(8 * 256 * self.num_bytes))
+        self.valores = array("q", bytes(8 * 256 * self.num_bytes))
+        for j in range(self.num_bytes):
+            base = j * 256
+            for padrao in range(1, 256):
+                # Soma do padrão = soma do padrão sem o bit mais baixo + item do bit mais baixo
+                bit_baixo = (padrao & -padrao).bit_length() - 1
+                item = j * 8 + bit_baixo
+                anterior = base + (padrao & (padrao - 1))
+                if item < self.num_items:
+                    self.pesos[base + padrao] = self.pesos[anterior] + pesos[item]
+                    self.valores[base + padrao] = self.valores[anterior] + valores[item]
+                else:
+                    self.pesos[base + padrao] = self.pesos[anterior]
+                    self.valores[base + padrao] = self.valores[anterior]
+
+    def somar(self, cromossomo: CromossomoCompacto) -> Tuple[int, int]:
+        """Retorna (peso_total, valor_total) do cromossomo."""
+        peso_total = 0
+        valor_total = 0
+        pesos = self.pesos
+        valores = self.valores
+        for j, byte in enumerate(cromossomo.bits.to_bytes(self.num_bytes, "little")):
+            if byte:
+                posicao = (j << 8) | byte
+                peso_total += pesos[posicao]
+                valor_total += valores[posicao]
+        return peso_total, valor_total
+
+    def calcular_detalhes(self, cromossomo: CromossomoCompacto, capacidade_maxima: int) -> Tuple[int, int, int]:
+        """Equivalente a calcular_detalhes_individuo: (pontuacao_fitness, valor_total_real, peso_total_real)."""
+        peso_total, valor_total = self.somar(cromossomo)
+        pontuacao_fitness = 0 if peso_total > capacidade_maxima else valor_total  # Penaliza soluções inválidas
+        return pontuacao_fitness, valor_total, peso_total
+
+
+def criar_cromossomo_compacto(num_items: int, gerador=random) -> CromossomoCompacto:
+    """Cria um cromossomo compacto aleatório (`gerador` como em criar_individuo)."""
+    return CromossomoCompacto(gerador.getrandbits(num_items) if num_items > 0 else 0, num_items)
+
+def cruzar_compactos_no_ponto(pai1: CromossomoCompacto, pai2: CromossomoCompacto, ponto: int) -> Tuple[CromossomoCompacto, CromossomoCompacto]:
+    """Equivalente a cruzar_no_ponto para cromossomos compactos."""
+    tamanho = pai1.tamanho
+    mascara = (1 << ponto) - 1
+    diferenca = (pai1.bits ^ pai2.bits) & mascara
+    # Troca os genes abaixo do ponto apenas onde os pais diferem
+    return CromossomoCompacto(pai2.bits ^ diferenca, tamanho), CromossomoCompacto(pai1.bits ^ diferenca, tamanho)
+
+def inverter_genes_compacto(individuo: CromossomoCompacto, posicoes: List[int]) -> CromossomoCompacto:
+    """Equivalente a inverter_genes: XOR com a máscara das posições dadas."""
+    mascara = 0
+    for i in posicoes:
+        mascara |= 1 << i
+    if not mascara:
+        return individuo
+    return CromossomoCompacto(individuo.bits ^ mascara, individuo.tamanho)
+
+def posicoes_diferentes_compactas(individuo1: CromossomoCompacto, individuo2: CromossomoCompacto, inicio: int, fim: int) -> List[int]:
+    """Equivalente a posicoes_diferentes; percorre apenas os bits que diferem, não o trecho inteiro."""
+    diferenca = ((individuo1.bits ^ individuo2.bits) >> inicio) & ((1 << (fim - inicio)) - 1)
+    posicoes = []
+    while diferenca:
+        bit_baixo = diferenca & -diferenca
+        posicoes.append(inicio + bit_baixo.bit_length() - 1)
+        diferenca ^= bit_baixo
+    return posicoes
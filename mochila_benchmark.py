@@ -0,0 +1,203 @@
+"""
+Benchmark do algoritmo genético da mochila com as famílias clássicas de instâncias de Pisinger.
+
+Para cada combinação de tipo de instância, número de itens e motor, executa o AG e mede:
+gerações por segundo, avaliações por segundo (as de fato feitas, ver
+estatisticas["avaliacoes"] do AG), pico de memória (tracemalloc, em uma execução
+separada para não distorcer o tempo), tempo até atingir o alvo e gap de otimalidade em
+relação a uma referência. A referência é o ótimo (resolver_exato) quando a programação
+dinâmica cabe em LIMITE_CELULAS_DP; acima disso é o limite da relaxação fracionária, e o
+gap informado é então um limite superior do gap real.
+
+Os resultados são gravados em JSON para comparar versões:
+
+    python mochila_benchmark.py --tamanhos 50 100 1000 --saida benchmark.json
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mochila_exata import LIMITE_CELULAS_DP, limite_superior_fracionario, resolver_exato
+from mochila_ga import MOTORES, algoritmo_genetico_mochila_geracoes
+
+# Famílias de instâncias de Pisinger ("Where are the hard knapsack problems?", 2005)
+TIPOS_INSTANCIA = ("nao_correlacionada", "fracamente_correlacionada", "fortemente_correlacionada", "subset_sum")
+
+
+def gerar_instancia(tipo: str,
+                    num_items: int,
+                    faixa: int = 1000,
+                    fracao_capacidade: float = 0.5,
+                    seed: Optional[int] = None) -> Tuple[List[Tuple[str, int, int]], int]:
+    """
+    Gera uma instância (items_data, capacidade_maxima) de uma família de Pisinger, com pesos
+    uniformes em [1, faixa]:
+    - "nao_correlacionada": valores uniformes em [1, faixa];
+    - "fracamente_correlacionada": valores em [peso - faixa/10, peso + faixa/10] (mínimo 1);
+    - "fortemente_correlacionada": valor = peso + faixa/10;
+    - "subset_sum": valor = peso.
+    A capacidade é `fracao_capacidade` da soma dos pesos.
+    """
+    if tipo not in TIPOS_INSTANCIA:
+        raise ValueError(f"Tipo de instância desconhecido: '{tipo}'. Opções: {', '.join(TIPOS_INSTANCIA)}.")
+    if faixa < 1:
+        raise ValueError("A faixa dos coeficientes deve ser positiva.")
+    gerador = random.Random(seed)
+    decimo = faixa // 10
+    items_data = []
+    for i in range(num_items):
+        peso = gerador.randint(1, faixa)
+        if tipo == "nao_correlacionada":
+            valor = gerador.randint(1, faixa)
+        elif tipo == "fracamente_correlacionada":
+            valor = max(1, gerador.randint(peso - decimo, peso + decimo))
+        elif tipo == "fortemente_correlacionada":
+            valor = peso + decimo
+        else:
+            valor = peso
+        items_data.append((f"Item {i}", peso, valor))
+    capacidade_maxima = int(fracao_capacidade * sum(peso for _, peso, _ in items_data))
+    return items_data, capacidade_maxima
+
+
+def calcular_referencia(items_data: List[Tuple[str, int, int]], capacidade_maxima: int) -> Tuple[int, str]:
+    """
+    Valor de referência para o gap: ("otimo") pelo solver exato se a programação dinâmica
+    couber em LIMITE_CELULAS_DP, senão ("limite_superior") pela relaxação fracionária.
+    """
+    if len(items_data) * (max(capacidade_maxima, 0) + 1) <= LIMITE_CELULAS_DP:
+        return resolver_exato(items_data, capacidade_maxima)[1], "otimo"
+    return limite_superior_fracionario(items_data, capacidade_maxima), "limite_superior"
+
+
+def executar_caso(items_data: List[Tuple[str, int, int]],
+                  capacidade_maxima: int,
+                  referencia: int,
+                  tolerancia_alvo: float = 0.01,
+                  medir_memoria: bool = True,
+                  **parametros_ag: Any) -> Dict[str, Any]:
+    """
+    Executa o AG em uma instância e retorna as métricas do caso. O alvo é atingir
+    (1 - tolerancia_alvo) × referencia; `tempo_ate_alvo` é None se não for atingido.
+    `avaliacoes_por_segundo` conta as avaliações completas e incrementais de fato feitas pelo
+    AG: os elites mantidos e os acertos do cache de fitness não entram.
+    """
+    alvo = (1 - tolerancia_alvo) * referencia
+    tempo_ate_alvo = None
+    melhor_fitness = 0
+    num_geracoes = 0
+    geracoes = algoritmo_genetico_mochila_geracoes(items_data, capacidade_maxima, **parametros_ag)
+    inicio = time.perf_counter()
+    while True:
+        try:
+            estado = next(geracoes)
+        except StopIteration as fim:
+            resumo = fim.value or {}
+            break
+        num_geracoes += 1
+        melhor_fitness = estado.fitness
+        if tempo_ate_alvo is None and melhor_fitness >= alvo:
+            tempo_ate_alvo = time.perf_counter() - inicio
+    tempo_total = time.perf_counter() - inicio
+    avaliacoes = resumo.get("estatisticas", {}).get("avaliacoes", {"completas": 0, "incrementais": 0})
+    num_avaliacoes = avaliacoes["completas"] + avaliacoes["incrementais"]
+
+    pico_memoria = None
+    if medir_memoria:
+        # Execução separada: o rastreamento do tracemalloc deixaria a execução cronometrada mais lenta
+        tracemalloc.start()
+        for _ in algoritmo_genetico_mochila_geracoes(items_data, capacidade_maxima, **parametros_ag):
+            pass
+        pico_memoria = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "tempo_total": tempo_total,
+        "geracoes": num_geracoes,
+        "geracoes_por_segundo": num_geracoes / tempo_total if tempo_total > 0 else None,
+        "avaliacoes_completas": avaliacoes["completas"],
+        "avaliacoes_incrementais": avaliacoes["incrementais"],
+        "avaliacoes_por_segundo": num_avaliacoes / tempo_total if tempo_total > 0 else None,
+        "pico_memoria_bytes": pico_memoria,
+        "tempo_ate_alvo": tempo_ate_alvo,
+        "melhor_fitness": melhor_fitness,
+        "gap_otimalidade": (referencia - melhor_fitness) / referencia if referencia > 0 else 0.0,
+    }
+
+
+def executar_benchmark(tamanhos: List[int],
+                       tipos: Sequence[str] = TIPOS_INSTANCIA,
+                       motores: Sequence[str] = ("python",),
+                       faixa: int = 1000,
+                       seed: int = 0,
+                       tolerancia_alvo: float = 0.01,
+                       medir_memoria: bool = True,
+                       **parametros_ag: Any) -> Dict[str, Any]:
+    """
+    Executa todas as combinações de tipo × tamanho × motor e retorna o relatório completo
+    (ambiente, parâmetros e uma entrada por caso), pronto para json.dump. Cada instância é
+    gerada com a mesma seed para todos os motores, e a referência é calculada uma vez.
+    """
+    for motor in motores:
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconhecido: '{motor}'. Opções: {', '.join(MOTORES)}.")
+    try:
+        import numpy
+        versao_numpy = numpy.__version__
+    except ImportError:
+        versao_numpy = None
+
+    resultados = []
+    for tipo in tipos:
+        for num_items in tamanhos:
+            items_data, capacidade_maxima = gerar_instancia(tipo, num_items, faixa, seed=seed)
+            inicio = time.perf_counter()
+            referencia, tipo_referencia = calcular_referencia(items_data, capacidade_maxima)
+            tempo_referencia = time.perf_counter() - inicio
+            for motor in motores:
+                caso = executar_caso(items_data, capacidade_maxima, referencia, tolerancia_alvo,
+                                     medir_memoria, motor=motor, seed=seed, **parametros_ag)
+                resultados.append(dict(
+                    tipo=tipo, num_items=num_items, capacidade=capacidade_maxima, motor=motor,
+                    referencia=referencia, tipo_referencia=tipo_referencia,
+                    tempo_referencia=tempo_referencia, **caso
+                ))
+
+    return {
+        "data": datetime.now(timezone.utc).isoformat(),
+        "ambiente": {"python": platform.python_version(), "numpy": versao_numpy, "plataforma": platform.platform()},
+        "parametros": dict(parametros_ag, faixa=faixa, seed=seed, tolerancia_alvo=tolerancia_alvo),
+        "resultados": resultados,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do algoritmo genético da mochila.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[50, 100, 1000])
+    parser.add_argument("--tipos", nargs="+", choices=TIPOS_INSTANCIA, default=list(TIPOS_INSTANCIA))
+    parser.add_argument("--motores", nargs="+", choices=MOTORES, default=["python"])
+    parser.add_argument("--tam-populacao", type=int, default=100)
+    parser.add_argument("--num-geracoes", type=int, default=200)
+    parser.add_argument("--faixa", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerancia-alvo", type=float, default=0.01)
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória (evita a segunda execução).")
+    parser.add_argument("--saida", default="benchmark.json")
+    args = parser.parse_args()
+
+    relatorio = executar_benchmark(
+        args.tamanhos, args.tipos, args.motores, args.faixa, args.seed, args.tolerancia_alvo,
+        not args.sem_memoria, tam_populacao=args.tam_populacao, num_geracoes=args.num_geracoes
+    )
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    for caso in relatorio["resultados"]:
+        print(f"{caso['tipo']:>26} n={caso['num_items']:<6} {caso['motor']:>6}: "
+              f"{caso['geracoes_por_segundo']:8.1f} ger/s, gap {caso['gap_otimalidade']:.4f} ({caso['tipo_referencia']})")
+    print(f"Resultados gravados em {args.saida}")
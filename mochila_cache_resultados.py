@@ -0,0 +1,199 @@
+"""
+Cache de resultados do algoritmo genético, compartilhado entre sessões (por exemplo, entre os
+usuários de um mesmo servidor Streamlit).
+
+A chave (chave_execucao) é um hash SHA-256 de uma representação canônica da instância e de
+todos os parâmetros do AG: os pesos e valores dos itens (os nomes não mudam o resultado), a
+capacidade e os parâmetros de algoritmo_genetico_mochila_geracoes com os valores padrão
+preenchidos, então omitir um parâmetro ou passá-lo com o valor padrão dá a mesma chave. Só
+execuções determinísticas são guardadas: sem seed, com limite de tempo, com instrumentação ou
+com checkpoints não há chave. Com seed, cada execução sorteia com o seu próprio gerador, então
+o resultado guardado não depende de outras execuções simultâneas no mesmo processo.
+
+CacheResultados guarda os HistoricoAG em memória (LRU com tamanho máximo) e, opcionalmente, em
+um diretório (um arquivo pickle por chave, descartando os usados há mais tempo acima de
+`tamanho_maximo_disco`). O diretório deve ser de confiança, pois os arquivos são lidos com pickle.
+Requisições idênticas simultâneas em obter_ou_calcular esperam a primeira em vez de repetir a busca;
+quem precisa acompanhar a execução (como a interface) passa o próprio cálculo em `calcular`.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mochila_ga import HistoricoAG, algoritmo_genetico_mochila_geracoes, algoritmo_genetico_mochila_iterativo, pesos_e_valores
+
+# Parâmetros que não entram na chave: não mudam o resultado ou impedem o cache
+PARAMETROS_FORA_DA_CHAVE = ("items_data", "capacidade_maxima", "instrumentacao", "arquivo_checkpoint",
+                            "intervalo_checkpoint", "checkpoint_inicial")
+
+_PARAMETROS_PADRAO = {
+    nome: parametro.default
+    for nome, parametro in inspect.signature(algoritmo_genetico_mochila_geracoes).parameters.items()
+    if nome not in PARAMETROS_FORA_DA_CHAVE
+}
+
+
+def chave_execucao(items_data: List[Tuple[str, int, int]], capacidade_maxima: int, **parametros_ag: Any) -> Optional[str]:
+    """
+    Chave canônica de uma execução de algoritmo_genetico_mochila_iterativo, ou None se o
+    resultado não puder ser reaproveitado (sem seed, com tempo_maximo, instrumentação ou checkpoint).
+    """
+    desconhecidos = set(parametros_ag) - set(_PARAMETROS_PADRAO) - set(PARAMETROS_FORA_DA_CHAVE)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos do algoritmo genético: {', '.join(sorted(desconhecidos))}.")
+    if any(parametros_ag.get(nome) is not None for nome in ("instrumentacao", "arquivo_checkpoint", "checkpoint_inicial")):
+        return None
+    parametros = {nome: parametros_ag.get(nome, padrao) for nome, padrao in _PARAMETROS_PADRAO.items()}
+    if parametros["seed"] is None or parametros["tempo_maximo"]:
+        return None
+    pesos, valores = pesos_e_valores(items_data)
+    descricao = {"pesos": pesos, "valores": valores, "capacidade": capacidade_maxima, "parametros": parametros}
+    try:
+        texto = json.dumps(descricao, sort_keys=True, separators=(",", ":"))
+    except TypeError:
+        return None  # Parâmetro sem representação canônica (por exemplo, um objeto arbitrário)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+class CacheResultados:
+    """
+    Cache LRU de HistoricoAG por chave_execucao, em memória e opcionalmente em `diretorio`.
+    Seguro para uso por várias threads. Conta acertos (em memória ou em disco) e falhas.
+    """
+
+    def __init__(self, tamanho_maximo: int = 128, diretorio: Optional[str] = None, tamanho_maximo_disco: int = 1024):
+        if tamanho_maximo <= 0 or tamanho_maximo_disco <= 0:
+            raise ValueError("O tamanho máximo do cache deve ser positivo.")
+        self.tamanho_maximo = tamanho_maximo
+        self.diretorio = diretorio
+        self.tamanho_maximo_disco = tamanho_maximo_disco
+        self.acertos = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self._entradas: "OrderedDict[str, HistoricoAG]" = OrderedDict()
+        self._trava = threading.Lock()
+        self._em_andamento: Dict[str, threading.Event] = {}
+        if diretorio is not None:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + ".pkl")
+
+    def obter(self, chave: str) -> Optional[HistoricoAG]:
+        """Histórico guardado para `chave` (na memória ou no disco), ou None."""
+        with self._trava:
+            historico = self._entradas.get(chave)
+            if historico is not None:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return historico
+        if self.diretorio is not None:
+            caminho = self._caminho(chave)
+            try:
+                with open(caminho, "rb") as arquivo:
+                    historico = pickle.load(arquivo)
+                os.utime(caminho)  # Marca o arquivo como usado agora, para o descarte LRU
+            except (OSError, pickle.UnpicklingError, EOFError):
+                historico = None
+            if historico is not None:
+                with self._trava:
+                    self.acertos_disco += 1
+                    self._guardar_na_memoria(chave, historico)
+                return historico
+        with self._trava:
+            self.falhas += 1
+        return None
+
+    def _guardar_na_memoria(self, chave: str, historico: HistoricoAG) -> None:
+        self._entradas[chave] = historico
+        self._entradas.move_to_end(chave)
+        if len(self._entradas) > self.tamanho_maximo:
+            self._entradas.popitem(last=False)  # Descarta a entrada usada há mais tempo
+
+    def guardar(self, chave: str, historico: HistoricoAG) -> None:
+        """Guarda o histórico na memória e, se houver diretório, em disco (escrita atômica)."""
+        with self._trava:
+            self._guardar_na_memoria(chave, historico)
+        if self.diretorio is None:
+            return
+        caminho = self._caminho(chave)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            pickle.dump(historico, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+        self._descartar_do_disco()
+
+    def _descartar_do_disco(self) -> None:
+        arquivos = []
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(".pkl"):
+                    try:
+                        arquivos.append((entrada.stat().st_mtime, entrada.path))
+                    except OSError:
+                        pass  # Removido por outro processo
+        excesso = len(arquivos) - self.tamanho_maximo_disco
+        if excesso > 0:
+            for _, caminho in sorted(arquivos)[:excesso]:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+
+    def obter_ou_calcular(self,
+                          items_data: List[Tuple[str, int, int]],
+                          capacidade_maxima: int,
+                          calcular: Optional[Callable[[], HistoricoAG]] = None,
+                          ao_aguardar: Optional[Callable[[], None]] = None,
+                          **parametros_ag: Any) -> Tuple[HistoricoAG, bool]:
+        """
+        Retorna (historico, veio_do_cache). Em uma falha executa algoritmo_genetico_mochila_iterativo
+        (ou `calcular`, que deve produzir o mesmo histórico, por exemplo mostrando o progresso) e
+        guarda o resultado; se outra thread já estiver calculando a mesma chave, chama `ao_aguardar`
+        e espera por ela. Se o cálculo levantar uma exceção, nada é guardado e quem estava esperando
+        tenta de novo. Execuções sem chave (ver chave_execucao) são sempre calculadas.
+        """
+        if calcular is None:
+            calcular = lambda: algoritmo_genetico_mochila_iterativo(items_data, capacidade_maxima, **parametros_ag)
+        chave = chave_execucao(items_data, capacidade_maxima, **parametros_ag)
+        if chave is None:
+            return calcular(), False
+        while True:
+            historico = self.obter(chave)
+            if historico is not None:
+                return historico, True
+            with self._trava:
+                evento = self._em_andamento.get(chave)
+                if evento is None:
+                    evento = self._em_andamento[chave] = threading.Event()
+                    break
+            if ao_aguardar is not None:
+                ao_aguardar()
+            evento.wait()  # Outra thread está calculando: tenta de novo quando ela terminar
+        try:
+            historico = calcular()
+            self.guardar(chave, historico)
+        finally:
+            with self._trava:
+                del self._em_andamento[chave]
+            evento.set()
+        return historico, False
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Contadores do cache: acertos (memória e disco), falhas, entradas atuais e limites."""
+        return {
+            "acertos": self.acertos,
+            "acertos_disco": self.acertos_disco,
+            "falhas": self.falhas,
+            "entradas": len(self._entradas),
+            "tamanho_maximo": self.tamanho_maximo,
+            "diretorio": self.diretorio,
+        }
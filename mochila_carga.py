@@ -0,0 +1,144 @@
+"""
+Teste de carga do serviço HTTP da mochila (mochila_servico.py): envia tarefas com várias
+threads, acompanha cada uma pelos server-sent events até o fim e mede tarefas por segundo
+e as latências vistas pelo cliente.
+
+    python mochila_carga.py --tarefas 200 --concorrencia 16            # sobe um serviço local
+    python mochila_carga.py --url http://127.0.0.1:8765 --tarefas 200  # usa um serviço já rodando
+
+Cada tarefa usa uma seed diferente (a partir de --seed), para não ser respondida pelo cache de
+resultados; --repetir-seed faz todas usarem a mesma seed e mede o caminho do cache.
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _requisitar(url: str, metodo: str = "GET", dados: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+    corpo = json.dumps(dados).encode("utf-8") if dados is not None else None
+    pedido = urllib.request.Request(url, data=corpo, method=metodo, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(pedido) as resposta:
+            return resposta.status, json.loads(resposta.read())
+    except urllib.error.HTTPError as erro:
+        return erro.code, json.loads(erro.read() or b"{}")
+
+
+def acompanhar_eventos(url: str, id_tarefa: str) -> Tuple[int, Dict[str, Any]]:
+    """Lê os server-sent events da tarefa até o evento "fim"; retorna (eventos de progresso, dados do fim)."""
+    num_progresso = 0
+    with urllib.request.urlopen(f"{url}/tarefas/{id_tarefa}/eventos") as resposta:
+        tipo = None
+        for linha in resposta:
+            linha = linha.decode("utf-8").rstrip("\n")
+            if linha.startswith("event: "):
+                tipo = linha[len("event: "):]
+            elif linha.startswith("data: "):
+                if tipo == "fim":
+                    return num_progresso, json.loads(linha[len("data: "):])
+                num_progresso += 1
+    raise ConnectionError(f"A conexão de eventos da tarefa {id_tarefa} terminou sem o evento 'fim'.")
+
+
+def gerar_instancia(num_items: int, seed: int) -> Tuple[List[List[Any]], int]:
+    """Instância aleatória: itens [nome, peso, valor] e capacidade de metade do peso total."""
+    rng = random.Random(seed)
+    itens = [[f"item{i}", rng.randint(1, 50), rng.randint(1, 100)] for i in range(num_items)]
+    return itens, sum(peso for _, peso, _ in itens) // 2
+
+
+def executar_carga(url: str, num_tarefas: int, concorrencia: int, itens: List[List[Any]], capacidade: int,
+                   parametros: Dict[str, Any], seed: int, repetir_seed: bool) -> Dict[str, Any]:
+    """Envia `num_tarefas` tarefas com `concorrencia` clientes simultâneos e resume o resultado."""
+    latencias: List[float] = []
+    estados: Dict[str, int] = {}
+    rejeicoes = [0]
+    trava = threading.Lock()
+
+    def cliente(indice: int) -> None:
+        pedido = {"itens": itens, "capacidade": capacidade,
+                  "parametros": dict(parametros, seed=seed if repetir_seed else seed + indice)}
+        inicio = time.perf_counter()
+        while True:
+            status, resposta = _requisitar(f"{url}/tarefas", "POST", pedido)
+            if status != 503:
+                break
+            with trava:
+                rejeicoes[0] += 1
+            time.sleep(0.05)  # Fila cheia: tenta de novo
+        if status != 202:
+            raise RuntimeError(f"Tarefa recusada ({status}): {resposta.get('erro')}")
+        _, fim = acompanhar_eventos(url, resposta["id"])
+        with trava:
+            latencias.append(time.perf_counter() - inicio)
+            estados[fim["estado"]] = estados.get(fim["estado"], 0) + 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concorrencia) as clientes:
+        for futuro in [clientes.submit(cliente, i) for i in range(num_tarefas)]:
+            futuro.result()
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "tarefas": num_tarefas,
+        "duracao": duracao,
+        "tarefas_por_segundo": num_tarefas / duracao,
+        "estados": estados,
+        "rejeicoes_fila_cheia": rejeicoes[0],
+        "latencia_media": statistics.fmean(latencias),
+        "latencia_p50": latencias[len(latencias) // 2],
+        "latencia_p95": latencias[min(len(latencias) - 1, int(0.95 * len(latencias)))],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP da mochila.")
+    parser.add_argument("--url", default=None, help="Serviço já em execução; sem ele, sobe um local.")
+    parser.add_argument("--processos", type=int, default=2, help="Processos do serviço local.")
+    parser.add_argument("--tarefas", type=int, default=50)
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--num-items", type=int, default=50)
+    parser.add_argument("--tam-populacao", type=int, default=50)
+    parser.add_argument("--num-geracoes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repetir-seed", action="store_true")
+    args = parser.parse_args()
+
+    itens, capacidade = gerar_instancia(args.num_items, args.seed)
+    parametros = {"tam_populacao": args.tam_populacao, "num_geracoes": args.num_geracoes}
+
+    servico = servidor = None
+    url = args.url
+    if url is None:
+        from mochila_servico import ServicoMochila, criar_servidor
+        servico = ServicoMochila(args.processos, tamanho_fila=max(args.concorrencia, 1))
+        servidor = criar_servidor(servico, porta=0)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{servidor.server_address[1]}"
+        print(f"Serviço local em {url} com {args.processos} processos")
+    url = url.rstrip("/")
+
+    try:
+        resumo = executar_carga(url, args.tarefas, args.concorrencia, itens, capacidade, parametros,
+                                args.seed, args.repetir_seed)
+        _, metricas = _requisitar(f"{url}/metricas")
+    finally:
+        if servidor is not None:
+            servidor.shutdown()
+            servidor.server_close()
+            servico.encerrar()
+
+    print(f"{resumo['tarefas']} tarefas em {resumo['duracao']:.2f} s: {resumo['tarefas_por_segundo']:.1f} tarefas/s")
+    print(f"Estados finais: {resumo['estados']}; rejeições por fila cheia: {resumo['rejeicoes_fila_cheia']}")
+    print(f"Latência no cliente: média {resumo['latencia_media'] * 1000:.0f} ms, "
+          f"p50 {resumo['latencia_p50'] * 1000:.0f} ms, p95 {resumo['latencia_p95'] * 1000:.0f} ms")
+    print("Métricas do serviço:")
+    print(json.dumps(metricas, indent=2, ensure_ascii=False))
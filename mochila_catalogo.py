@@ -0,0 +1,165 @@
+"""
+Catálogo de itens em formato colunar, para instâncias muito grandes.
+
+Uma lista de tuplas (nome, peso, valor) custa centenas de bytes por item em objetos Python.
+converter_csv lê o CSV uma única vez e grava, em um diretório:
+- pesos.npy e valores.npy: colunas int64 no formato .npy do NumPy;
+- nomes.bin: os nomes em UTF-8, concatenados;
+- nomes_offsets.npy: int64 com num_items + 1 posições, o nome i é nomes.bin[offsets[i]:offsets[i + 1]].
+Nas execuções seguintes, CatalogoItens abre as colunas com mapeamento em memória (np.load com
+mmap_mode="r"): nada é lido do disco até ser usado, e a tabela de nomes só é aberta quando algum
+nome é pedido.
+
+CatalogoItens se comporta como a lista de tuplas (len, índice e iteração), então pode ser passado
+como `items_data` para qualquer função do pacote. O AG (motores "python", "bits" e "numpy") e os
+solvers exatos reconhecem o catálogo e usam direto as colunas `pesos` e `valores`, sem criar
+tuplas nem ler os nomes:
+
+    catalogo = carregar_catalogo("itens.csv")
+    historico = algoritmo_genetico_mochila_iterativo(catalogo, capacidade, motor="numpy")
+"""
+import csv
+import os
+from array import array
+from typing import Iterator, Optional, Tuple
+
+ARQUIVOS_CATALOGO = ("pesos.npy", "valores.npy", "nomes.bin", "nomes_offsets.npy")
+
+
+class CatalogoItens:
+    """
+    Itens de uma instância em colunas `pesos` e `valores` (arrays int64, normalmente mapeados
+    em memória). Os nomes ficam em uma tabela separada, carregada só no primeiro acesso.
+    """
+
+    def __init__(self, pesos, valores, caminho_nomes: Optional[str] = None, caminho_offsets: Optional[str] = None):
+        if len(pesos) != len(valores):
+            raise ValueError("As colunas de pesos e valores devem ter o mesmo tamanho.")
+        self.pesos = pesos
+        self.valores = valores
+        self.caminho_nomes = caminho_nomes
+        self.caminho_offsets = caminho_offsets
+        self._nomes = None
+        self._offsets = None
+
+    @classmethod
+    def abrir(cls, diretorio: str) -> "CatalogoItens":
+        """Abre um catálogo gravado por converter_csv, com as colunas mapeadas em memória."""
+        import numpy as np
+
+        faltando = [nome for nome in ARQUIVOS_CATALOGO if not os.path.exists(os.path.join(diretorio, nome))]
+        if faltando:
+            raise ValueError(f"'{diretorio}' não é um catálogo de itens (faltam {', '.join(faltando)}).")
+        return cls(
+            np.load(os.path.join(diretorio, "pesos.npy"), mmap_mode="r"),
+            np.load(os.path.join(diretorio, "valores.npy"), mmap_mode="r"),
+            os.path.join(diretorio, "nomes.bin"),
+            os.path.join(diretorio, "nomes_offsets.npy"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.pesos)
+
+    def _carregar_nomes(self) -> None:
+        import numpy as np
+
+        self._offsets = np.load(self.caminho_offsets, mmap_mode="r")
+        # Um arquivo vazio não pode ser mapeado em memória (todos os nomes vazios)
+        if os.path.getsize(self.caminho_nomes) > 0:
+            self._nomes = np.memmap(self.caminho_nomes, dtype=np.uint8, mode="r")
+        else:
+            self._nomes = b""
+
+    def nome(self, indice: int) -> str:
+        """Nome do item `indice`; sem tabela de nomes, retorna "Item <indice>"."""
+        if self.caminho_nomes is None:
+            return f"Item {indice}"
+        if self._offsets is None:
+            self._carregar_nomes()
+        inicio, fim = int(self._offsets[indice]), int(self._offsets[indice + 1])
+        return bytes(self._nomes[inicio:fim]).decode("utf-8")
+
+    def __getitem__(self, indice: int) -> Tuple[str, int, int]:
+        """Item `indice` como a tupla (nome, peso, valor) de items_data."""
+        if not isinstance(indice, int):
+            raise TypeError("CatalogoItens só aceita índices inteiros.")
+        num_items = len(self)
+        if indice < 0:
+            indice += num_items
+        if not 0 <= indice < num_items:
+            raise IndexError("Índice de item fora do catálogo.")
+        return self.nome(indice), int(self.pesos[indice]), int(self.valores[indice])
+
+    def __iter__(self) -> Iterator[Tuple[str, int, int]]:
+        for indice in range(len(self)):
+            yield self[indice]
+
+
+def converter_csv(caminho_csv: str, diretorio: str, delimitador: str = ",") -> CatalogoItens:
+    """
+    Lê um CSV com as colunas nome, peso e valor (nessa ordem; uma linha de cabeçalho é ignorada
+    se o peso não for um inteiro) e grava o catálogo colunar em `diretorio`. O arquivo é lido
+    em uma única passada, sem montar uma lista de tuplas. Retorna o catálogo já aberto.
+    """
+    import numpy as np
+
+    pesos = array("q")
+    valores = array("q")
+    offsets = array("q", [0])
+    os.makedirs(diretorio, exist_ok=True)
+    with open(caminho_csv, newline="", encoding="utf-8") as entrada, \
+            open(os.path.join(diretorio, "nomes.bin"), "wb") as nomes:
+        for numero_linha, linha in enumerate(csv.reader(entrada, delimiter=delimitador), start=1):
+            if not linha:
+                continue
+            if len(linha) < 3:
+                raise ValueError(f"Linha {numero_linha} de '{caminho_csv}' deve ter nome, peso e valor.")
+            try:
+                peso, valor = int(linha[1]), int(linha[2])
+            except ValueError:
+                if numero_linha == 1:
+                    continue  # Cabeçalho
+                raise ValueError(f"Linha {numero_linha} de '{caminho_csv}': peso e valor devem ser inteiros.")
+            nome = linha[0].encode("utf-8")
+            nomes.write(nome)
+            pesos.append(peso)
+            valores.append(valor)
+            offsets.append(offsets[-1] + len(nome))
+
+    np.save(os.path.join(diretorio, "pesos.npy"), np.frombuffer(pesos, dtype=np.int64))
+    np.save(os.path.join(diretorio, "valores.npy"), np.frombuffer(valores, dtype=np.int64))
+    # Gravado por último: um diretório sem os offsets é visto como conversão incompleta
+    np.save(os.path.join(diretorio, "nomes_offsets.npy"), np.frombuffer(offsets, dtype=np.int64))
+    return CatalogoItens.abrir(diretorio)
+
+
+def carregar_catalogo(caminho_csv: str, diretorio: Optional[str] = None, delimitador: str = ",") -> CatalogoItens:
+    """
+    Abre o catálogo de `caminho_csv`, convertendo o CSV só se o catálogo ainda não existir ou
+    for mais antigo que o CSV. Por padrão o catálogo fica em "<caminho_csv>.catalogo".
+    """
+    if diretorio is None:
+        diretorio = caminho_csv + ".catalogo"
+    caminhos = [os.path.join(diretorio, nome) for nome in ARQUIVOS_CATALOGO]
+    modificacao_csv = os.path.getmtime(caminho_csv)
+    if all(os.path.exists(caminho) and os.path.getmtime(caminho) >= modificacao_csv for caminho in caminhos):
+        return CatalogoItens.abrir(diretorio)
+    return converter_csv(caminho_csv, diretorio, delimitador)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from mochila_ga import algoritmo_genetico_mochila_iterativo
+
+    if len(sys.argv) < 3:
+        print("Uso: python mochila_catalogo.py itens.csv capacidade [motor]")
+        sys.exit(1)
+    inicio = time.perf_counter()
+    catalogo = carregar_catalogo(sys.argv[1])
+    print(f"{len(catalogo)} itens carregados em {time.perf_counter() - inicio:.3f} s")
+    historico = algoritmo_genetico_mochila_iterativo(
+        catalogo, int(sys.argv[2]), motor=sys.argv[3] if len(sys.argv) > 3 else "numpy", num_geracoes=50, seed=0
+    )
+    print(f"Melhor valor: {historico[-1][1]}, peso {historico[-1][2]}")
@@ -0,0 +1,209 @@
+"""
+Checkpoints de execuções longas do algoritmo genético da mochila.
+
+Com `arquivo_checkpoint`, algoritmo_genetico_mochila_iterativo grava periodicamente (a cada
+`intervalo_checkpoint` segundos, no início de uma geração) tudo o que é preciso para continuar
+a busca: população, totais de peso e valor já conhecidos, melhor solução, contador de gerações,
+estado dos critérios de parada, das taxas adaptativas e do gerador de números aleatórios. retomar_algoritmo_genetico
+continua a partir do arquivo e produz exatamente as mesmas gerações que a execução original.
+
+Formato do arquivo (binário, little-endian):
+- MAGIA (8 bytes) e o tamanho do cabeçalho (uint32);
+- cabeçalho JSON (UTF-8) com os campos pequenos: parâmetros, contadores, melhor solução, ...;
+- população com os genes empacotados em bits (ceil(num_items / 8) bytes por indivíduo);
+- totais (peso, valor) de cada indivíduo em int64, com um byte por indivíduo indicando se são conhecidos;
+- melhor solução empacotada em bits;
+- estado do `random` (625 palavras uint32) no motor Python; no motor "numpy" o estado do
+  gerador vai no cabeçalho.
+A gravação é atômica: o arquivo é escrito ao lado com extensão ".tmp" e substitui o anterior
+com os.replace, então um checkpoint nunca fica pela metade.
+"""
+import hashlib
+import json
+import os
+import struct
+import time
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from mochila_ga import (
+    HistoricoAG, algoritmo_genetico_mochila_iterativo, desempacotar_genes, empacotar_genes, pesos_e_valores
+)
+
+MAGIA = b"MOCHCKP1"
+
+# Parâmetros que não são gravados e podem ser passados de novo na retomada
+PARAMETROS_RETOMADA = ("instrumentacao", "arquivo_checkpoint", "intervalo_checkpoint")
+
+
+class EstadoCheckpoint(NamedTuple):
+    """Estado de uma execução no início da geração `geracao`, como gravado no arquivo."""
+    geracao: int
+    motor: str
+    parametros: Dict[str, Any]
+    assinatura: str  # assinatura_instancia dos itens e da capacidade
+    num_items: int
+    populacao: List[bytes]  # Indivíduos empacotados com empacotar_genes
+    totais: List[Optional[Tuple[int, int]]]  # (peso, valor) já conhecidos; None se precisar avaliar
+    melhor: Optional[Tuple[bytes, int, int, int]]  # (cromossomo empacotado, valor, peso, fitness)
+    criterios: Tuple[int, int]  # (melhor_fitness, geracoes_sem_melhoria) de CriteriosParada
+    estado_aleatorio: Any  # random.getstate() no motor Python, bit_generator.state no "numpy"
+    adaptacao: Optional[Dict[str, Any]] = None  # TaxasAdaptativas.estado(), com taxas_adaptativas
+
+
+def assinatura_instancia(items_data: Sequence[Tuple[str, int, int]], capacidade_maxima: int) -> str:
+    """Hash dos pesos, valores e capacidade, para conferir que o checkpoint é da mesma instância."""
+    pesos, valores = pesos_e_valores(items_data)
+    resumo = hashlib.sha256()
+    resumo.update(struct.pack("<q", capacidade_maxima))
+    resumo.update(array("q", pesos).tobytes())
+    resumo.update(array("q", valores).tobytes())
+    return resumo.hexdigest()
+
+
+def salvar_checkpoint(caminho: str, estado: EstadoCheckpoint) -> None:
+    """Grava o estado em `caminho` de forma atômica (arquivo temporário + os.replace)."""
+    num_individuos = len(estado.populacao)
+    estado_numpy = None
+    estado_random = None
+    if estado.motor == "numpy":
+        estado_numpy = estado.estado_aleatorio
+    else:
+        versao, palavras, gauss_seguinte = estado.estado_aleatorio
+        estado_random = {"versao": versao, "gauss_seguinte": gauss_seguinte}
+    cabecalho = {
+        "geracao": estado.geracao,
+        "motor": estado.motor,
+        "parametros": estado.parametros,
+        "assinatura": estado.assinatura,
+        "num_items": estado.num_items,
+        "num_individuos": num_individuos,
+        "melhor": list(estado.melhor[1:]) if estado.melhor is not None else None,
+        "criterios": list(estado.criterios),
+        "estado_numpy": estado_numpy,
+        "estado_random": estado_random,
+        "adaptacao": estado.adaptacao,
+    }
+    dados_cabecalho = json.dumps(cabecalho).encode("utf-8")
+
+    conhecidos = bytes(totais is not None for totais in estado.totais)
+    totais = array("q")
+    for par in estado.totais:
+        totais.extend(par if par is not None else (0, 0))
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(MAGIA)
+        arquivo.write(struct.pack("<I", len(dados_cabecalho)))
+        arquivo.write(dados_cabecalho)
+        arquivo.write(b"".join(estado.populacao))
+        arquivo.write(conhecidos)
+        arquivo.write(totais.tobytes())
+        if estado.melhor is not None:
+            arquivo.write(estado.melhor[0])
+        if estado_random is not None:
+            arquivo.write(array("I", palavras).tobytes())
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def carregar_checkpoint(caminho: str) -> EstadoCheckpoint:
+    """Lê um arquivo gravado por salvar_checkpoint."""
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read()
+    if dados[:len(MAGIA)] != MAGIA:
+        raise ValueError(f"'{caminho}' não é um checkpoint do algoritmo genético da mochila.")
+    posicao = len(MAGIA)
+    (tamanho_cabecalho,) = struct.unpack_from("<I", dados, posicao)
+    posicao += 4
+    cabecalho = json.loads(dados[posicao:posicao + tamanho_cabecalho].decode("utf-8"))
+    posicao += tamanho_cabecalho
+
+    num_items = cabecalho["num_items"]
+    num_individuos = cabecalho["num_individuos"]
+    num_bytes = (num_items + 7) // 8
+    populacao = [dados[posicao + i * num_bytes:posicao + (i + 1) * num_bytes] for i in range(num_individuos)]
+    posicao += num_individuos * num_bytes
+    conhecidos = dados[posicao:posicao + num_individuos]
+    posicao += num_individuos
+    valores_totais = array("q")
+    valores_totais.frombytes(dados[posicao:posicao + 16 * num_individuos])
+    posicao += 16 * num_individuos
+    totais = [(valores_totais[2 * i], valores_totais[2 * i + 1]) if conhecidos[i] else None for i in range(num_individuos)]
+
+    melhor = None
+    if cabecalho["melhor"] is not None:
+        melhor = (dados[posicao:posicao + num_bytes], *cabecalho["melhor"])
+        posicao += num_bytes
+
+    if cabecalho["motor"] == "numpy":
+        estado_aleatorio = cabecalho["estado_numpy"]
+    else:
+        palavras = array("I")
+        palavras.frombytes(dados[posicao:posicao + 4 * 625])
+        estado_random = cabecalho["estado_random"]
+        estado_aleatorio = (estado_random["versao"], tuple(palavras), estado_random["gauss_seguinte"])
+
+    return EstadoCheckpoint(
+        cabecalho["geracao"], cabecalho["motor"], cabecalho["parametros"], cabecalho["assinatura"],
+        num_items, populacao, totais, melhor, tuple(cabecalho["criterios"]), estado_aleatorio,
+        cabecalho.get("adaptacao")
+    )
+
+
+class GravadorCheckpoint:
+    """
+    Grava checkpoints de uma execução a cada `intervalo` segundos (0 grava em toda geração).
+    Usado pelo laço principal do AG quando recebe `arquivo_checkpoint`.
+    """
+
+    def __init__(self, caminho: str, intervalo: float, motor: str, parametros: Dict[str, Any],
+                 items_data: Sequence[Tuple[str, int, int]], capacidade_maxima: int):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.motor = motor
+        self.parametros = parametros
+        self.assinatura = assinatura_instancia(items_data, capacidade_maxima)
+        self.num_items = len(items_data)
+        self.num_bytes = (self.num_items + 7) // 8
+        self.num_gravacoes = 0
+        self.ultima_gravacao = time.perf_counter()
+
+    def deve_gravar(self) -> bool:
+        """Indica se já passou o intervalo desde a última gravação (ou o início da execução)."""
+        return time.perf_counter() - self.ultima_gravacao >= self.intervalo
+
+    def gravar(self, geracao: int, populacao: List[bytes], totais: List[Optional[Tuple[int, int]]],
+               melhor: Optional[Tuple[List[int], int, int, int]], criterios: Tuple[int, int],
+               estado_aleatorio: Any, adaptacao: Optional[Dict[str, Any]] = None) -> None:
+        """Grava o estado do início da geração `geracao`; `melhor` tem o cromossomo como List[int]."""
+        if melhor is not None:
+            melhor = (empacotar_genes(melhor[0], self.num_bytes), *melhor[1:])
+        salvar_checkpoint(self.caminho, EstadoCheckpoint(
+            geracao, self.motor, self.parametros, self.assinatura, self.num_items,
+            populacao, totais, melhor, criterios, estado_aleatorio, adaptacao
+        ))
+        self.num_gravacoes += 1
+        self.ultima_gravacao = time.perf_counter()
+
+
+def retomar_algoritmo_genetico(caminho: str,
+                               items_data: List[Tuple[str, int, int]],
+                               capacidade_maxima: int,
+                               **parametros_ag: Any) -> HistoricoAG:
+    """
+    Continua a execução gravada em `caminho` com os mesmos parâmetros e retorna o histórico
+    das gerações restantes (da geração do checkpoint até num_geracoes), idêntico ao trecho
+    correspondente da execução sem interrupção. `parametros_ag` pode acrescentar opções que
+    não são gravadas (arquivo_checkpoint, intervalo_checkpoint, instrumentacao); o limite de
+    tempo dos critérios de parada recomeça a contar na retomada.
+    """
+    estado = carregar_checkpoint(caminho)
+    if estado.assinatura != assinatura_instancia(items_data, capacidade_maxima):
+        raise ValueError("O checkpoint foi gravado para outra instância (itens ou capacidade diferentes).")
+    nao_permitidos = set(parametros_ag) - set(PARAMETROS_RETOMADA)
+    if nao_permitidos:
+        raise ValueError(f"Parâmetros gravados no checkpoint não podem ser alterados: {', '.join(sorted(nao_permitidos))}.")
+    parametros = dict(estado.parametros, **parametros_ag)
+    return algoritmo_genetico_mochila_iterativo(items_data, capacidade_maxima, checkpoint_inicial=estado, **parametros)
@@ -0,0 +1,230 @@
+"""
+Solvers exatos para o problema da mochila 0/1.
+
+Recebem os mesmos `items_data` (nome, peso, valor) e `capacidade_maxima` do algoritmo
+genético (ou um catálogo de mochila_catalogo, lido direto das colunas) e retornam a solução ótima no mesmo formato de tupla do histórico:
+(cromossomo, valor_total, peso_total, fitness). Assume-se que itens com peso <= 0 não têm
+valor negativo.
+
+- resolver_programacao_dinamica: programação dinâmica com um único vetor de tamanho
+  capacidade + 1 (memória O(capacidade)); a solução é reconstruída por divisão e conquista,
+  sem guardar a tabela inteira. Indicado para capacidades moderadas.
+- resolver_branch_and_bound: busca em profundidade com poda pelo limite da relaxação
+  fracionária (Horowitz-Sahni). Não depende da capacidade, indicado para capacidades grandes.
+- resolver_exato: escolhe entre os dois pelo tamanho num_items × capacidade.
+"""
+from bisect import bisect_right
+from typing import List, Tuple
+
+from mochila_ga import pesos_e_valores
+
+# Acima deste número de células (num_items × (capacidade + 1)) resolver_exato usa branch-and-bound.
+# A programação dinâmica é Python puro: cerca de 1 s por 10^6 células (200 itens × capacidade
+# 5 000), enquanto o branch-and-bound resolve instâncias desse tamanho em milissegundos.
+LIMITE_CELULAS_DP = 1_000_000
+
+
+def _separar_itens(pesos: List[int], valores: List[int], capacidade_maxima: int) -> Tuple[List[int], List[int], int]:
+    """
+    Separa os itens que sempre entram na solução ótima (peso negativo, ou peso zero e valor
+    positivo) dos que precisam ser decididos (valor positivo e cabem na capacidade livre).
+    Os demais nunca entram. Retorna (indices_obrigatorios, indices_candidatos, capacidade_livre).
+    """
+    obrigatorios = [i for i, (peso, valor) in enumerate(zip(pesos, valores)) if peso < 0 or (peso == 0 and valor > 0)]
+    capacidade_livre = capacidade_maxima - sum(pesos[i] for i in obrigatorios)
+    candidatos = [i for i, (peso, valor) in enumerate(zip(pesos, valores)) if 0 < peso <= capacidade_livre and valor > 0]
+    return obrigatorios, candidatos, capacidade_livre
+
+
+def _montar_resultado(pesos: List[int], valores: List[int], escolhidos: List[int]) -> Tuple[List[int], int, int, int]:
+    """Monta a tupla (cromossomo, valor_total, peso_total, fitness) a partir dos índices escolhidos."""
+    cromossomo = [0] * len(pesos)
+    peso_total = 0
+    valor_total = 0
+    for i in escolhidos:
+        cromossomo[i] = 1
+        peso_total += pesos[i]
+        valor_total += valores[i]
+    return cromossomo, valor_total, peso_total, valor_total
+
+
+def limite_superior_fracionario(items_data: List[Tuple[str, int, int]], capacidade_maxima: int) -> int:
+    """
+    Limite superior do valor ótimo pela relaxação linear (mochila fracionária): itens em ordem
+    decrescente de valor/peso, o último entrando fracionado. Como os valores são inteiros,
+    retorna o piso desse limite.
+    """
+    if capacidade_maxima < 0:
+        return 0
+    pesos, valores = pesos_e_valores(items_data)
+    obrigatorios, candidatos, restante = _separar_itens(pesos, valores, capacidade_maxima)
+    limite = sum(valores[i] for i in obrigatorios)
+    for i in sorted(candidatos, key=lambda i: valores[i] / pesos[i], reverse=True):
+        peso, valor = pesos[i], valores[i]
+        if peso <= restante:
+            restante -= peso
+            limite += valor
+        else:
+            limite += (restante * valor) // peso
+            break
+    return limite
+
+
+# --- Programação Dinâmica ---
+
+def _tabela_dp(indices: List[int], pesos: List[int], valores: List[int], capacidade: int) -> List[int]:
+    """
+    Vetor melhor[c] = maior valor usando apenas os itens em `indices` com peso total <= c.
+    Usa um único vetor "rolante": cada item atualiza melhor[c] = max(melhor[c], melhor[c - peso] + valor).
+    """
+    # Acima da soma dos pesos o vetor é constante; calcula só até ela e completa no final
+    limite = min(capacidade, sum(pesos[i] for i in indices))
+    melhor = [0] * (limite + 1)
+    for i in indices:
+        peso, valor = pesos[i], valores[i]
+        if peso > limite:
+            continue
+        # As fatias são copiadas antes da atribuição, então cada item é usado no máximo uma vez
+        melhor[peso:] = list(map(max, melhor[peso:], [anterior + valor for anterior in melhor[:limite + 1 - peso]]))
+    melhor.extend([melhor[-1]] * (capacidade - limite))
+    return melhor
+
+
+def _reconstruir_dp(indices: List[int], capacidade: int, pesos: List[int], valores: List[int], escolhidos: List[int]) -> None:
+    """
+    Encontra os itens de uma solução ótima por divisão e conquista: resolve as duas metades
+    dos itens separadamente, escolhe a melhor divisão da capacidade entre elas e repete em
+    cada metade. Só guarda dois vetores de tamanho capacidade + 1 por vez.
+    """
+    if not indices or capacidade <= 0:
+        return
+    if sum(pesos[i] for i in indices) <= capacidade:
+        escolhidos.extend(indices)  # Todos cabem: com valores positivos, levar todos é ótimo
+        return
+    if len(indices) == 1:
+        return
+    meio = len(indices) // 2
+    esquerda, direita = indices[:meio], indices[meio:]
+    melhor_esquerda = _tabela_dp(esquerda, pesos, valores, capacidade)
+    melhor_direita = _tabela_dp(direita, pesos, valores, capacidade)
+    capacidade_esquerda = max(range(capacidade + 1), key=lambda c: melhor_esquerda[c] + melhor_direita[capacidade - c])
+    del melhor_esquerda, melhor_direita
+    _reconstruir_dp(esquerda, capacidade_esquerda, pesos, valores, escolhidos)
+    _reconstruir_dp(direita, capacidade - capacidade_esquerda, pesos, valores, escolhidos)
+
+
+def resolver_programacao_dinamica(items_data: List[Tuple[str, int, int]], capacidade_maxima: int) -> Tuple[List[int], int, int, int]:
+    """
+    Resolve a mochila 0/1 de forma exata por programação dinâmica.
+    Tempo O(num_items × capacidade × log num_items) no pior caso e memória O(capacidade).
+    Retorna: (cromossomo, valor_total, peso_total, fitness).
+    """
+    if capacidade_maxima < 0:
+        return [0] * len(items_data), 0, 0, 0
+    pesos, valores = pesos_e_valores(items_data)
+    obrigatorios, candidatos, capacidade_livre = _separar_itens(pesos, valores, capacidade_maxima)
+    # Não adianta considerar capacidade maior que a soma dos pesos dos candidatos
+    capacidade = min(capacidade_livre, sum(pesos[i] for i in candidatos))
+    escolhidos = list(obrigatorios)
+    _reconstruir_dp(candidatos, capacidade, pesos, valores, escolhidos)
+    return _montar_resultado(pesos, valores, escolhidos)
+
+
+# --- Branch-and-Bound ---
+
+def resolver_branch_and_bound(items_data: List[Tuple[str, int, int]], capacidade_maxima: int) -> Tuple[List[int], int, int, int]:
+    """
+    Resolve a mochila 0/1 de forma exata por branch-and-bound (Horowitz-Sahni).
+    Os itens são percorridos em ordem decrescente de valor/peso; cada nó é podado quando o
+    valor atual mais o limite da relaxação fracionária não supera a melhor solução conhecida.
+    O limite é calculado em O(log num_items) com somas prefixas e busca binária.
+    Retorna: (cromossomo, valor_total, peso_total, fitness).
+    """
+    if capacidade_maxima < 0:
+        return [0] * len(items_data), 0, 0, 0
+    pesos_itens, valores_itens = pesos_e_valores(items_data)
+    obrigatorios, candidatos, capacidade_livre = _separar_itens(pesos_itens, valores_itens, capacidade_maxima)
+    ordem = sorted(candidatos, key=lambda i: valores_itens[i] / pesos_itens[i], reverse=True)
+    pesos = [pesos_itens[i] for i in ordem]
+    valores = [valores_itens[i] for i in ordem]
+    num_candidatos = len(ordem)
+
+    # Somas prefixas: pesos_acumulados[k] = soma dos pesos dos k primeiros itens da ordem
+    pesos_acumulados = [0] * (num_candidatos + 1)
+    valores_acumulados = [0] * (num_candidatos + 1)
+    for k in range(num_candidatos):
+        pesos_acumulados[k + 1] = pesos_acumulados[k] + pesos[k]
+        valores_acumulados[k + 1] = valores_acumulados[k] + valores[k]
+
+    melhor_valor = -1
+    melhor_escolha: List[int] = []
+    escolhidos: List[int] = []  # Posições (na ordem) dos itens na solução parcial atual
+    peso_atual = 0
+    valor_atual = 0
+    j = 0  # Próxima posição a decidir
+
+    while True:
+        restante = capacidade_livre - peso_atual
+        # m = última posição tal que os itens j..m-1 cabem inteiros na capacidade restante
+        m = bisect_right(pesos_acumulados, pesos_acumulados[j] + restante, j) - 1
+        limite = valores_acumulados[m] - valores_acumulados[j]
+        if m < num_candidatos:
+            limite += ((restante - (pesos_acumulados[m] - pesos_acumulados[j])) * valores[m]) // pesos[m]
+
+        if valor_atual + limite > melhor_valor:
+            # Avança: inclui os itens j..m-1; o item m (se existir) não cabe e fica de fora
+            escolhidos.extend(range(j, m))
+            peso_atual += pesos_acumulados[m] - pesos_acumulados[j]
+            valor_atual += valores_acumulados[m] - valores_acumulados[j]
+            if m < num_candidatos - 1:
+                j = m + 1
+                continue
+            # Todas as posições foram decididas: solução completa
+            if valor_atual > melhor_valor:
+                melhor_valor = valor_atual
+                melhor_escolha = escolhidos[:]
+
+        # Retrocede: remove o último item incluído e explora o ramo sem ele
+        if not escolhidos:
+            break
+        k = escolhidos.pop()
+        peso_atual -= pesos[k]
+        valor_atual -= valores[k]
+        j = k + 1
+
+    return _montar_resultado(pesos_itens, valores_itens, list(obrigatorios) + [ordem[k] for k in melhor_escolha])
+
+
+def resolver_exato(items_data: List[Tuple[str, int, int]],
+                   capacidade_maxima: int,
+                   limite_celulas_dp: int = LIMITE_CELULAS_DP) -> Tuple[List[int], int, int, int]:
+    """
+    Resolve a mochila 0/1 de forma exata, escolhendo o solver pelo tamanho da instância:
+    programação dinâmica se num_items × (capacidade + 1) <= limite_celulas_dp, senão
+    branch-and-bound. Retorna: (cromossomo, valor_total, peso_total, fitness).
+    """
+    if len(items_data) * (max(capacidade_maxima, 0) + 1) <= limite_celulas_dp:
+        return resolver_programacao_dinamica(items_data, capacidade_maxima)
+    return resolver_branch_and_bound(items_data, capacidade_maxima)
+
+
+if __name__ == "__main__":
+    from mochila_ga import algoritmo_genetico_mochila_iterativo
+
+    config_itens_ex1 = [
+        ("Lanterna", 2, 15), ("Saco de Dormir", 5, 30), ("Comida Enlatada", 10, 50),
+        ("Corda", 3, 20), ("Mapa", 1, 10), ("Bússola", 1, 15),
+        ("Kit Primeiros Socorros", 4, 25), ("Cantil", 2, 20), ("Faca", 1, 18),
+        ("Repelente", 1, 12), ("Câmera", 3, 40), ("Livro", 2, 5),
+        ("Barraca", 15, 70), ("Fogareiro", 6, 35), ("Panelas", 4, 22),
+        ("Rádio Solar", 3, 28), ("Bateria Extra", 2, 22), ("Chocolate", 1, 16)
+    ]
+    capacidade_mochila_ex1 = 35
+
+    for nome_solver, solver in (("Programação dinâmica", resolver_programacao_dinamica),
+                                ("Branch-and-bound", resolver_branch_and_bound)):
+        solucao, valor, peso, _ = solver(config_itens_ex1, capacidade_mochila_ex1)
+        print(f"{nome_solver}: valor {valor}, peso {peso}/{capacidade_mochila_ex1}, cromossomo {solucao}")
+
+    historico = algoritmo_genetico_mochila_iterativo(config_itens_ex1, capacidade_mochila_ex1, seed=42)
+    print(f"Algoritmo genético: valor {historico[-1][1]} (ótimo: {resolver_exato(config_itens_ex1, capacidade_mochila_ex1)[1]})")
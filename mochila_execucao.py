@@ -0,0 +1,89 @@
+"""
+Execução do algoritmo genético em segundo plano, para interfaces que não podem ficar bloqueadas.
+
+ExecucaoEmSegundoPlano roda algoritmo_genetico_mochila_geracoes em uma thread e publica cada
+EstadoGeracao em uma fila. A interface chama coletar() no próprio ritmo (por exemplo, a cada
+quadro) e recebe de uma vez todas as gerações calculadas desde a chamada anterior: o AG não
+espera pela tela, e a tela não é redesenhada mais vezes do que o necessário.
+
+    execucao = ExecucaoEmSegundoPlano(items_data, capacidade, num_geracoes=500).iniciar()
+    while not execucao.terminada:
+        time.sleep(0.1)
+        estados = execucao.coletar()
+        ...  # desenha só o último estado; usa todos para o gráfico
+"""
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from mochila_ga import EstadoGeracao, algoritmo_genetico_mochila_geracoes
+
+_FIM = object()  # Marca na fila o fim da execução (normal, cancelada ou com erro)
+
+
+class ExecucaoEmSegundoPlano:
+    """
+    Uma execução do AG em uma thread. `resumo` recebe o retorno do gerador (estatísticas e
+    população final) ao terminar, e `erro` a exceção, se houver.
+
+    Várias execuções podem rodar ao mesmo tempo no mesmo processo (uma por sessão do
+    Streamlit): com `seed`, cada uma sorteia com o seu próprio gerador e o resultado é o mesmo
+    que ela teria sozinha. Sem seed, os motores "python" e "bits" usam o estado global do
+    módulo random, compartilhado com as outras threads.
+    """
+
+    def __init__(self, items_data: List[Tuple[str, int, int]], capacidade_maxima: int, **parametros_ag: Any):
+        self._fila: "queue.Queue[Any]" = queue.Queue()
+        self._cancelamento = threading.Event()
+        self._thread = threading.Thread(
+            target=self._executar, args=(items_data, capacidade_maxima, parametros_ag), daemon=True
+        )
+        self.terminada = False
+        self.resumo: Optional[Dict[str, Any]] = None
+        self.erro: Optional[BaseException] = None
+
+    def iniciar(self) -> "ExecucaoEmSegundoPlano":
+        self._thread.start()
+        return self
+
+    def _executar(self, items_data: List[Tuple[str, int, int]], capacidade_maxima: int,
+                  parametros_ag: Dict[str, Any]) -> None:
+        geracoes = algoritmo_genetico_mochila_geracoes(items_data, capacidade_maxima, **parametros_ag)
+        try:
+            while not self._cancelamento.is_set():
+                try:
+                    self._fila.put(next(geracoes))
+                except StopIteration as fim:
+                    self.resumo = fim.value or {}
+                    break
+            else:
+                geracoes.close()
+        except Exception as erro:
+            self.erro = erro
+        finally:
+            self._fila.put(_FIM)
+
+    def coletar(self, tempo_espera: Optional[float] = None) -> List[EstadoGeracao]:
+        """
+        Retorna, em ordem, todas as gerações publicadas desde a última chamada. Com
+        `tempo_espera`, espera até esse tempo (segundos) pela primeira se a fila estiver vazia.
+        """
+        estados = []
+        try:
+            item = self._fila.get(timeout=tempo_espera) if tempo_espera else self._fila.get_nowait()
+            while True:
+                if item is _FIM:
+                    self.terminada = True
+                    break
+                estados.append(item)
+                item = self._fila.get_nowait()
+        except queue.Empty:
+            pass
+        return estados
+
+    def cancelar(self) -> None:
+        """Pede para a execução parar ao fim da geração atual."""
+        self._cancelamento.set()
+
+    def aguardar(self, tempo_espera: Optional[float] = None) -> None:
+        self._thread.join(tempo_espera)
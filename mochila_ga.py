@@ -1,257 +1,1378 @@
-import random
-from typing import List, Tuple, Optional
-
-# --- Representação do Item ---
-class Item:
-    def __init__(self, name: str, weight: int, value: int):
-        self.name = name
-        self.weight = weight
-        self.value = value
-
-    def __repr__(self) -> str:
-        return f"Item(nome='{self.name}', peso={self.weight}, valor={self.value})"
-
-# --- Funções Auxiliares do Algoritmo Genético ---
-
-def criar_individuo(num_items: int) -> List[int]:
-    """Cria um indivíduo aleatório (cromossomo) como uma lista de bits."""
-    return [random.randint(0, 1) for _ in range(num_items)]
-
-def inicializar_populacao(tam_populacao: int, num_items: int) -> List[List[int]]:
-    """Inicializa uma população de indivíduos aleatórios."""
-    return [criar_individuo(num_items) for _ in range(tam_populacao)]
-
-def calcular_detalhes_individuo(individuo: List[int], items: List[Item], capacidade_maxima: int) -> Tuple[int, int, int]:
-    """
-    Calcula os detalhes de um indivíduo (solução).
-    Retorna: (pontuacao_fitness, valor_total_real, peso_total_real)
-    A pontuacao_fitness é o valor_total_real se o peso estiver dentro da capacidade,
-    caso contrário, é 0 (penalidade).
-    """
-    peso_total = 0
-    valor_total = 0
-    for i, gene in enumerate(individuo):
-        if gene == 1:
-            peso_total += items[i].weight
-            valor_total += items[i].value
-
-    if peso_total > capacidade_maxima:
-        pontuacao_fitness = 0  # Penaliza fortemente soluções inválidas
-    else:
-        pontuacao_fitness = valor_total
-    return pontuacao_fitness, valor_total, peso_total
-
-def selecionar_pai_torneio(populacao: List[List[int]],
-                             pontuacoes_fitness: List[int],
-                             tam_torneio: int) -> List[int]:
-    """Seleciona um único pai usando seleção por torneio."""
-    if not populacao:
-        raise ValueError("A população não pode estar vazia para seleção por torneio.")
-    
-    # Garante que o tamanho do torneio não exceda o tamanho da população disponível
-    k = min(tam_torneio, len(populacao))
-    if k == 0: # Se a população efetivamente se tornou vazia (não deveria, mas como defesa)
-        # Lógica do seu notebook original: se k=0 e indices_torneio não estiver vazio, usa o primeiro.
-        # Mas se populacao está vazia, o erro deve ser levantado.
-        raise ValueError("Não é possível selecionar de uma população vazia ou com tamanho de torneio 0.")
-
-
-    indices_torneio = random.sample(range(len(populacao)), k)
-
-    melhor_indice_contendor = -1
-    melhor_fitness_contendor = -1 # Assume-se fitness não negativo
-
-    for indice in indices_torneio:
-        if pontuacoes_fitness[indice] > melhor_fitness_contendor:
-            melhor_fitness_contendor = pontuacoes_fitness[indice]
-            melhor_indice_contendor = indice
-            
-    # Lógica do seu notebook original: Se todos os contendores tiverem fitness 0 (ou negativo),
-    # e nenhum melhor foi achado (melhor_indice_contendor ainda é -1),
-    # ou se melhor_indice_contendor for válido.
-    if melhor_indice_contendor == -1 and indices_torneio: # Todos os fitness são iguais (ex: 0)
-        return populacao[indices_torneio[0]] # Retorna o primeiro do torneio
-        
-    return populacao[melhor_indice_contendor]
-
-
-def cruzamento_ponto_unico(pai1: List[int], pai2: List[int], taxa_cruzamento: float) -> Tuple[List[int], List[int]]:
-    """Realiza cruzamento de ponto único entre dois pais se a taxa_cruzamento for atingida."""
-    filho1, filho2 = pai1[:], pai2[:] # Copia os pais por padrão
-    if random.random() < taxa_cruzamento and len(pai1) > 1 and len(pai2) > 1: # Garante que cruzamento é possível
-        ponto = random.randint(1, len(pai1) - 1)
-        filho1 = pai1[:ponto] + pai2[ponto:]
-        filho2 = pai2[:ponto] + pai1[ponto:]
-    return filho1, filho2
-
-def mutacao_bit_flip(individuo: List[int], taxa_mutacao: float) -> List[int]:
-    """Realiza mutação bit-flip em um indivíduo."""
-    individuo_mutado = individuo[:]
-    for i in range(len(individuo_mutado)):
-        if random.random() < taxa_mutacao:
-            individuo_mutado[i] = 1 - individuo_mutado[i]  # Inverte o bit
-    return individuo_mutado
-
-# --- Algoritmo Genético Principal (Adaptado para retornar histórico para Streamlit) ---
-def algoritmo_genetico_mochila_iterativo( # Renomeada para deixar claro que é a versão iterativa
-    items_data: List[Tuple[str, int, int]],
-    capacidade_maxima: int,
-    tam_populacao: int = 100,
-    num_geracoes: int = 200,
-    taxa_mutacao: float = 0.02,
-    taxa_cruzamento: float = 0.85,
-    contagem_elitismo: int = 2,
-    tam_torneio: int = 5,
-    seed: Optional[int] = None
-) -> List[Tuple[List[int], int, int, int]]: # Retorna histórico de (melhor_solucao_cromossomo, valor_real, peso_real, fitness_calculado)
-    """
-    Resolve o problema da mochila usando um algoritmo genético, retornando o histórico
-    da melhor solução (cromossomo, valor real, peso real, fitness) encontrada globalmente
-    até cada geração.
-    """
-    if seed is not None:
-        random.seed(seed)
-
-    items = [Item(nome, peso, valor) for nome, peso, valor in items_data]
-    num_items = len(items)
-
-    # Validações - Mantido o comportamento do notebook, mas sem 'verbose' prints
-    if num_items == 0:
-        return []
-    if tam_populacao <=0:
-        return []
-    if contagem_elitismo < 0:
-        contagem_elitismo = 0
-    if contagem_elitismo >= tam_populacao:
-        contagem_elitismo = max(0, tam_populacao -1) 
-    if tam_torneio <= 0:
-        tam_torneio = 1
-
-
-    populacao_atual = inicializar_populacao(tam_populacao, num_items)
-    
-    melhor_solucao_geral: Optional[List[int]] = None
-    melhor_fitness_geral = -1
-    melhor_valor_geral = -1 # Valor real da melhor solução geral
-    melhor_peso_geral = -1 # Peso real da melhor solução geral
-
-    historico_melhores_solucoes_gerais = [] # Para armazenar o histórico para o Streamlit
-
-    for geracao in range(num_geracoes):
-        avaliacoes_populacao = []
-        fitness_scores_populacao_atual = [] 
-
-        for individuo in populacao_atual:
-            fitness, valor_real, peso_real = calcular_detalhes_individuo(individuo, items, capacidade_maxima)
-            avaliacoes_populacao.append((fitness, valor_real, peso_real, individuo))
-            fitness_scores_populacao_atual.append(fitness)
-        
-        avaliacoes_populacao.sort(key=lambda x: x[0], reverse=True)
-
-        if avaliacoes_populacao: # Checa se a lista não está vazia
-            melhor_fitness_geracao_atual = avaliacoes_populacao[0][0]
-            melhor_valor_geracao_atual = avaliacoes_populacao[0][1] # Valor real da melhor da geração
-            melhor_peso_geracao_atual = avaliacoes_populacao[0][2] # Peso real da melhor da geração
-            melhor_individuo_geracao_atual = avaliacoes_populacao[0][3]
-
-            if melhor_fitness_geracao_atual > melhor_fitness_geral:
-                melhor_fitness_geral = melhor_fitness_geracao_atual
-                melhor_solucao_geral = melhor_individuo_geracao_atual
-                melhor_valor_geral = melhor_valor_geracao_atual # Atualiza o valor real da melhor geral
-                melhor_peso_geral = melhor_peso_geracao_atual # Atualiza o peso real da melhor geral
-            # Sem a lógica do verbose print para console aqui, pois será feita no Streamlit
-        # else: A lógica do notebook original não tinha um else para este if,
-        # significando que se a populacao_avaliada estivesse vazia,
-        # o histórico não seria atualizado para aquela geração, o que pode levar a um gap.
-        # Para Streamlit, é bom ter um registro para cada geração.
-        
-        # Adiciona a melhor solução GERAL (acumulada) até esta geração ao histórico
-        # Isso garante que o Streamlit sempre mostre o melhor resultado encontrado até o momento.
-        historico_melhores_solucoes_gerais.append((
-            list(melhor_solucao_geral) if melhor_solucao_geral else [0] * num_items,
-            melhor_valor_geral if melhor_valor_geral != -1 else 0, # Garante que seja 0 se não houver solução válida ainda
-            melhor_peso_geral if melhor_peso_geral != -1 else 0,   # Garante que seja 0 se não houver solução válida ainda
-            melhor_fitness_geral if melhor_fitness_geral != -1 else 0 # Fitness para o gráfico
-        ))
-
-        nova_populacao = []
-        for i in range(min(contagem_elitismo, len(avaliacoes_populacao))):
-            nova_populacao.append(avaliacoes_populacao[i][3])
-
-        num_descendentes_necessarios = tam_populacao - len(nova_populacao)
-        descendentes_gerados = 0
-        
-        # Loop para gerar descendentes até preencher a nova população
-        # Adiciona verificações para evitar erros com populações pequenas ou vazias
-        while descendentes_gerados < num_descendentes_necessarios:
-            # Lógica de fallback para população pequena idêntica ao notebook
-            if not populacao_atual or not fitness_scores_populacao_atual or len(populacao_atual) < max(1,tam_torneio) : 
-                while len(nova_populacao) < tam_populacao:
-                    nova_populacao.append(criar_individuo(num_items))
-                break 
-
-            pai1 = selecionar_pai_torneio(populacao_atual, fitness_scores_populacao_atual, tam_torneio)
-            # Lógica de seleção do segundo pai idêntica ao notebook
-            pai2_candidatos = [p for p in populacao_atual if p is not pai1] # Evita selecionar o mesmo pai se possível
-            if not pai2_candidatos and len(populacao_atual) > 0: # Se só resta o pai1
-                 pai2 = pai1 # Usa o mesmo pai se for o único
-            elif not pai2_candidatos: # Se população atual está vazia após seleção do pai1 (improvável)
-                 pai2 = criar_individuo(num_items) # Cria um pai aleatório
-            else:
-                 pai2_fitness_candidatos = [fitness_scores_populacao_atual[populacao_atual.index(p)] for p in pai2_candidatos]
-                 pai2 = selecionar_pai_torneio(pai2_candidatos, pai2_fitness_candidatos, tam_torneio)
-
-
-            filho1, filho2 = cruzamento_ponto_unico(pai1, pai2, taxa_cruzamento)
-
-            nova_populacao.append(mutacao_bit_flip(filho1, taxa_mutacao))
-            descendentes_gerados += 1
-
-            if descendentes_gerados < num_descendentes_necessarios:
-                nova_populacao.append(mutacao_bit_flip(filho2, taxa_mutacao))
-                descendentes_gerados += 1
-        
-        populacao_atual = nova_populacao[:tam_populacao]
-
-    # Removidos os prints de resultados finais, pois o Streamlit cuidará disso.
-    # O retorno agora é o histórico completo.
-    return historico_melhores_solucoes_gerais
-
-# O bloco if __name__ == "__main__": é para testar a função isoladamente no terminal,
-# e não será executado quando o Streamlit importar este módulo.
-if __name__ == "__main__":
-    # Exemplo de itens: (nome, peso, valor)
-    config_itens_ex1 = [
-        ("Lanterna", 2, 15), ("Saco de Dormir", 5, 30), ("Comida Enlatada", 10, 50),
-        ("Corda", 3, 20), ("Mapa", 1, 10), ("Bússola", 1, 15),
-        ("Kit Primeiros Socorros", 4, 25), ("Cantil", 2, 20), ("Faca", 1, 18),
-        ("Repelente", 1, 12), ("Câmera", 3, 40), ("Livro", 2, 5),
-        ("Barraca", 15, 70), ("Fogareiro", 6, 35), ("Panelas", 4, 22),
-        ("Rádio Solar", 3, 28), ("Bateria Extra", 2, 22), ("Chocolate", 1, 16)
-    ]
-    capacidade_mochila_ex1 = 35
-
-    print(f"\n--- Algoritmo Genético para o Problema da Mochila (Teste de Mochila GA) ---")
-    print(f"Itens: {len(config_itens_ex1)}, Capacidade Máxima: {capacidade_mochila_ex1}")
-    
-    historico_solucoes_teste = algoritmo_genetico_mochila_iterativo(
-        items_data=config_itens_ex1,
-        capacidade_maxima=capacidade_mochila_ex1,
-        tam_populacao=100,
-        num_geracoes=150,
-        taxa_mutacao=0.03,
-        taxa_cruzamento=0.90,
-        contagem_elitismo=3,
-        tam_torneio=5,
-        seed=42
-    )
-
-    if historico_solucoes_teste:
-        final_solucao, final_valor, final_peso, final_fitness = historico_solucoes_teste[-1]
-        print(f"\nResultado final para Exemplo 1 (do teste interno):")
-        print(f"Melhor Solução (cromossomo): {final_solucao}")
-        print(f"Valor Total: {final_valor}")
-        print(f"Peso Total: {final_peso}/{capacidade_mochila_ex1}")
-        print(f"Fitness Final: {final_fitness}")
-    else:
+import heapq
+import itertools
+import math
+import random
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import (
+    Any, Callable, Dict, Generator, Hashable, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Optional
+)
+
+# --- Representação do Item ---
+class Item:
+    def __init__(self, name: str, weight: int, value: int):
+        self.name = name
+        self.weight = weight
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Item(nome='{self.name}', peso={self.weight}, valor={self.value})"
+
+def pesos_e_valores(items_data: Sequence[Tuple[str, int, int]]) -> Tuple[List[int], List[int]]:
+    """
+    Retorna (pesos, valores) dos itens como listas. Um catálogo com colunas `pesos` e `valores`
+    (mochila_catalogo.CatalogoItens) é lido direto das colunas, sem montar tuplas nem ler nomes.
+    """
+    if hasattr(items_data, "pesos") and hasattr(items_data, "valores"):
+        return items_data.pesos.tolist(), items_data.valores.tolist()
+    return [peso for _, peso, _ in items_data], [valor for _, _, valor in items_data]
+
+# --- Funções Auxiliares do Algoritmo Genético ---
+# As funções que sorteiam recebem `gerador`: o random.Random da execução ou, por padrão, o
+# próprio módulo random (o estado global).
+
+def criar_individuo(num_items: int, gerador=random) -> List[int]:
+    """Cria um indivíduo aleatório (cromossomo) como uma lista de bits."""
+    return [gerador.randint(0, 1) for _ in range(num_items)]
+
+def inicializar_populacao(tam_populacao: int, num_items: int, gerador=random) -> List[List[int]]:
+    """Inicializa uma população de indivíduos aleatórios."""
+    return [criar_individuo(num_items, gerador) for _ in range(tam_populacao)]
+
+def calcular_detalhes_individuo(individuo: List[int], items: List[Item], capacidade_maxima: int) -> Tuple[int, int, int]:
+    """
+    Calcula os detalhes de um indivíduo (solução).
+    Retorna: (pontuacao_fitness, valor_total_real, peso_total_real)
+    A pontuacao_fitness é o valor_total_real se o peso estiver dentro da capacidade,
+    caso contrário, é 0 (penalidade).
+    """
+    peso_total = 0
+    valor_total = 0
+    for i, gene in enumerate(individuo):
+        if gene == 1:
+            peso_total += items[i].weight
+            valor_total += items[i].value
+
+    if peso_total > capacidade_maxima:
+        pontuacao_fitness = 0  # Penaliza fortemente soluções inválidas
+    else:
+        pontuacao_fitness = valor_total
+    return pontuacao_fitness, valor_total, peso_total
+
+def calcular_detalhes_colunas(individuo: List[int], pesos: List[int], valores: List[int],
+                              capacidade_maxima: int) -> Tuple[int, int, int]:
+    """Equivalente a calcular_detalhes_individuo, com os itens em listas de pesos e valores."""
+    peso_total = 0
+    valor_total = 0
+    for gene, peso, valor in zip(individuo, pesos, valores):
+        if gene == 1:
+            peso_total += peso
+            valor_total += valor
+
+    if peso_total > capacidade_maxima:
+        return 0, valor_total, peso_total
+    return valor_total, valor_total, peso_total
+
+def selecionar_indice_torneio(pontuacoes_fitness: List[int],
+                              tam_torneio: int,
+                              excluir: Optional[int] = None,
+                              gerador=random) -> int:
+    """
+    Seleciona o índice de um único pai usando seleção por torneio.
+    Se `excluir` for dado, esse índice não participa do torneio (usado para que o segundo
+    pai seja diferente do primeiro). Trabalha apenas com índices, sem copiar ou procurar
+    indivíduos na população.
+    """
+    tam_populacao = len(pontuacoes_fitness)
+    num_candidatos = tam_populacao - 1 if excluir is not None else tam_populacao
+    if num_candidatos <= 0:
+        raise ValueError("A população não pode estar vazia para seleção por torneio.")
+    
+    # Garante que o tamanho do torneio não exceda o número de candidatos disponíveis
+    k = min(tam_torneio, num_candidatos)
+    if k <= 0:
+        raise ValueError("Não é possível selecionar de uma população vazia ou com tamanho de torneio 0.")
+
+    # Sorteia posições entre os candidatos; as posições a partir do índice excluído
+    # são deslocadas em uma unidade para "pular" esse índice
+    indices_torneio = gerador.sample(range(num_candidatos), k)
+    if excluir is not None:
+        indices_torneio = [indice + 1 if indice >= excluir else indice for indice in indices_torneio]
+
+    melhor_indice_contendor = -1
+    melhor_fitness_contendor = -1 # Assume-se fitness não negativo
+
+    for indice in indices_torneio:
+        if pontuacoes_fitness[indice] > melhor_fitness_contendor:
+            melhor_fitness_contendor = pontuacoes_fitness[indice]
+            melhor_indice_contendor = indice
+            
+    # Lógica do notebook original: se todos os contendores tiverem fitness negativo,
+    # nenhum melhor foi achado e retorna-se o primeiro do torneio.
+    if melhor_indice_contendor == -1:
+        return indices_torneio[0]
+        
+    return melhor_indice_contendor
+
+def selecionar_pai_torneio(populacao: List[List[int]],
+                             pontuacoes_fitness: List[int],
+                             tam_torneio: int,
+                             gerador=random) -> List[int]:
+    """Seleciona um único pai usando seleção por torneio."""
+    if not populacao:
+        raise ValueError("A população não pode estar vazia para seleção por torneio.")
+    return populacao[selecionar_indice_torneio(pontuacoes_fitness, tam_torneio, gerador=gerador)]
+
+
+def cruzamento_ponto_unico(pai1: List[int], pai2: List[int], taxa_cruzamento: float, gerador=random) -> Tuple[List[int], List[int]]:
+    """Realiza cruzamento de ponto único entre dois pais se a taxa_cruzamento for atingida."""
+    ponto = sortear_ponto_corte(min(len(pai1), len(pai2)), taxa_cruzamento, gerador)
+    if ponto is None:
+        return pai1[:], pai2[:] # Copia os pais por padrão
+    return cruzar_no_ponto(pai1, pai2, ponto)
+
+def sortear_ponto_corte(num_genes: int, taxa_cruzamento: float, gerador=random) -> Optional[int]:
+    """Sorteia se haverá cruzamento e, se houver, o ponto de corte; retorna None se não houver."""
+    if gerador.random() < taxa_cruzamento and num_genes > 1: # Garante que cruzamento é possível
+        return gerador.randint(1, num_genes - 1)
+    return None
+
+def cruzar_no_ponto(pai1: List[int], pai2: List[int], ponto: int) -> Tuple[List[int], List[int]]:
+    """Gera os dois filhos do cruzamento de ponto único no ponto dado."""
+    return pai1[:ponto] + pai2[ponto:], pai2[:ponto] + pai1[ponto:]
+
+def mutacao_bit_flip(individuo: List[int], taxa_mutacao: float, gerador=random) -> List[int]:
+    """Realiza mutação bit-flip em um indivíduo."""
+    return inverter_genes(individuo, amostrar_posicoes_bit_flip(len(individuo), taxa_mutacao, gerador))
+
+def amostrar_posicoes_bit_flip(num_genes: int, taxa_mutacao: float, gerador=random) -> List[int]:
+    """Sorteia as posições que sofrem mutação com um sorteio independente por gene."""
+    sortear = gerador.random
+    return [i for i in range(num_genes) if sortear() < taxa_mutacao]
+
+def inverter_genes(individuo: List[int], posicoes: List[int]) -> List[int]:
+    """Retorna uma cópia do indivíduo com os bits das posições dadas invertidos."""
+    individuo_mutado = individuo[:]
+    for i in posicoes:
+        individuo_mutado[i] = 1 - individuo_mutado[i]  # Inverte o bit
+    return individuo_mutado
+
+def posicoes_diferentes(individuo1: List[int], individuo2: List[int], inicio: int, fim: int) -> List[int]:
+    """Posições em [inicio, fim) onde os dois indivíduos têm genes diferentes."""
+    return [i for i in range(inicio, fim) if individuo1[i] != individuo2[i]]
+
+def amostrar_posicoes_mutacao(num_genes: int, taxa_mutacao: float, gerador=random) -> List[int]:
+    """
+    Sorteia as posições (em ordem crescente) que sofrem mutação, com a mesma distribuição
+    de um sorteio independente por gene. Os saltos entre posições seguem uma distribuição
+    geométrica, então o custo é proporcional ao número esperado de mutações
+    (num_genes * taxa_mutacao) e não ao tamanho do cromossomo.
+    """
+    if taxa_mutacao <= 0:
+        return []
+    if taxa_mutacao >= 1:
+        return list(range(num_genes))
+    log_nao_mutar = math.log(1.0 - taxa_mutacao)
+    posicoes = []
+    posicao = -1
+    while True:
+        # Número de genes não mutados antes da próxima mutação ~ Geométrica(taxa_mutacao)
+        posicao += 1 + int(math.log(1.0 - gerador.random()) / log_nao_mutar)
+        if posicao >= num_genes:
+            return posicoes
+        posicoes.append(posicao)
+
+def mutacao_bit_flip_geometrica(individuo: List[int], taxa_mutacao: float, gerador=random) -> List[int]:
+    """Mutação bit-flip com sorteio por saltos geométricos (ver amostrar_posicoes_mutacao)."""
+    return inverter_genes(individuo, amostrar_posicoes_mutacao(len(individuo), taxa_mutacao, gerador))
+
+# --- Avaliação Incremental ---
+# Um filho difere dos pais apenas no trecho trocado pelo cruzamento e nos genes mutados,
+# então seus totais de peso e valor podem ser obtidos a partir dos totais dos pais
+# somando apenas a contribuição dos genes alterados.
+
+def totais_apos_cruzamento(pai1, pai2, totais_pai1: Tuple[int, int], totais_pai2: Tuple[int, int],
+                           ponto: int, pesos: List[int], valores: List[int],
+                           posicoes_diferentes=posicoes_diferentes) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Calcula os totais (peso, valor) dos filhos de cruzar_no_ponto(pai1, pai2, ponto) a partir
+    dos totais dos pais, percorrendo apenas o trecho mais curto ao redor do ponto de corte.
+    """
+    num_genes = len(pai1)
+    if ponto <= num_genes - ponto:
+        # filho1 é o pai2 com o trecho inicial do pai1 (e o filho2, o contrário)
+        base1, base2, doador1, inicio, fim = totais_pai2, totais_pai1, pai1, 0, ponto
+    else:
+        # filho1 é o pai1 com o trecho final do pai2 (e o filho2, o contrário)
+        base1, base2, doador1, inicio, fim = totais_pai1, totais_pai2, pai2, ponto, num_genes
+    delta_peso = 0
+    delta_valor = 0
+    for i in posicoes_diferentes(pai1, pai2, inicio, fim):
+        if doador1[i] == 1:
+            delta_peso += pesos[i]
+            delta_valor += valores[i]
+        else:
+            delta_peso -= pesos[i]
+            delta_valor -= valores[i]
+    return (base1[0] + delta_peso, base1[1] + delta_valor), (base2[0] - delta_peso, base2[1] - delta_valor)
+
+def totais_apos_mutacao(individuo_mutado, totais: Tuple[int, int], posicoes: List[int],
+                        pesos: List[int], valores: List[int]) -> Tuple[int, int]:
+    """Atualiza os totais (peso, valor) de um indivíduo cujos genes nas `posicoes` foram invertidos."""
+    peso_total, valor_total = totais
+    for i in posicoes:
+        if individuo_mutado[i] == 1:
+            peso_total += pesos[i]
+            valor_total += valores[i]
+        else:
+            peso_total -= pesos[i]
+            valor_total -= valores[i]
+    return peso_total, valor_total
+
+# --- Reparo e Inicialização Gulosa ---
+
+def ordenar_por_razao(pesos: List[int], valores: List[int]) -> List[int]:
+    """Índices dos itens em ordem decrescente de razão valor/peso (itens sem peso primeiro)."""
+    return sorted(range(len(pesos)), key=lambda i: valores[i] / pesos[i] if pesos[i] > 0 else math.inf, reverse=True)
+
+def solucao_gulosa(pesos: List[int], capacidade_maxima: int, ordem_razao: List[int]) -> List[int]:
+    """Solução gulosa: adiciona os itens na ordem de razão valor/peso enquanto couberem."""
+    solucao = [0] * len(pesos)
+    peso_total = 0
+    for i in ordem_razao:
+        if peso_total + pesos[i] <= capacidade_maxima:
+            solucao[i] = 1
+            peso_total += pesos[i]
+    return solucao
+
+def reparar_individuo(individuo: List[int], peso_total: int, valor_total: int,
+                      pesos: List[int], valores: List[int], capacidade_maxima: int,
+                      ordem_razao: List[int]) -> Tuple[List[int], int, int]:
+    """
+    Torna um indivíduo viável: retira os itens de menor razão valor/peso até o peso caber
+    na capacidade e depois adiciona, do maior para o menor razão, os itens que ainda couberem.
+    Retorna (individuo_reparado, peso_total, valor_total); o indivíduo original não é alterado.
+    """
+    reparado = individuo[:]
+    for i in reversed(ordem_razao):
+        if peso_total <= capacidade_maxima:
+            break
+        if reparado[i] == 1:
+            reparado[i] = 0
+            peso_total -= pesos[i]
+            valor_total -= valores[i]
+    for i in ordem_razao:
+        if reparado[i] == 0 and peso_total + pesos[i] <= capacidade_maxima:
+            reparado[i] = 1
+            peso_total += pesos[i]
+            valor_total += valores[i]
+    return reparado, peso_total, valor_total
+
+# --- Busca Local (Memética) ---
+# Subida de encosta aplicada aos elites de cada geração. O ganho de cada movimento sai dos
+# totais de peso e valor já conhecidos (O(1) por movimento), e os candidatos vêm da ordem por
+# razão valor/peso: os fora da mochila de maior razão e os dentro de menor razão.
+
+def busca_local(individuo: List[int], peso_total: int, valor_total: int,
+                pesos: List[int], valores: List[int], capacidade_maxima: int,
+                ordem_razao: List[int], max_movimentos: int,
+                tamanho_vizinhanca: int = 32) -> Tuple[List[int], int, int, int]:
+    """
+    Melhora um indivíduo com até `max_movimentos` movimentos de melhor melhoria entre:
+    adicionar um item que cabe e trocar um item de dentro por um de fora mais valioso que
+    caiba na folga. A vizinhança é limitada aos `tamanho_vizinhanca` primeiros candidatos de
+    cada lado na ordem por razão. Um indivíduo acima da capacidade antes perde os itens de
+    menor razão até caber (retiradas que não contam no limite de movimentos).
+    Retorna (individuo, peso_total, valor_total, num_movimentos); o original não é alterado.
+    """
+    melhorado = individuo[:]
+    for i in reversed(ordem_razao):
+        if peso_total <= capacidade_maxima:
+            break
+        if melhorado[i] == 1:
+            melhorado[i] = 0
+            peso_total -= pesos[i]
+            valor_total -= valores[i]
+
+    num_movimentos = 0
+    while num_movimentos < max_movimentos:
+        folga = capacidade_maxima - peso_total
+        fora = list(itertools.islice((i for i in ordem_razao if melhorado[i] == 0), tamanho_vizinhanca))
+        dentro = list(itertools.islice((i for i in reversed(ordem_razao) if melhorado[i] == 1), tamanho_vizinhanca))
+        melhor_ganho, entra, sai = 0, None, None
+        for j in fora:
+            if pesos[j] <= folga and valores[j] > melhor_ganho:
+                melhor_ganho, entra, sai = valores[j], j, None
+        for i in dentro:
+            folga_sem_i = folga + pesos[i]
+            for j in fora:
+                if pesos[j] <= folga_sem_i and valores[j] - valores[i] > melhor_ganho:
+                    melhor_ganho, entra, sai = valores[j] - valores[i], j, i
+        if entra is None:
+            break  # Ótimo local na vizinhança
+        melhorado[entra] = 1
+        peso_total += pesos[entra]
+        valor_total += valores[entra]
+        if sai is not None:
+            melhorado[sai] = 0
+            peso_total -= pesos[sai]
+            valor_total -= valores[sai]
+        num_movimentos += 1
+    return melhorado, peso_total, valor_total, num_movimentos
+
+# --- Cache de Avaliações ---
+
+class CacheFitnessLRU:
+    """
+    Cache de avaliações de indivíduos com tamanho máximo. Quando cheio, descarta a entrada
+    usada há mais tempo (LRU). Conta acertos e falhas para o relatório da execução.
+    """
+
+    def __init__(self, tamanho_maximo: int):
+        if tamanho_maximo <= 0:
+            raise ValueError("O tamanho máximo do cache deve ser positivo.")
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._entradas: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache para `chave`, calculando-o com `calcular()` se necessário."""
+        entradas = self._entradas
+        try:
+            valor = entradas[chave]
+        except KeyError:
+            self.falhas += 1
+            valor = calcular()
+            entradas[chave] = valor
+            if len(entradas) > self.tamanho_maximo:
+                entradas.popitem(last=False)  # Descarta a entrada usada há mais tempo
+            return valor
+        self.acertos += 1
+        entradas.move_to_end(chave)
+        return valor
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores do cache: acertos, falhas, entradas atuais e tamanho máximo."""
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "entradas": len(self._entradas),
+            "tamanho_maximo": self.tamanho_maximo,
+        }
+
+# --- Critérios de Parada ---
+
+# Critérios que podem encerrar a execução, registrados em estatisticas["criterio_parada"]
+CRITERIOS_PARADA = ("num_geracoes", "sem_melhoria", "diversidade", "tempo", "limite_superior")
+
+def diversidade_por_contagens(contagens_genes: Sequence[int], tam_populacao: int) -> float:
+    """
+    Diversidade da população a partir do número de indivíduos com cada gene igual a 1:
+    a distância de Hamming média entre pares de indivíduos, dividida pelo número de genes.
+    Vale 0 quando todos são iguais e no máximo ~0.5 (genes meio a meio).
+    """
+    if tam_populacao < 2 or not contagens_genes:
+        return 0.0
+    pares_diferentes = sum(c * (tam_populacao - c) for c in contagens_genes)
+    return pares_diferentes / (len(contagens_genes) * tam_populacao * (tam_populacao - 1) / 2)
+
+class CriteriosParada:
+    """
+    Critérios de parada antecipada, verificados ao fim de cada geração:
+    - "sem_melhoria": o melhor fitness não melhora há `max_geracoes_sem_melhoria` gerações;
+    - "diversidade": diversidade_por_contagens da população abaixo de `diversidade_minima`;
+    - "tempo": mais de `tempo_maximo` segundos desde a criação (tempo de relógio);
+    - "limite_superior": o melhor fitness atingiu o limite da relaxação fracionária
+      (limite_superior_fracionario), ou seja, a solução é comprovadamente ótima.
+    Valores 0 (ou False) desativam o critério correspondente.
+    """
+
+    def __init__(self, items_data: List[Tuple[str, int, int]], capacidade_maxima: int,
+                 max_geracoes_sem_melhoria: int = 0, diversidade_minima: float = 0.0,
+                 tempo_maximo: float = 0.0, parar_no_limite_superior: bool = False):
+        self.max_geracoes_sem_melhoria = max_geracoes_sem_melhoria
+        self.diversidade_minima = diversidade_minima
+        self.tempo_maximo = tempo_maximo
+        self.limite_superior: Optional[int] = None
+        if parar_no_limite_superior:
+            from mochila_exata import limite_superior_fracionario
+            self.limite_superior = limite_superior_fracionario(items_data, capacidade_maxima)
+        self.inicio = time.perf_counter()
+        self.melhor_fitness = -1
+        self.geracoes_sem_melhoria = 0
+
+    def verificar(self, melhor_fitness: int, contar_genes: Callable[[], Sequence[int]], tam_populacao: int) -> Optional[str]:
+        """
+        Atualiza o contador de estagnação com o melhor fitness global desta geração e retorna
+        o nome do critério atingido, ou None para continuar. `contar_genes` só é chamada se o
+        critério de diversidade estiver ativo, pois custa O(tam_populacao × num_items).
+        """
+        if melhor_fitness > self.melhor_fitness:
+            self.melhor_fitness = melhor_fitness
+            self.geracoes_sem_melhoria = 0
+        else:
+            self.geracoes_sem_melhoria += 1
+        if self.limite_superior is not None and melhor_fitness >= self.limite_superior:
+            return "limite_superior"
+        if self.max_geracoes_sem_melhoria > 0 and self.geracoes_sem_melhoria >= self.max_geracoes_sem_melhoria:
+            return "sem_melhoria"
+        if self.diversidade_minima > 0 and diversidade_por_contagens(contar_genes(), tam_populacao) < self.diversidade_minima:
+            return "diversidade"
+        if self.tempo_maximo > 0 and time.perf_counter() - self.inicio >= self.tempo_maximo:
+            return "tempo"
+        return None
+
+# --- Instrumentação ---
+
+# Fases do laço principal medidas pela Instrumentacao
+FASES_GERACAO = ("avaliacao", "ordenacao", "busca_local", "selecao", "cruzamento", "mutacao")
+
+class Instrumentacao:
+    """
+    Medição opcional do laço principal do AG: tempo acumulado e número de operações por fase
+    (FASES_GERACAO), no total e geração a geração, mais callbacks chamados durante a execução:
+    - ao_iniciar_geracao(geracao) antes de avaliar a população;
+    - ao_finalizar_geracao(estado) com o EstadoGeracao da geração;
+    - ao_encontrar_melhor(estado) quando a melhor solução global melhora.
+    O AG só mede os tempos quando recebe uma instância desta classe; sem ela o laço não
+    chama o relógio. O resumo fica em `historico.estatisticas["instrumentacao"]`.
+    """
+
+    def __init__(self,
+                 ao_iniciar_geracao: Optional[Callable[[int], None]] = None,
+                 ao_finalizar_geracao: Optional[Callable[["EstadoGeracao"], None]] = None,
+                 ao_encontrar_melhor: Optional[Callable[["EstadoGeracao"], None]] = None):
+        self.ao_iniciar_geracao = ao_iniciar_geracao
+        self.ao_finalizar_geracao = ao_finalizar_geracao
+        self.ao_encontrar_melhor = ao_encontrar_melhor
+        self.tempos: Dict[str, float] = dict.fromkeys(FASES_GERACAO, 0.0)
+        self.chamadas: Dict[str, int] = dict.fromkeys(FASES_GERACAO, 0)
+        self.tempos_por_geracao: List[Dict[str, float]] = []
+
+    def registrar_geracao(self, tempos: Dict[str, float], chamadas: Dict[str, int]) -> None:
+        """Acumula os tempos (segundos) e contagens de operações de uma geração."""
+        for fase, tempo in tempos.items():
+            self.tempos[fase] += tempo
+        for fase, quantidade in chamadas.items():
+            self.chamadas[fase] += quantidade
+        self.tempos_por_geracao.append(tempos)
+
+    def resumo(self) -> Dict[str, Any]:
+        """Dados de tempo em tipos simples (dict/list/float/int), prontos para serializar."""
+        return {
+            "tempos": dict(self.tempos),
+            "chamadas": dict(self.chamadas),
+            "tempos_por_geracao": list(self.tempos_por_geracao),
+        }
+
+# --- Taxas Adaptativas ---
+
+# Operadores de cruzamento sorteados pelas taxas adaptativas
+OPERADORES_CRUZAMENTO = ("ponto_unico", "dois_pontos", "uniforme")
+
+def sortear_posicoes_troca(indice_operador: int, pai1, pai2, diferencas=posicoes_diferentes, gerador=random) -> List[int]:
+    """
+    Sorteia o cruzamento OPERADORES_CRUZAMENTO[indice_operador] entre os pais e retorna as
+    posições trocadas em que os genes deles diferem: os filhos são os pais com esses genes
+    invertidos (ver totais_apos_troca). Trocar genes iguais não muda nada, então o uniforme
+    só sorteia entre as posições diferentes.
+    """
+    num_genes = len(pai1)
+    operador = OPERADORES_CRUZAMENTO[indice_operador]
+    if operador == "uniforme":
+        return [i for i in diferencas(pai1, pai2, 0, num_genes) if gerador.random() < 0.5]
+    if operador == "dois_pontos" and num_genes > 2:
+        inicio, fim = sorted(gerador.sample(range(1, num_genes), 2))
+        return diferencas(pai1, pai2, inicio, fim)
+    ponto = gerador.randint(1, num_genes - 1)
+    # Trocar o trecho inicial ou o final gera o mesmo par de filhos: percorre o mais curto
+    if ponto <= num_genes - ponto:
+        return diferencas(pai1, pai2, 0, ponto)
+    return diferencas(pai1, pai2, ponto, num_genes)
+
+def totais_apos_troca(pai2, totais_pai1: Tuple[int, int], totais_pai2: Tuple[int, int], trocadas: List[int],
+                      pesos: List[int], valores: List[int]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Totais (peso, valor) dos filhos de sortear_posicoes_troca; o filho1 recebe os genes do pai2."""
+    delta_peso = 0
+    delta_valor = 0
+    for i in trocadas:
+        if pai2[i] == 1:
+            delta_peso += pesos[i]
+            delta_valor += valores[i]
+        else:
+            delta_peso -= pesos[i]
+            delta_valor -= valores[i]
+    return ((totais_pai1[0] + delta_peso, totais_pai1[1] + delta_valor),
+            (totais_pai2[0] - delta_peso, totais_pai2[1] - delta_valor))
+
+class TaxasAdaptativas:
+    """
+    Ajuste automático dos operadores durante a execução (taxas_adaptativas=True), feito ao
+    fim de cada geração com o que foi medido nela:
+    - a taxa de mutação segue a regra de 1/5 de sucesso: é multiplicada por `fator` se mais
+      de 1/5 dos filhos mutados ficaram com fitness maior que antes da mutação, e dividida
+      se menos. Se a diversidade da população (diversidade_por_contagens) estiver abaixo de
+      `diversidade_alvo`, é multiplicada ainda por fator², para voltar a explorar. Fica
+      sempre entre 1/(2 × num_items) e `taxa_maxima`;
+    - o cruzamento de cada par é sorteado entre OPERADORES_CRUZAMENTO com probabilidade
+      proporcional ao crédito do operador (média exponencial, com peso `peso_credito`, da
+      fração de filhos melhores que o melhor dos pais), com no mínimo `probabilidade_minima`
+      para cada um. A taxa_cruzamento continua decidindo se o par cruza.
+    Os valores usados em cada geração ficam em `registro`; o resumo vai para
+    `historico.estatisticas["taxas_adaptativas"]`.
+    """
+
+    def __init__(self, taxa_mutacao: float, num_items: int, diversidade_alvo: float = 0.05,
+                 fator: float = 1.1, taxa_maxima: float = 0.25, peso_credito: float = 0.2,
+                 probabilidade_minima: float = 0.1, gerador=random):
+        self.gerador = gerador  # Só usado em escolher_operador
+        self.taxa_minima = 0.5 / max(num_items, 1)
+        self.taxa_maxima = max(taxa_maxima, self.taxa_minima)
+        self.diversidade_alvo = diversidade_alvo
+        self.fator = fator
+        self.peso_credito = peso_credito
+        self.probabilidade_minima = probabilidade_minima
+        self.taxa_mutacao = min(max(taxa_mutacao, self.taxa_minima), self.taxa_maxima)
+        self.creditos = [0.0] * len(OPERADORES_CRUZAMENTO)
+        self.probabilidades = self._calcular_probabilidades()
+        self._zerar_contagens()
+        self.registro: Dict[str, Any] = {
+            "geracao": [], "taxa_mutacao": [], "diversidade": [], "sucesso_mutacao": [],
+            "probabilidades": {operador: [] for operador in OPERADORES_CRUZAMENTO},
+        }
+
+    def _zerar_contagens(self) -> None:
+        self.tentativas_cruzamento = [0] * len(OPERADORES_CRUZAMENTO)
+        self.sucessos_cruzamento = [0] * len(OPERADORES_CRUZAMENTO)
+        self.tentativas_mutacao = 0
+        self.sucessos_mutacao = 0
+
+    def _calcular_probabilidades(self) -> List[float]:
+        num_operadores = len(self.creditos)
+        total = sum(self.creditos)
+        if total <= 0:
+            return [1.0 / num_operadores] * num_operadores
+        livre = 1.0 - num_operadores * self.probabilidade_minima
+        return [self.probabilidade_minima + livre * credito / total for credito in self.creditos]
+
+    def escolher_operador(self) -> int:
+        """Índice em OPERADORES_CRUZAMENTO sorteado com as probabilidades atuais."""
+        sorteio = self.gerador.random()
+        for indice, probabilidade in enumerate(self.probabilidades):
+            sorteio -= probabilidade
+            if sorteio < 0:
+                return indice
+        return len(self.probabilidades) - 1
+
+    def registrar_cruzamento(self, indice_operador: int, tentativas: int, sucessos: int) -> None:
+        self.tentativas_cruzamento[indice_operador] += tentativas
+        self.sucessos_cruzamento[indice_operador] += sucessos
+
+    def registrar_mutacao(self, tentativas: int, sucessos: int) -> None:
+        self.tentativas_mutacao += tentativas
+        self.sucessos_mutacao += sucessos
+
+    def atualizar(self, geracao: int, diversidade: float) -> None:
+        """Registra os valores usados na geração e calcula os da próxima."""
+        sucesso_mutacao = self.sucessos_mutacao / self.tentativas_mutacao if self.tentativas_mutacao else None
+        registro = self.registro
+        registro["geracao"].append(geracao)
+        registro["taxa_mutacao"].append(self.taxa_mutacao)
+        registro["diversidade"].append(diversidade)
+        registro["sucesso_mutacao"].append(sucesso_mutacao)
+        for operador, probabilidade in zip(OPERADORES_CRUZAMENTO, self.probabilidades):
+            registro["probabilidades"][operador].append(probabilidade)
+
+        taxa = self.taxa_mutacao
+        if sucesso_mutacao is not None and sucesso_mutacao > 0.2:
+            taxa *= self.fator
+        elif sucesso_mutacao is not None and sucesso_mutacao < 0.2:
+            taxa /= self.fator
+        if diversidade < self.diversidade_alvo:
+            taxa *= self.fator * self.fator
+        self.taxa_mutacao = min(max(taxa, self.taxa_minima), self.taxa_maxima)
+
+        for indice, tentativas in enumerate(self.tentativas_cruzamento):
+            if tentativas:
+                sucesso = self.sucessos_cruzamento[indice] / tentativas
+                self.creditos[indice] += self.peso_credito * (sucesso - self.creditos[indice])
+        self.probabilidades = self._calcular_probabilidades()
+        self._zerar_contagens()
+
+    def estado(self) -> Dict[str, Any]:
+        """Estado entre gerações (taxa e créditos), gravado nos checkpoints."""
+        return {"taxa_mutacao": self.taxa_mutacao, "creditos": list(self.creditos)}
+
+    def restaurar(self, estado: Dict[str, Any]) -> None:
+        self.taxa_mutacao = estado["taxa_mutacao"]
+        self.creditos = list(estado["creditos"])
+        self.probabilidades = self._calcular_probabilidades()
+
+    def resumo(self) -> Dict[str, Any]:
+        """Registro por geração e valores finais, em tipos simples (prontos para serializar)."""
+        return {
+            "registro": {
+                chave: ({operador: list(valores) for operador, valores in coluna.items()}
+                        if isinstance(coluna, dict) else list(coluna))
+                for chave, coluna in self.registro.items()
+            },
+            "taxa_mutacao_final": self.taxa_mutacao,
+            "creditos": dict(zip(OPERADORES_CRUZAMENTO, self.creditos)),
+        }
+
+def _normalizar_parametros(tam_populacao: int, contagem_elitismo: int, tam_torneio: int) -> Tuple[int, int]:
+    """Ajusta elitismo e tamanho do torneio para valores válidos (comportamento do notebook)."""
+    if contagem_elitismo < 0:
+        contagem_elitismo = 0
+    if contagem_elitismo >= tam_populacao:
+        contagem_elitismo = max(0, tam_populacao -1) 
+    if tam_torneio <= 0:
+        tam_torneio = 1
+    return contagem_elitismo, tam_torneio
+
+# Motores de execução disponíveis para algoritmo_genetico_mochila_iterativo
+MOTORES = ("python", "bits", "numpy")
+# Modos de mutação: um sorteio por gene ("bit_flip") ou saltos geométricos ("geometrica")
+MODOS_MUTACAO = ("bit_flip", "geometrica")
+
+_PARA_DIGITOS = bytes.maketrans(b"\x00\x01", b"01")
+_DE_DIGITOS = bytes.maketrans(b"01", b"\x00\x01")
+
+def empacotar_genes(individuo: Sequence[int], num_bytes: int) -> bytes:
+    """Empacota um cromossomo List[int] em bits (gene i = bit i), sem laço Python por gene."""
+    digitos = bytes(individuo).translate(_PARA_DIGITOS)[::-1]
+    return (int(digitos, 2) if digitos else 0).to_bytes(num_bytes, "little")
+
+def desempacotar_genes(dados: bytes, num_items: int) -> List[int]:
+    """Inverso de empacotar_genes."""
+    if num_items == 0:
+        return []
+    digitos = format(int.from_bytes(dados, "little"), f"0{num_items}b").encode()
+    return list(digitos[::-1].translate(_DE_DIGITOS))
+
+class HistoricoAG(Sequence):
+    """
+    Histórico retornado pelo algoritmo genético: uma sequência com uma tupla
+    (melhor_solucao_cromossomo, valor_real, peso_real, fitness) por geração, como antes,
+    mais um dicionário `estatisticas` com informações extras da execução e, se pedida com
+    retornar_populacao=True, a `populacao_final` (cromossomos como List[int]).
+
+    Como a melhor solução global só muda quando melhora, o histórico é guardado em trechos:
+    uma entrada por melhoria, com o cromossomo empacotado em bits (empacotar_genes) e o
+    valor, peso e fitness em arrays int64, mais a geração em que cada trecho começa. A memória
+    é O(num_melhorias × num_items / 8) em vez de O(num_geracoes × num_items). As tuplas de cada
+    geração são reconstruídas no acesso; gerações do mesmo trecho compartilham a mesma lista
+    do cromossomo (não altere).
+
+    Com `genes_inteiros` (mochila_multidimensional), os genes podem valer de 0 a 255 e são
+    guardados um byte por gene, e o peso de cada tupla é a matriz de cargas (uma tupla de
+    tuplas), guardada em uma lista.
+    """
+
+    def __init__(self, tuplas: Iterable[Tuple[List[int], int, int, int]] = (), genes_inteiros: bool = False):
+        self.genes_inteiros = genes_inteiros
+        self.inicio_trechos = array("q")  # Primeira geração de cada trecho
+        self.cromossomos: List[bytes] = []  # Cromossomo de cada trecho, empacotado
+        self.num_genes = array("q")
+        self.valores = array("q")
+        self.pesos = [] if genes_inteiros else array("q")
+        self.fitness = array("q")
+        self.num_geracoes = 0
+        self.estatisticas: Dict[str, Any] = {}
+        self.populacao_final: Optional[List[List[int]]] = None
+        self._ultimo_cromossomo: Optional[List[int]] = None  # Objeto da última tupla adicionada
+        self._trecho_desempacotado: Tuple[int, Optional[List[int]]] = (-1, None)
+        self.extend(tuplas)
+
+    def append(self, tupla: Tuple[List[int], int, int, int]) -> None:
+        """Adiciona a tupla de uma geração; abre um trecho novo só se a solução mudou."""
+        cromossomo, valor, peso, fitness = tupla
+        if self.cromossomos and (valor, peso, fitness) == (self.valores[-1], self.pesos[-1], self.fitness[-1]):
+            # O mesmo objeto (caso comum no AG) dispensa comparar os genes
+            if cromossomo is self._ultimo_cromossomo or (
+                    len(cromossomo) == self.num_genes[-1] and self._empacotar(cromossomo) == self.cromossomos[-1]):
+                self._ultimo_cromossomo = cromossomo
+                self.num_geracoes += 1
+                return
+        self.inicio_trechos.append(self.num_geracoes)
+        self.cromossomos.append(self._empacotar(cromossomo))
+        self.num_genes.append(len(cromossomo))
+        self.valores.append(valor)
+        self.pesos.append(peso)
+        self.fitness.append(fitness)
+        self._ultimo_cromossomo = cromossomo
+        self.num_geracoes += 1
+
+    def extend(self, tuplas: Iterable[Tuple[List[int], int, int, int]]) -> None:
+        for tupla in tuplas:
+            self.append(tupla)
+
+    def _empacotar(self, cromossomo: List[int]) -> bytes:
+        if self.genes_inteiros:
+            return bytes(cromossomo)
+        return empacotar_genes(cromossomo, (len(cromossomo) + 7) // 8)
+
+    def _cromossomo_trecho(self, trecho: int) -> List[int]:
+        # Guarda o último trecho desempacotado: acessos seguidos costumam cair no mesmo trecho
+        if self._trecho_desempacotado[0] != trecho:
+            dados = self.cromossomos[trecho]
+            cromossomo = list(dados) if self.genes_inteiros else desempacotar_genes(dados, self.num_genes[trecho])
+            self._trecho_desempacotado = (trecho, cromossomo)
+        return self._trecho_desempacotado[1]
+
+    def _tupla_trecho(self, trecho: int) -> Tuple[List[int], int, int, int]:
+        return self._cromossomo_trecho(trecho), self.valores[trecho], self.pesos[trecho], self.fitness[trecho]
+
+    def __len__(self) -> int:
+        return self.num_geracoes
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self.num_geracoes))]
+        if indice < 0:
+            indice += self.num_geracoes
+        if not 0 <= indice < self.num_geracoes:
+            raise IndexError("Geração fora do histórico.")
+        return self._tupla_trecho(bisect_right(self.inicio_trechos, indice) - 1)
+
+    def __iter__(self) -> Iterator[Tuple[List[int], int, int, int]]:
+        for trecho, inicio in enumerate(self.inicio_trechos):
+            fim = self.inicio_trechos[trecho + 1] if trecho + 1 < len(self.inicio_trechos) else self.num_geracoes
+            tupla = self._tupla_trecho(trecho)
+            for _ in range(fim - inicio):
+                yield tupla
+
+    def trechos(self) -> List[Tuple[int, Tuple[List[int], int, int, int]]]:
+        """Uma entrada (primeira_geracao, tupla) por melhoria da solução global."""
+        return [(inicio, self._tupla_trecho(trecho)) for trecho, inicio in enumerate(self.inicio_trechos)]
+
+    def __eq__(self, outro: object) -> bool:
+        if not isinstance(outro, (HistoricoAG, list)):
+            return NotImplemented
+        return len(self) == len(outro) and all(a == b for a, b in zip(self, outro))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"HistoricoAG({list(self)!r})"
+
+class EstadoGeracao(NamedTuple):
+    """Instantâneo de uma geração, produzido por algoritmo_genetico_mochila_geracoes."""
+    geracao: int
+    cromossomo: List[int]  # Melhor solução global até esta geração (compartilhada entre gerações: não altere)
+    valor: int
+    peso: int
+    fitness: int
+    fitness_medio: float  # Estatísticas da população desta geração
+    fitness_maximo: int
+    fitness_minimo: int
+    num_viaveis: int
+
+    def como_tupla(self) -> Tuple[List[int], int, int, int]:
+        """Tupla (melhor_solucao_cromossomo, valor_real, peso_real, fitness) usada no histórico."""
+        return self.cromossomo, self.valor, self.peso, self.fitness
+
+def _coletar_historico(geracoes: Generator[EstadoGeracao, None, Dict[str, Any]]) -> HistoricoAG:
+    """Consome um gerador de gerações até o fim e monta o HistoricoAG correspondente."""
+    historico = HistoricoAG()
+    while True:
+        try:
+            estado = next(geracoes)
+        except StopIteration as fim:
+            resumo = fim.value or {}
+            historico.estatisticas.update(resumo.get("estatisticas", {}))
+            historico.populacao_final = resumo.get("populacao_final")
+            return historico
+        historico.append(estado.como_tupla())
+
+# --- Algoritmo Genético Principal (Adaptado para retornar histórico para Streamlit) ---
+def algoritmo_genetico_mochila_iterativo( # Renomeada para deixar claro que é a versão iterativa
+    items_data: List[Tuple[str, int, int]],
+    capacidade_maxima: int,
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    motor: str = "python",
+    modo_mutacao: str = "bit_flip",
+    avaliacao_incremental: bool = True,
+    tamanho_cache_fitness: int = 0,
+    reparar_inviaveis: bool = False,
+    fracao_gulosa: float = 0.0,
+    populacao_inicial: Optional[List[List[int]]] = None,
+    retornar_populacao: bool = False,
+    max_geracoes_sem_melhoria: int = 0,
+    diversidade_minima: float = 0.0,
+    tempo_maximo: float = 0.0,
+    parar_no_limite_superior: bool = False,
+    instrumentacao: Optional[Instrumentacao] = None,
+    arquivo_checkpoint: Optional[str] = None,
+    intervalo_checkpoint: float = 60.0,
+    checkpoint_inicial: Optional[Any] = None,
+    taxas_adaptativas: bool = False,
+    busca_local_movimentos: int = 0
+) -> HistoricoAG: # Retorna histórico de (melhor_solucao_cromossomo, valor_real, peso_real, fitness_calculado)
+    """
+    Resolve o problema da mochila usando um algoritmo genético, retornando o histórico
+    da melhor solução (cromossomo, valor real, peso real, fitness) encontrada globalmente
+    até cada geração. Executa algoritmo_genetico_mochila_geracoes até o fim; os parâmetros
+    estão descritos lá.
+    """
+    return _coletar_historico(algoritmo_genetico_mochila_geracoes(
+        items_data, capacidade_maxima, tam_populacao, num_geracoes, taxa_mutacao,
+        taxa_cruzamento, contagem_elitismo, tam_torneio, seed, motor, modo_mutacao,
+        avaliacao_incremental, tamanho_cache_fitness, reparar_inviaveis, fracao_gulosa,
+        populacao_inicial, retornar_populacao, max_geracoes_sem_melhoria, diversidade_minima,
+        tempo_maximo, parar_no_limite_superior, instrumentacao, arquivo_checkpoint,
+        intervalo_checkpoint, checkpoint_inicial, taxas_adaptativas, busca_local_movimentos
+    ))
+
+def algoritmo_genetico_mochila_geracoes(
+    items_data: List[Tuple[str, int, int]],
+    capacidade_maxima: int,
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    motor: str = "python",
+    modo_mutacao: str = "bit_flip",
+    avaliacao_incremental: bool = True,
+    tamanho_cache_fitness: int = 0,
+    reparar_inviaveis: bool = False,
+    fracao_gulosa: float = 0.0,
+    populacao_inicial: Optional[List[List[int]]] = None,
+    retornar_populacao: bool = False,
+    max_geracoes_sem_melhoria: int = 0,
+    diversidade_minima: float = 0.0,
+    tempo_maximo: float = 0.0,
+    parar_no_limite_superior: bool = False,
+    instrumentacao: Optional[Instrumentacao] = None,
+    arquivo_checkpoint: Optional[str] = None,
+    intervalo_checkpoint: float = 60.0,
+    checkpoint_inicial: Optional[Any] = None,
+    taxas_adaptativas: bool = False,
+    busca_local_movimentos: int = 0
+) -> Generator[EstadoGeracao, None, Dict[str, Any]]:
+    """
+    Resolve o problema da mochila usando um algoritmo genético, produzindo um EstadoGeracao
+    por geração assim que ela é calculada: a melhor solução global até ali e estatísticas
+    da população. O consumidor pode parar a qualquer momento (por exemplo, com `break`),
+    e a memória não cresce com num_geracoes a menos que ele guarde os estados. Ao terminar,
+    o gerador retorna um resumo com "estatisticas" e "populacao_final".
+
+    Com `seed`, os sorteios usam um random.Random próprio da execução (o motor "numpy" usa o
+    seu np.random.Generator), então execuções simultâneas em threads do mesmo processo não
+    interferem entre si. Sem seed, os motores "python" e "bits" usam o estado global do
+    módulo random.
+
+    O parâmetro `motor` escolhe a implementação: "python" (listas de bits, padrão),
+    "bits" (cromossomos compactados em inteiros, ver cromossomo_compacto) ou "numpy"
+    (população como matriz, ver mochila_ga_numpy). Todos retornam o mesmo formato de
+    histórico; com a mesma seed os resultados são estatisticamente equivalentes, mas
+    não idênticos, pois a forma de sortear os números aleatórios é diferente.
+
+    `modo_mutacao` escolhe como os genes mutados são sorteados: "bit_flip" (um sorteio por
+    gene) ou "geometrica" (saltos geométricos entre mutações, com custo proporcional ao
+    número de mutações). A distribuição das mutações é a mesma nos dois modos.
+
+    Com `avaliacao_incremental`, os filhos herdam os totais de peso e valor dos pais e
+    só a contribuição dos genes alterados é recalculada; os elites não são reavaliados.
+    O resultado é idêntico ao da avaliação completa. O motor "numpy" ignora esta opção,
+    pois já avalia a população inteira de uma vez.
+
+    Se `tamanho_cache_fitness` for positivo, as avaliações completas passam por um
+    CacheFitnessLRU com esse tamanho máximo, evitando reavaliar indivíduos repetidos
+    (comuns depois que a população converge). Os acertos e falhas ficam em
+    `historico.estatisticas["cache_fitness"]`. Com a avaliação incremental poucos
+    indivíduos precisam de avaliação completa, então o cache é mais útil sem ela. As avaliações
+    de fato feitas, sem contar os acertos do cache e os elites que não são reavaliados, ficam
+    em `historico.estatisticas["avaliacoes"]`: "completas" (todos os genes) e "incrementais"
+    (totais obtidos a partir dos pais).
+
+    Com `reparar_inviaveis`, indivíduos acima da capacidade são reparados (ver
+    reparar_individuo) em vez de receberem fitness 0. `fracao_gulosa` (entre 0 e 1) é a
+    fração da população inicial semeada a partir da solução gulosa por razão valor/peso:
+    o primeiro é a própria solução gulosa e os demais são cópias mutadas e reparadas dela.
+
+    `populacao_inicial` permite continuar a partir de uma população existente (cromossomos
+    List[int]); se tiver menos de tam_populacao indivíduos, o restante é criado normalmente.
+    Com `retornar_populacao`, a população ao fim da última geração fica em
+    `historico.populacao_final`. Juntos, permitem executar o AG em etapas (ver mochila_ilhas).
+
+    A execução pode terminar antes de num_geracoes pelos critérios de CriteriosParada:
+    `max_geracoes_sem_melhoria`, `diversidade_minima`, `tempo_maximo` (segundos) e
+    `parar_no_limite_superior`. O critério que encerrou a execução (ou "num_geracoes")
+    fica em `historico.estatisticas["criterio_parada"]`.
+
+    Com uma `instrumentacao` (ver Instrumentacao), o tempo de cada fase da geração é medido
+    e os callbacks dela são chamados; o resumo fica em `historico.estatisticas["instrumentacao"]`.
+
+    Com `arquivo_checkpoint`, o estado da execução é gravado nesse arquivo a cada
+    `intervalo_checkpoint` segundos (ver mochila_checkpoint); retomar_algoritmo_genetico continua
+    a partir dele com resultados idênticos. `checkpoint_inicial` é o EstadoCheckpoint usado na
+    retomada, e substitui a seed e a população inicial.
+
+    `items_data` também pode ser um catálogo (ver mochila_catalogo.CatalogoItens): os pesos e
+    valores são lidos direto das colunas, sem carregar os nomes.
+
+    Com `taxas_adaptativas`, `taxa_mutacao` é só o valor inicial: a taxa é ajustada a cada
+    geração pela regra de 1/5 de sucesso e pela diversidade da população, e o cruzamento de
+    cada par é sorteado entre ponto único, dois pontos e uniforme pelo sucesso recente de cada
+    um (ver TaxasAdaptativas). Os valores usados em cada geração ficam em
+    `historico.estatisticas["taxas_adaptativas"]`.
+
+    Com `busca_local_movimentos` positivo, o AG fica memético: a cada geração, depois da
+    avaliação, os elites (ou o melhor, sem elitismo) passam por busca_local com até esse número
+    de movimentos, e o resultado volta para a população antes da seleção. O total de movimentos
+    aplicados fica em `historico.estatisticas["busca_local"]`.
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconhecido: '{motor}'. Opções: {', '.join(MOTORES)}.")
+    if modo_mutacao not in MODOS_MUTACAO:
+        raise ValueError(f"Modo de mutação desconhecido: '{modo_mutacao}'. Opções: {', '.join(MODOS_MUTACAO)}.")
+    if motor == "numpy":
+        # Importação tardia: NumPy só é necessário quando este motor é escolhido
+        from mochila_ga_numpy import algoritmo_genetico_mochila_numpy_geracoes
+        return (yield from algoritmo_genetico_mochila_numpy_geracoes(
+            items_data, capacidade_maxima, tam_populacao, num_geracoes, taxa_mutacao,
+            taxa_cruzamento, contagem_elitismo, tam_torneio, seed, modo_mutacao,
+            tamanho_cache_fitness, reparar_inviaveis, fracao_gulosa, populacao_inicial,
+            retornar_populacao, max_geracoes_sem_melhoria, diversidade_minima, tempo_maximo,
+            parar_no_limite_superior, instrumentacao, arquivo_checkpoint, intervalo_checkpoint,
+            checkpoint_inicial, taxas_adaptativas, busca_local_movimentos
+        ))
+
+    # Gerador próprio da execução: execuções simultâneas (threads) não interferem entre si.
+    # Sem seed, usa o estado global do módulo random, como antes.
+    gerador = random.Random(seed) if seed is not None else random
+
+    # Só as colunas de pesos e valores: nenhum objeto por item nem leitura dos nomes
+    pesos, valores = pesos_e_valores(items_data)
+    num_items = len(pesos)
+
+    criterios_parada = CriteriosParada(items_data, capacidade_maxima, max_geracoes_sem_melhoria,
+                                       diversidade_minima, tempo_maximo, parar_no_limite_superior)
+
+    # Validações - Mantido o comportamento do notebook, mas sem 'verbose' prints
+    if num_items == 0:
+        return {}
+    if tam_populacao <=0:
+        return {}
+    contagem_elitismo, tam_torneio = _normalizar_parametros(tam_populacao, contagem_elitismo, tam_torneio)
+    if populacao_inicial is not None and any(len(individuo) != num_items for individuo in populacao_inicial):
+        raise ValueError("Todos os indivíduos da população inicial devem ter um gene por item.")
+
+    # Operadores de acordo com a representação do cromossomo
+    if motor == "bits":
+        from cromossomo_compacto import (
+            CromossomoCompacto, TabelaSomasCompactas, criar_cromossomo_compacto, cruzar_compactos_no_ponto,
+            inverter_genes_compacto, posicoes_diferentes_compactas
+        )
+        tabela_somas = TabelaSomasCompactas(pesos, valores)
+        criar = lambda: criar_cromossomo_compacto(num_items, gerador)
+        avaliar = lambda individuo: tabela_somas.calcular_detalhes(individuo, capacidade_maxima)
+        cruzar = cruzar_compactos_no_ponto
+        inverter = inverter_genes_compacto
+        diferencas = posicoes_diferentes_compactas
+        para_lista = lambda individuo: individuo.para_lista()
+        de_lista = CromossomoCompacto.de_lista
+        chave_cache = lambda individuo: individuo.bits
+    else:
+        criar = lambda: criar_individuo(num_items, gerador)
+        avaliar = lambda individuo: calcular_detalhes_colunas(individuo, pesos, valores, capacidade_maxima)
+        cruzar = cruzar_no_ponto
+        inverter = inverter_genes
+        diferencas = posicoes_diferentes
+        para_lista = list
+        de_lista = lambda individuo: individuo
+        chave_cache = bytes
+    amostrar_posicoes = amostrar_posicoes_mutacao if modo_mutacao == "geometrica" else amostrar_posicoes_bit_flip
+    amostrar_mutacoes = lambda num_genes, taxa: amostrar_posicoes(num_genes, taxa, gerador)
+
+    def reparar(individuo, peso_total: int, valor_total: int):
+        reparado, peso_total, valor_total = reparar_individuo(
+            para_lista(individuo), peso_total, valor_total, pesos, valores, capacidade_maxima, ordem_razao
+        )
+        return de_lista(reparado), peso_total, valor_total
+
+    cache_fitness = CacheFitnessLRU(tamanho_cache_fitness) if tamanho_cache_fitness > 0 else None
+    if cache_fitness is not None:
+        avaliar_sem_cache = avaliar
+        avaliar = lambda individuo: cache_fitness.obter(chave_cache(individuo), lambda: avaliar_sem_cache(individuo))
+
+    # Ordem por razão valor/peso, calculada uma única vez, para o reparo, a semeadura gulosa e a busca local
+    usar_busca_local = busca_local_movimentos > 0
+    ordem_razao = ordenar_por_razao(pesos, valores) if reparar_inviaveis or fracao_gulosa > 0 or usar_busca_local else []
+    busca_local_resumo = {"chamadas": 0, "melhorados": 0, "movimentos": 0}
+    num_avaliacoes_completas = 0
+    num_avaliacoes_incrementais = 0
+    adaptativas = TaxasAdaptativas(taxa_mutacao, num_items, gerador=gerador) if taxas_adaptativas else None
+    # Número de indivíduos com cada gene igual a 1 (diversidade); lê a população atual a cada chamada
+    contar_genes = lambda: [sum(coluna) for coluna in zip(*map(para_lista, populacao_atual))]
+
+    def fitness_dos_totais(totais: Tuple[int, int]) -> int:
+        return totais[1] if totais[0] <= capacidade_maxima else 0
+
+    def totais_mutacao_adaptativa(filho, totais: Tuple[int, int], posicoes: List[int]) -> Tuple[int, int]:
+        # No modo adaptativo os totais dos filhos são sempre incrementais: medem o sucesso da mutação
+        totais_mutado = totais_apos_mutacao(filho, totais, posicoes, pesos, valores)
+        if posicoes:
+            adaptativas.registrar_mutacao(1, int(fitness_dos_totais(totais_mutado) > fitness_dos_totais(totais)))
+        return totais_mutado
+
+    melhor_solucao_geral = None
+    melhor_solucao_geral_lista = [0] * num_items # Convertida só quando a melhor solução muda
+    melhor_fitness_geral = -1
+    melhor_valor_geral = -1 # Valor real da melhor solução geral
+    melhor_peso_geral = -1 # Peso real da melhor solução geral
+    criterio_parada = "num_geracoes"
+    medir = instrumentacao is not None
+    primeira_geracao = 0
+
+    gravador = None
+    if arquivo_checkpoint is not None or checkpoint_inicial is not None:
+        # Importação tardia: mochila_checkpoint importa este módulo
+        from mochila_checkpoint import GravadorCheckpoint
+        num_bytes = (num_items + 7) // 8
+        if motor == "bits":
+            empacotar = lambda individuo: individuo.bits.to_bytes(num_bytes, "little")
+            desempacotar = lambda dados: CromossomoCompacto(int.from_bytes(dados, "little"), num_items)
+        else:
+            empacotar = lambda individuo: empacotar_genes(individuo, num_bytes)
+            desempacotar = lambda dados: desempacotar_genes(dados, num_items)
+    if arquivo_checkpoint is not None:
+        gravador = GravadorCheckpoint(arquivo_checkpoint, intervalo_checkpoint, motor, {
+            "tam_populacao": tam_populacao, "num_geracoes": num_geracoes, "taxa_mutacao": taxa_mutacao,
+            "taxa_cruzamento": taxa_cruzamento, "contagem_elitismo": contagem_elitismo, "tam_torneio": tam_torneio,
+            "seed": seed, "motor": motor, "modo_mutacao": modo_mutacao, "avaliacao_incremental": avaliacao_incremental,
+            "tamanho_cache_fitness": tamanho_cache_fitness, "reparar_inviaveis": reparar_inviaveis,
+            "fracao_gulosa": fracao_gulosa, "retornar_populacao": retornar_populacao,
+            "max_geracoes_sem_melhoria": max_geracoes_sem_melhoria, "diversidade_minima": diversidade_minima,
+            "tempo_maximo": tempo_maximo, "parar_no_limite_superior": parar_no_limite_superior,
+            "taxas_adaptativas": taxas_adaptativas, "busca_local_movimentos": busca_local_movimentos,
+        }, items_data, capacidade_maxima)
+
+    if checkpoint_inicial is not None:
+        # Retomada: população, melhor solução e estado aleatório vêm do checkpoint
+        if checkpoint_inicial.motor != motor or checkpoint_inicial.num_items != num_items:
+            raise ValueError("O checkpoint não corresponde ao motor ou ao número de itens desta execução.")
+        gerador.setstate(checkpoint_inicial.estado_aleatorio)
+        primeira_geracao = checkpoint_inicial.geracao
+        populacao_atual = [desempacotar(dados) for dados in checkpoint_inicial.populacao]
+        totais_populacao_atual = list(checkpoint_inicial.totais)
+        if checkpoint_inicial.melhor is not None:
+            dados_melhor, melhor_valor_geral, melhor_peso_geral, melhor_fitness_geral = checkpoint_inicial.melhor
+            melhor_solucao_geral_lista = desempacotar_genes(dados_melhor, num_items)
+        criterios_parada.melhor_fitness, criterios_parada.geracoes_sem_melhoria = checkpoint_inicial.criterios
+        if adaptativas is not None and checkpoint_inicial.adaptacao is not None:
+            adaptativas.restaurar(checkpoint_inicial.adaptacao)
+    else:
+        populacao_atual = [de_lista(list(individuo)) for individuo in (populacao_inicial or [])[:tam_populacao]]
+        num_gulosos = min(round(min(max(fracao_gulosa, 0.0), 1.0) * tam_populacao), tam_populacao - len(populacao_atual))
+        if num_gulosos > 0:
+            gulosa = solucao_gulosa(pesos, capacidade_maxima, ordem_razao)
+            populacao_atual.append(de_lista(gulosa))
+            for _ in range(num_gulosos - 1):
+                semente = inverter_genes(gulosa, amostrar_mutacoes(num_items, taxa_mutacao))
+                peso_semente = sum(peso for peso, gene in zip(pesos, semente) if gene == 1)
+                valor_semente = sum(valor for valor, gene in zip(valores, semente) if gene == 1)
+                semente, _, _ = reparar_individuo(semente, peso_semente, valor_semente, pesos, valores, capacidade_maxima, ordem_razao)
+                populacao_atual.append(de_lista(semente))
+        populacao_atual += [criar() for _ in range(tam_populacao - len(populacao_atual))]
+        # Totais (peso, valor) já conhecidos de cada indivíduo; None indica que é preciso avaliá-lo
+        totais_populacao_atual: List[Optional[Tuple[int, int]]] = [None] * tam_populacao
+
+    for geracao in range(primeira_geracao, num_geracoes):
+        if gravador is not None and gravador.deve_gravar():
+            gravador.gravar(
+                geracao, [empacotar(individuo) for individuo in populacao_atual], totais_populacao_atual,
+                (melhor_solucao_geral_lista, melhor_valor_geral, melhor_peso_geral, melhor_fitness_geral) if melhor_fitness_geral != -1 else None,
+                (criterios_parada.melhor_fitness, criterios_parada.geracoes_sem_melhoria), gerador.getstate(),
+                adaptativas.estado() if adaptativas is not None else None
+            )
+        if medir:
+            if instrumentacao.ao_iniciar_geracao is not None:
+                instrumentacao.ao_iniciar_geracao(geracao)
+            tempo_selecao = tempo_cruzamento = tempo_mutacao = 0.0
+            inicio_fase = time.perf_counter()
+        fitness_scores_populacao_atual = [] 
+        num_viaveis = 0
+
+        for i, individuo in enumerate(populacao_atual):
+            totais = totais_populacao_atual[i]
+            if totais is None:
+                _, valor_real, peso_real = avaliar(individuo)
+                num_avaliacoes_completas += 1
+            else:
+                peso_real, valor_real = totais
+            if reparar_inviaveis and peso_real > capacidade_maxima:
+                individuo, peso_real, valor_real = reparar(individuo, peso_real, valor_real)
+                populacao_atual[i] = individuo
+            totais_populacao_atual[i] = (peso_real, valor_real)
+            if peso_real > capacidade_maxima:
+                fitness_scores_populacao_atual.append(0)  # Mesma penalidade de calcular_detalhes_individuo
+            else:
+                fitness_scores_populacao_atual.append(valor_real)
+                num_viaveis += 1
+        if medir:
+            fim_fase = time.perf_counter()
+            tempo_avaliacao = fim_fase - inicio_fase
+            inicio_fase = fim_fase
+        
+        # Só o melhor e os elites são usados: seleção parcial em O(P) em vez de ordenar a população.
+        # nlargest mantém a ordem do sort estável (empates na ordem da população)
+        indices_melhores = heapq.nlargest(max(contagem_elitismo, 1), range(len(populacao_atual)),
+                                          key=fitness_scores_populacao_atual.__getitem__)
+        if medir:
+            fim_fase = time.perf_counter()
+            tempo_ordenacao = fim_fase - inicio_fase
+            inicio_fase = fim_fase
+
+        if usar_busca_local:
+            # Busca local nos elites; o resultado substitui o indivíduo (evolução lamarckiana)
+            for i in indices_melhores[:max(contagem_elitismo, 1)]:
+                peso_real, valor_real = totais_populacao_atual[i]
+                melhorado, peso_real, valor_real, num_movimentos = busca_local(
+                    para_lista(populacao_atual[i]), peso_real, valor_real, pesos, valores,
+                    capacidade_maxima, ordem_razao, busca_local_movimentos
+                )
+                busca_local_resumo["chamadas"] += 1
+                if (peso_real, valor_real) == totais_populacao_atual[i]:
+                    continue
+                busca_local_resumo["melhorados"] += 1
+                busca_local_resumo["movimentos"] += num_movimentos
+                if fitness_scores_populacao_atual[i] == 0 and peso_real <= capacidade_maxima:
+                    num_viaveis += 1
+                populacao_atual[i] = de_lista(melhorado)
+                totais_populacao_atual[i] = (peso_real, valor_real)
+                fitness_scores_populacao_atual[i] = valor_real
+            # Os elites só melhoram, então continuam sendo os melhores; só a ordem entre eles muda
+            indices_melhores.sort(key=fitness_scores_populacao_atual.__getitem__, reverse=True)
+        if medir:
+            tempo_busca_local = time.perf_counter() - inicio_fase
+        melhorou = False
+
+        if indices_melhores: # Checa se a lista não está vazia
+            indice_melhor = indices_melhores[0]
+            melhor_fitness_geracao_atual = fitness_scores_populacao_atual[indice_melhor]
+            melhor_peso_geracao_atual, melhor_valor_geracao_atual = totais_populacao_atual[indice_melhor] # Peso e valor reais da melhor da geração
+            melhor_individuo_geracao_atual = populacao_atual[indice_melhor]
+
+            if melhor_fitness_geracao_atual > melhor_fitness_geral:
+                melhor_fitness_geral = melhor_fitness_geracao_atual
+                melhor_solucao_geral = melhor_individuo_geracao_atual
+                melhor_solucao_geral_lista = para_lista(melhor_solucao_geral)
+                melhor_valor_geral = melhor_valor_geracao_atual # Atualiza o valor real da melhor geral
+                melhor_peso_geral = melhor_peso_geracao_atual # Atualiza o peso real da melhor geral
+                melhorou = True
+            # Sem a lógica do verbose print para console aqui, pois será feita no Streamlit
+        # else: A lógica do notebook original não tinha um else para este if,
+        # significando que se a populacao_avaliada estivesse vazia,
+        # o histórico não seria atualizado para aquela geração, o que pode levar a um gap.
+        # Para Streamlit, é bom ter um registro para cada geração.
+        
+        # Produz a melhor solução GERAL (acumulada) até esta geração
+        # Isso garante que o Streamlit sempre mostre o melhor resultado encontrado até o momento.
+        estado = EstadoGeracao(
+            geracao,
+            melhor_solucao_geral_lista,
+            melhor_valor_geral if melhor_valor_geral != -1 else 0, # Garante que seja 0 se não houver solução válida ainda
+            melhor_peso_geral if melhor_peso_geral != -1 else 0,   # Garante que seja 0 se não houver solução válida ainda
+            melhor_fitness_geral if melhor_fitness_geral != -1 else 0, # Fitness para o gráfico
+            sum(fitness_scores_populacao_atual) / len(fitness_scores_populacao_atual),
+            melhor_fitness_geracao_atual,
+            min(fitness_scores_populacao_atual),
+            num_viaveis
+        )
+        if medir and melhorou and instrumentacao.ao_encontrar_melhor is not None:
+            instrumentacao.ao_encontrar_melhor(estado)
+        yield estado
+
+        taxa_mutacao_geracao = taxa_mutacao if adaptativas is None else adaptativas.taxa_mutacao
+        nova_populacao = []
+        novos_totais: List[Optional[Tuple[int, int]]] = []
+        for i in indices_melhores[:contagem_elitismo]:
+            nova_populacao.append(populacao_atual[i])
+            # Na avaliação incremental os elites mantêm seus totais e não são reavaliados
+            novos_totais.append(totais_populacao_atual[i] if avaliacao_incremental else None)
+
+        num_descendentes_necessarios = tam_populacao - len(nova_populacao)
+        descendentes_gerados = 0
+        
+        # Loop para gerar descendentes até preencher a nova população
+        # Adiciona verificações para evitar erros com populações pequenas ou vazias
+        while descendentes_gerados < num_descendentes_necessarios:
+            # Lógica de fallback para população pequena idêntica ao notebook
+            if not populacao_atual or not fitness_scores_populacao_atual or len(populacao_atual) < max(1,tam_torneio) : 
+                while len(nova_populacao) < tam_populacao:
+                    nova_populacao.append(criar())
+                    novos_totais.append(None)
+                break 
+
+            if medir:
+                inicio_fase = time.perf_counter()
+            indice_pai1 = selecionar_indice_torneio(fitness_scores_populacao_atual, tam_torneio, gerador=gerador)
+            # Segundo pai: torneio sobre os índices restantes, excluindo o primeiro pai
+            if len(populacao_atual) > 1:
+                indice_pai2 = selecionar_indice_torneio(fitness_scores_populacao_atual, tam_torneio, excluir=indice_pai1, gerador=gerador)
+            else:
+                indice_pai2 = indice_pai1 # Usa o mesmo pai se for o único
+            pai1 = populacao_atual[indice_pai1]
+            pai2 = populacao_atual[indice_pai2]
+            if medir:
+                fim_fase = time.perf_counter()
+                tempo_selecao += fim_fase - inicio_fase
+                inicio_fase = fim_fase
+
+            if adaptativas is None:
+                ponto = sortear_ponto_corte(num_items, taxa_cruzamento, gerador)
+                if ponto is None:
+                    filho1, filho2 = pai1, pai2 # A mutação abaixo gera os novos indivíduos
+                    totais_filho1 = totais_populacao_atual[indice_pai1]
+                    totais_filho2 = totais_populacao_atual[indice_pai2]
+                else:
+                    filho1, filho2 = cruzar(pai1, pai2, ponto)
+                    if avaliacao_incremental:
+                        totais_filho1, totais_filho2 = totais_apos_cruzamento(
+                            pai1, pai2, totais_populacao_atual[indice_pai1], totais_populacao_atual[indice_pai2],
+                            ponto, pesos, valores, diferencas
+                        )
+            else:
+                filho1, filho2 = pai1, pai2
+                totais_filho1 = totais_populacao_atual[indice_pai1]
+                totais_filho2 = totais_populacao_atual[indice_pai2]
+                if gerador.random() < taxa_cruzamento and num_items > 1:
+                    operador = adaptativas.escolher_operador()
+                    trocadas = sortear_posicoes_troca(operador, pai1, pai2, diferencas, gerador)
+                    filho1, filho2 = inverter(pai1, trocadas), inverter(pai2, trocadas)
+                    totais_filho1, totais_filho2 = totais_apos_troca(pai2, totais_filho1, totais_filho2, trocadas, pesos, valores)
+                    melhor_pai = max(fitness_scores_populacao_atual[indice_pai1], fitness_scores_populacao_atual[indice_pai2])
+                    adaptativas.registrar_cruzamento(operador, 2, (fitness_dos_totais(totais_filho1) > melhor_pai)
+                                                     + (fitness_dos_totais(totais_filho2) > melhor_pai))
+            if medir:
+                fim_fase = time.perf_counter()
+                tempo_cruzamento += fim_fase - inicio_fase
+                inicio_fase = fim_fase
+
+            posicoes = amostrar_mutacoes(num_items, taxa_mutacao_geracao)
+            filho1 = inverter(filho1, posicoes)
+            nova_populacao.append(filho1)
+            if adaptativas is None:
+                novos_totais.append(totais_apos_mutacao(filho1, totais_filho1, posicoes, pesos, valores) if avaliacao_incremental else None)
+            else:
+                novos_totais.append(totais_mutacao_adaptativa(filho1, totais_filho1, posicoes))
+            descendentes_gerados += 1
+
+            if descendentes_gerados < num_descendentes_necessarios:
+                posicoes = amostrar_mutacoes(num_items, taxa_mutacao_geracao)
+                filho2 = inverter(filho2, posicoes)
+                nova_populacao.append(filho2)
+                if adaptativas is None:
+                    novos_totais.append(totais_apos_mutacao(filho2, totais_filho2, posicoes, pesos, valores) if avaliacao_incremental else None)
+                else:
+                    novos_totais.append(totais_mutacao_adaptativa(filho2, totais_filho2, posicoes))
+                descendentes_gerados += 1
+            if medir:
+                tempo_mutacao += time.perf_counter() - inicio_fase
+
+        num_avaliacoes_incrementais += sum(
+            totais is not None for totais in novos_totais[tam_populacao - num_descendentes_necessarios:]
+        )
+        if adaptativas is not None:
+            adaptativas.atualizar(geracao, diversidade_por_contagens(contar_genes(), len(populacao_atual)))
+
+        if medir:
+            num_pares = (descendentes_gerados + 1) // 2
+            instrumentacao.registrar_geracao(
+                {"avaliacao": tempo_avaliacao, "ordenacao": tempo_ordenacao, "busca_local": tempo_busca_local,
+                 "selecao": tempo_selecao, "cruzamento": tempo_cruzamento, "mutacao": tempo_mutacao},
+                {"avaliacao": len(populacao_atual), "ordenacao": 1,
+                 "busca_local": min(max(contagem_elitismo, 1), len(indices_melhores)) if usar_busca_local else 0,
+                 "selecao": 2 * num_pares,
+                 "cruzamento": num_pares, "mutacao": descendentes_gerados}
+            )
+            if instrumentacao.ao_finalizar_geracao is not None:
+                instrumentacao.ao_finalizar_geracao(estado)
+
+        # Verificado com a população avaliada desta geração, que fica como populacao_final se parar
+        criterio = criterios_parada.verificar(melhor_fitness_geral, contar_genes, len(populacao_atual))
+        if criterio is not None:
+            criterio_parada = criterio
+            break
+
+        populacao_atual = nova_populacao[:tam_populacao]
+        totais_populacao_atual = novos_totais[:tam_populacao]
+
+    if cache_fitness is not None:
+        num_avaliacoes_completas -= cache_fitness.acertos  # Acertos não recalculam o indivíduo
+    estatisticas: Dict[str, Any] = {
+        "criterio_parada": criterio_parada,
+        "avaliacoes": {"completas": num_avaliacoes_completas, "incrementais": num_avaliacoes_incrementais},
+    }
+    if cache_fitness is not None:
+        estatisticas["cache_fitness"] = cache_fitness.estatisticas()
+    if instrumentacao is not None:
+        estatisticas["instrumentacao"] = instrumentacao.resumo()
+    if gravador is not None:
+        estatisticas["checkpoints_gravados"] = gravador.num_gravacoes
+    if adaptativas is not None:
+        estatisticas["taxas_adaptativas"] = adaptativas.resumo()
+    if usar_busca_local:
+        estatisticas["busca_local"] = busca_local_resumo
+
+    # Removidos os prints de resultados finais, pois o Streamlit cuidará disso.
+    return {
+        "estatisticas": estatisticas,
+        "populacao_final": [para_lista(individuo) for individuo in populacao_atual] if retornar_populacao else None,
+    }
+
+# O bloco if __name__ == "__main__": é para testar a função isoladamente no terminal,
+# e não será executado quando o Streamlit importar este módulo.
+if __name__ == "__main__":
+    # Exemplo de itens: (nome, peso, valor)
+    config_itens_ex1 = [
+        ("Lanterna", 2, 15), ("Saco de Dormir", 5, 30), ("Comida Enlatada", 10, 50),
+        ("Corda", 3, 20), ("Mapa", 1, 10), ("Bússola", 1, 15),
+        ("Kit Primeiros Socorros", 4, 25), ("Cantil", 2, 20), ("Faca", 1, 18),
+        ("Repelente", 1, 12), ("Câmera", 3, 40), ("Livro", 2, 5),
+        ("Barraca", 15, 70), ("Fogareiro", 6, 35), ("Panelas", 4, 22),
+        ("Rádio Solar", 3, 28), ("Bateria Extra", 2, 22), ("Chocolate", 1, 16)
+    ]
+    capacidade_mochila_ex1 = 35
+
+    print(f"\n--- Algoritmo Genético para o Problema da Mochila (Teste de Mochila GA) ---")
+    print(f"Itens: {len(config_itens_ex1)}, Capacidade Máxima: {capacidade_mochila_ex1}")
+    
+    historico_solucoes_teste = algoritmo_genetico_mochila_iterativo(
+        items_data=config_itens_ex1,
+        capacidade_maxima=capacidade_mochila_ex1,
+        tam_populacao=100,
+        num_geracoes=150,
+        taxa_mutacao=0.03,
+        taxa_cruzamento=0.90,
+        contagem_elitismo=3,
+        tam_torneio=5,
+        seed=42
+    )
+
+    if historico_solucoes_teste:
+        final_solucao, final_valor, final_peso, final_fitness = historico_solucoes_teste[-1]
+        print(f"\nResultado final para Exemplo 1 (do teste interno):")
+        print(f"Melhor Solução (cromossomo): {final_solucao}")
+        print(f"Valor Total: {final_valor}")
+        print(f"Peso Total: {final_peso}/{capacidade_mochila_ex1}")
+        print(f"Fitness Final: {final_fitness}")
+    else:
         print("Nenhuma solução foi encontrada no teste interno.")
\ No newline at end of file
@@ -0,0 +1,544 @@
+"""
+Motor vetorizado (NumPy) do algoritmo genético para o problema da mochila.
+
+A população inteira é guardada em uma única matriz (tam_populacao, num_items) de uint8,
+e a avaliação de todos os indivíduos é um único produto matriz-vetor contra os pesos e
+valores dos itens. Seleção, cruzamento e mutação também operam sobre a população toda de
+uma vez, sem laços Python por gene ou por indivíduo.
+"""
+import time
+from typing import Any, Dict, Generator, List, Tuple, Optional
+
+import numpy as np
+
+from mochila_ga import (
+    FASES_GERACAO, OPERADORES_CRUZAMENTO, CriteriosParada, EstadoGeracao, HistoricoAG, Instrumentacao,
+    TaxasAdaptativas, _coletar_historico, _normalizar_parametros, desempacotar_genes, diversidade_por_contagens,
+    busca_local, solucao_gulosa
+)
+
+
+def matriz_pesos_valores(items_data: List[Tuple[str, int, int]]) -> np.ndarray:
+    """
+    Matriz (num_items, 2) int64 com os pesos na coluna 0 e os valores na coluna 1. Um catálogo
+    (mochila_catalogo.CatalogoItens) é copiado direto das colunas, sem passar por objetos Python.
+    """
+    if hasattr(items_data, "pesos") and hasattr(items_data, "valores"):
+        return np.column_stack((np.asarray(items_data.pesos, dtype=np.int64),
+                                np.asarray(items_data.valores, dtype=np.int64)))
+    return np.array([(peso, valor) for _, peso, valor in items_data], dtype=np.int64)
+
+
+def ordenar_por_razao_colunas(pesos_valores: np.ndarray) -> np.ndarray:
+    """
+    Equivalente a ordenar_por_razao sobre as colunas de `pesos_valores`: índices em ordem
+    decrescente de razão valor/peso, itens sem peso primeiro e empates na ordem dos itens.
+    """
+    pesos = pesos_valores[:, 0]
+    razoes = np.full(len(pesos), np.inf)
+    np.divide(pesos_valores[:, 1], pesos, out=razoes, where=pesos > 0)
+    return np.argsort(-razoes, kind="stable")
+
+
+def avaliar_populacao(populacao: np.ndarray, pesos_valores: np.ndarray, capacidade_maxima: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Avalia todos os indivíduos de uma vez.
+    `pesos_valores` é uma matriz (num_items, 2) com os pesos na coluna 0 e os valores na coluna 1.
+    Retorna: (pontuacoes_fitness, valores_totais, pesos_totais), cada um com tam_populacao elementos.
+    """
+    totais = populacao @ pesos_valores
+    pesos_totais = totais[:, 0]
+    valores_totais = totais[:, 1]
+    pontuacoes_fitness = np.where(pesos_totais > capacidade_maxima, 0, valores_totais)  # Penaliza soluções inválidas
+    return pontuacoes_fitness, valores_totais, pesos_totais
+
+
+def indices_maiores(pontuacoes_fitness: np.ndarray, quantidade: int) -> np.ndarray:
+    """
+    Índices dos `quantidade` maiores fitness, do maior para o menor, com empates na ordem da
+    população: o mesmo que np.argsort(-pontuacoes_fitness, kind="stable")[:quantidade], mas em
+    O(tam_populacao + quantidade log quantidade) com np.partition em vez de ordenar tudo.
+    """
+    tam_populacao = len(pontuacoes_fitness)
+    quantidade = min(quantidade, tam_populacao)
+    if quantidade <= 0:
+        return np.empty(0, dtype=np.intp)
+    if quantidade == 1:
+        return np.array([np.argmax(pontuacoes_fitness)])  # argmax retorna o primeiro máximo
+    limiar = np.partition(pontuacoes_fitness, tam_populacao - quantidade)[tam_populacao - quantidade]
+    maiores = np.flatnonzero(pontuacoes_fitness > limiar)
+    # Completa com os primeiros empatados no limiar, como faria a ordenação estável
+    empatados = np.flatnonzero(pontuacoes_fitness == limiar)[:quantidade - len(maiores)]
+    indices = np.concatenate((maiores, empatados))
+    return indices[np.argsort(-pontuacoes_fitness[indices], kind="stable")]
+
+
+def selecionar_indices_torneio(rng: np.random.Generator,
+                               pontuacoes_fitness: np.ndarray,
+                               num_selecoes: int,
+                               tam_torneio: int,
+                               excluir: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Realiza `num_selecoes` torneios de uma vez e retorna os índices dos vencedores.
+    Se `excluir` for dado, o torneio i nunca escolhe o índice excluir[i] (usado para o segundo pai).
+    Os contendores são sorteados com reposição; para torneios pequenos em relação à população
+    o efeito é equivalente ao sorteio sem reposição do motor Python.
+    """
+    tam_populacao = len(pontuacoes_fitness)
+    if excluir is None:
+        contendores = rng.integers(0, tam_populacao, size=(num_selecoes, tam_torneio))
+    else:
+        # Sorteia entre tam_populacao - 1 posições e "pula" o índice excluído
+        contendores = rng.integers(0, tam_populacao - 1, size=(num_selecoes, tam_torneio))
+        contendores += contendores >= excluir[:, None]
+    # argmax retorna o primeiro máximo, assim como o torneio do motor Python
+    vencedores = np.argmax(pontuacoes_fitness[contendores], axis=1)
+    return contendores[np.arange(num_selecoes), vencedores]
+
+
+def cruzamento_ponto_unico_populacao(rng: np.random.Generator,
+                                     pais1: np.ndarray,
+                                     pais2: np.ndarray,
+                                     taxa_cruzamento: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Cruzamento de ponto único aplicado a todos os pares (linhas) de uma vez."""
+    num_pares, num_items = pais1.shape
+    if num_items < 2:
+        return pais1.copy(), pais2.copy()
+    cruza = rng.random(num_pares) < taxa_cruzamento
+    pontos = rng.integers(1, num_items, size=num_pares)
+    # mascara[i, j] é True quando o gene j do filho1 vem do pai1
+    mascara = (np.arange(num_items)[None, :] < pontos[:, None]) | ~cruza[:, None]
+    filhos1 = np.where(mascara, pais1, pais2)
+    filhos2 = np.where(mascara, pais2, pais1)
+    return filhos1, filhos2
+
+
+def cruzamento_operadores_populacao(rng: np.random.Generator,
+                                    pais1: np.ndarray,
+                                    pais2: np.ndarray,
+                                    taxa_cruzamento: float,
+                                    probabilidades: List[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cruzamento com o operador de cada par sorteado entre OPERADORES_CRUZAMENTO com as
+    `probabilidades` dadas (taxas adaptativas). Retorna (filhos1, filhos2, operadores, cruza):
+    o índice do operador de cada par e se o par cruzou.
+    """
+    num_pares, num_items = pais1.shape
+    cruza = (rng.random(num_pares) < taxa_cruzamento) & (num_items > 1)
+    operadores = rng.choice(len(OPERADORES_CRUZAMENTO), size=num_pares, p=probabilidades)
+    ponto_unico, dois_pontos, uniforme = range(len(OPERADORES_CRUZAMENTO))
+    if num_items < 3:
+        operadores[operadores == dois_pontos] = ponto_unico  # Não há dois pontos de corte distintos
+    colunas = np.arange(num_items)[None, :]
+    # troca[i, j] é True quando o gene j é trocado entre os pais do par i
+    pontos1 = rng.integers(1, max(num_items, 2), size=num_pares)
+    pontos2 = rng.integers(1, max(num_items - 1, 2), size=num_pares)
+    pontos2 += pontos2 >= pontos1  # Segundo ponto distinto do primeiro
+    usa_um_ponto = operadores == ponto_unico
+    inicios = np.where(usa_um_ponto, pontos1, np.minimum(pontos1, pontos2))
+    fins = np.where(usa_um_ponto, num_items, np.maximum(pontos1, pontos2))
+    troca = (colunas >= inicios[:, None]) & (colunas < fins[:, None])
+    linhas_uniformes = np.flatnonzero(operadores == uniforme)
+    troca[linhas_uniformes] = rng.random((len(linhas_uniformes), num_items)) < 0.5
+    troca &= cruza[:, None]
+    filhos1 = np.where(troca, pais2, pais1)
+    filhos2 = np.where(troca, pais1, pais2)
+    return filhos1, filhos2, operadores, cruza
+
+
+def mutacao_bit_flip_populacao(rng: np.random.Generator, populacao: np.ndarray, taxa_mutacao: float) -> None:
+    """Mutação bit-flip (no próprio array) em todos os indivíduos de uma vez."""
+    if taxa_mutacao <= 0:
+        return
+    np.bitwise_xor(populacao, rng.random(populacao.shape) < taxa_mutacao, out=populacao)
+
+
+def mutacao_binomial_populacao(rng: np.random.Generator, populacao: np.ndarray, taxa_mutacao: float) -> None:
+    """
+    Mutação bit-flip (no próprio array) sorteando primeiro o número total de mutações
+    ~ Binomial(num_genes, taxa_mutacao) e depois as posições, sem repetição. Mesma distribuição
+    de mutacao_bit_flip_populacao, mas com custo proporcional ao número de mutações.
+    """
+    if taxa_mutacao <= 0 or populacao.size == 0:
+        return
+    num_mutacoes = rng.binomial(populacao.size, min(taxa_mutacao, 1.0))
+    posicoes = rng.choice(populacao.size, size=num_mutacoes, replace=False)
+    genes = populacao.reshape(-1)  # Visão (sem cópia) de uma população contígua
+    genes[posicoes] ^= 1
+
+
+def reparar_populacao(populacao: np.ndarray,
+                      pesos_valores: np.ndarray,
+                      capacidade_maxima: int,
+                      ordem_razao: np.ndarray,
+                      pesos_totais: np.ndarray,
+                      valores_totais: np.ndarray) -> None:
+    """
+    Versão vetorizada de reparar_individuo, aplicada (no próprio array) às linhas acima da
+    capacidade. `pesos_totais` e `valores_totais` são atualizados junto com a população.
+    """
+    inviaveis = np.flatnonzero(pesos_totais > capacidade_maxima)
+    if inviaveis.size == 0:
+        return
+    pesos_ordem = pesos_valores[ordem_razao, 0]
+    # Genes das linhas inviáveis, com as colunas em ordem decrescente de razão valor/peso
+    genes = populacao[np.ix_(inviaveis, ordem_razao)]
+
+    # Retira itens do fim da ordem (menor razão) enquanto o peso ainda excede a capacidade:
+    # o item é retirado se o peso já retirado antes dele não cobre o excesso
+    peso_selecionado = genes[:, ::-1] * pesos_ordem[::-1]
+    retirado_antes = np.cumsum(peso_selecionado, axis=1) - peso_selecionado
+    excesso = pesos_totais[inviaveis] - capacidade_maxima
+    retirar = (genes[:, ::-1] == 1) & (retirado_antes < excesso[:, None])
+    genes[:, ::-1][retirar] = 0
+
+    # Completa gulosamente, do maior para o menor razão, com os itens que ainda couberem
+    peso_atual = genes @ pesos_ordem
+    for j, peso_item in enumerate(pesos_ordem):
+        cabe = (genes[:, j] == 0) & (peso_atual + peso_item <= capacidade_maxima)
+        genes[cabe, j] = 1
+        peso_atual[cabe] += peso_item
+
+    populacao[np.ix_(inviaveis, ordem_razao)] = genes
+    totais = populacao[inviaveis] @ pesos_valores
+    pesos_totais[inviaveis] = totais[:, 0]
+    valores_totais[inviaveis] = totais[:, 1]
+
+
+def algoritmo_genetico_mochila_numpy(
+    items_data: List[Tuple[str, int, int]],
+    capacidade_maxima: int,
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    modo_mutacao: str = "bit_flip",
+    tamanho_cache_fitness: int = 0,
+    reparar_inviaveis: bool = False,
+    fracao_gulosa: float = 0.0,
+    populacao_inicial: Optional[List[List[int]]] = None,
+    retornar_populacao: bool = False,
+    max_geracoes_sem_melhoria: int = 0,
+    diversidade_minima: float = 0.0,
+    tempo_maximo: float = 0.0,
+    parar_no_limite_superior: bool = False,
+    instrumentacao: Optional[Instrumentacao] = None,
+    arquivo_checkpoint: Optional[str] = None,
+    intervalo_checkpoint: float = 60.0,
+    checkpoint_inicial: Optional[Any] = None,
+    taxas_adaptativas: bool = False,
+    busca_local_movimentos: int = 0
+) -> HistoricoAG:
+    """
+    Versão vetorizada de algoritmo_genetico_mochila_iterativo. Recebe os mesmos parâmetros e
+    retorna o mesmo histórico de (melhor_solucao_cromossomo, valor_real, peso_real, fitness).
+    """
+    return _coletar_historico(algoritmo_genetico_mochila_numpy_geracoes(
+        items_data, capacidade_maxima, tam_populacao, num_geracoes, taxa_mutacao,
+        taxa_cruzamento, contagem_elitismo, tam_torneio, seed, modo_mutacao,
+        tamanho_cache_fitness, reparar_inviaveis, fracao_gulosa, populacao_inicial,
+        retornar_populacao, max_geracoes_sem_melhoria, diversidade_minima, tempo_maximo,
+        parar_no_limite_superior, instrumentacao, arquivo_checkpoint, intervalo_checkpoint,
+        checkpoint_inicial, taxas_adaptativas, busca_local_movimentos
+    ))
+
+
+def algoritmo_genetico_mochila_numpy_geracoes(
+    items_data: List[Tuple[str, int, int]],
+    capacidade_maxima: int,
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    modo_mutacao: str = "bit_flip",
+    tamanho_cache_fitness: int = 0,
+    reparar_inviaveis: bool = False,
+    fracao_gulosa: float = 0.0,
+    populacao_inicial: Optional[List[List[int]]] = None,
+    retornar_populacao: bool = False,
+    max_geracoes_sem_melhoria: int = 0,
+    diversidade_minima: float = 0.0,
+    tempo_maximo: float = 0.0,
+    parar_no_limite_superior: bool = False,
+    instrumentacao: Optional[Instrumentacao] = None,
+    arquivo_checkpoint: Optional[str] = None,
+    intervalo_checkpoint: float = 60.0,
+    checkpoint_inicial: Optional[Any] = None,
+    taxas_adaptativas: bool = False,
+    busca_local_movimentos: int = 0
+) -> Generator[EstadoGeracao, None, Dict[str, Any]]:
+    """
+    Versão vetorizada de algoritmo_genetico_mochila_geracoes: recebe os mesmos parâmetros e
+    produz um EstadoGeracao por geração.
+    No modo de mutação "geometrica" as mutações são sorteadas com mutacao_binomial_populacao.
+    O cache de fitness não se aplica a este motor, pois a avaliação da população inteira é um
+    único produto de matrizes; `tamanho_cache_fitness` é aceito apenas por compatibilidade.
+    O reparo e a semeadura gulosa usam reparar_populacao. Nos checkpoints, o estado gravado é o
+    do gerador de números aleatórios do NumPy. Com `taxas_adaptativas`, o cruzamento usa
+    cruzamento_operadores_populacao e o sucesso dos filhos é medido com avaliações extras da
+    população de descendentes antes e depois da mutação. A busca local roda em cada linha
+    de elite convertida para lista, como no motor Python.
+    """
+    criterios_parada = CriteriosParada(items_data, capacidade_maxima, max_geracoes_sem_melhoria,
+                                       diversidade_minima, tempo_maximo, parar_no_limite_superior)
+    rng = np.random.default_rng(seed)
+    mutar = mutacao_binomial_populacao if modo_mutacao == "geometrica" else mutacao_bit_flip_populacao
+
+    num_items = len(items_data)
+    if num_items == 0:
+        return {}
+    if tam_populacao <= 0:
+        return {}
+    contagem_elitismo, tam_torneio = _normalizar_parametros(tam_populacao, contagem_elitismo, tam_torneio)
+    if populacao_inicial is not None and any(len(individuo) != num_items for individuo in populacao_inicial):
+        raise ValueError("Todos os indivíduos da população inicial devem ter um gene por item.")
+
+    pesos_valores = matriz_pesos_valores(items_data)
+
+    # Ordem por razão valor/peso, calculada uma única vez e só se o reparo, a semeadura gulosa ou
+    # a busca local forem usados: num catálogo grande, ordenar custaria mais que as gerações iniciais
+    usar_busca_local = busca_local_movimentos > 0
+    ordem_razao = None
+    if reparar_inviaveis or fracao_gulosa > 0 or usar_busca_local:
+        ordem_razao = ordenar_por_razao_colunas(pesos_valores)
+    if usar_busca_local:
+        # A busca local (mochila_ga.busca_local) trabalha com listas Python
+        pesos_itens, valores_itens = pesos_valores[:, 0].tolist(), pesos_valores[:, 1].tolist()
+        ordem_razao_lista = ordem_razao.tolist()
+    busca_local_resumo = {"chamadas": 0, "melhorados": 0, "movimentos": 0}
+    num_avaliacoes = 0  # Linhas avaliadas por avaliar_populacao (sempre completas neste motor)
+    adaptativas = TaxasAdaptativas(taxa_mutacao, num_items) if taxas_adaptativas else None
+
+    num_iniciais = min(len(populacao_inicial), tam_populacao) if populacao_inicial is not None else 0
+    num_gulosos = min(round(min(max(fracao_gulosa, 0.0), 1.0) * tam_populacao), tam_populacao - num_iniciais)
+    populacao_atual = rng.integers(0, 2, size=(tam_populacao, num_items), dtype=np.uint8)
+    if num_iniciais > 0:
+        populacao_atual[:num_iniciais] = np.array(populacao_inicial[:num_iniciais], dtype=np.uint8)
+    if num_gulosos > 0:
+        gulosa = solucao_gulosa(pesos_valores[:, 0].tolist(), capacidade_maxima, ordem_razao.tolist())
+        populacao_atual[num_iniciais:num_iniciais + num_gulosos] = gulosa
+        sementes = populacao_atual[num_iniciais + 1:num_iniciais + num_gulosos]
+        mutar(rng, sementes, taxa_mutacao)
+        _, valores_sementes, pesos_sementes = avaliar_populacao(sementes, pesos_valores, capacidade_maxima)
+        reparar_populacao(sementes, pesos_valores, capacidade_maxima, ordem_razao, pesos_sementes, valores_sementes)
+
+    melhor_solucao_geral: Optional[np.ndarray] = None
+    melhor_fitness_geral = -1
+    melhor_valor_geral = -1
+    melhor_peso_geral = -1
+
+    melhor_solucao_geral_lista = [0] * num_items  # Convertida só quando a melhor solução muda
+
+    num_descendentes_necessarios = tam_populacao - contagem_elitismo
+    num_pares = (num_descendentes_necessarios + 1) // 2
+    criterio_parada = "num_geracoes"
+    medir = instrumentacao is not None
+    primeira_geracao = 0
+
+    gravador = None
+    if arquivo_checkpoint is not None or checkpoint_inicial is not None:
+        # Importação tardia: mochila_checkpoint importa mochila_ga
+        from mochila_checkpoint import GravadorCheckpoint
+        num_bytes = (num_items + 7) // 8
+    if arquivo_checkpoint is not None:
+        gravador = GravadorCheckpoint(arquivo_checkpoint, intervalo_checkpoint, "numpy", {
+            "tam_populacao": tam_populacao, "num_geracoes": num_geracoes, "taxa_mutacao": taxa_mutacao,
+            "taxa_cruzamento": taxa_cruzamento, "contagem_elitismo": contagem_elitismo, "tam_torneio": tam_torneio,
+            "seed": seed, "motor": "numpy", "modo_mutacao": modo_mutacao,
+            "tamanho_cache_fitness": tamanho_cache_fitness, "reparar_inviaveis": reparar_inviaveis,
+            "fracao_gulosa": fracao_gulosa, "retornar_populacao": retornar_populacao,
+            "max_geracoes_sem_melhoria": max_geracoes_sem_melhoria, "diversidade_minima": diversidade_minima,
+            "tempo_maximo": tempo_maximo, "parar_no_limite_superior": parar_no_limite_superior,
+            "taxas_adaptativas": taxas_adaptativas, "busca_local_movimentos": busca_local_movimentos,
+        }, items_data, capacidade_maxima)
+
+    if checkpoint_inicial is not None:
+        # Retomada: a população inicial sorteada acima é substituída pela do checkpoint
+        if checkpoint_inicial.motor != "numpy" or checkpoint_inicial.num_items != num_items:
+            raise ValueError("O checkpoint não corresponde ao motor ou ao número de itens desta execução.")
+        rng.bit_generator.state = checkpoint_inicial.estado_aleatorio
+        primeira_geracao = checkpoint_inicial.geracao
+        genes_empacotados = np.frombuffer(b"".join(checkpoint_inicial.populacao), dtype=np.uint8)
+        populacao_atual = np.unpackbits(genes_empacotados.reshape(-1, num_bytes), axis=1, count=num_items, bitorder="little")
+        if checkpoint_inicial.melhor is not None:
+            dados_melhor, melhor_valor_geral, melhor_peso_geral, melhor_fitness_geral = checkpoint_inicial.melhor
+            melhor_solucao_geral_lista = desempacotar_genes(dados_melhor, num_items)
+        criterios_parada.melhor_fitness, criterios_parada.geracoes_sem_melhoria = checkpoint_inicial.criterios
+        if adaptativas is not None and checkpoint_inicial.adaptacao is not None:
+            adaptativas.restaurar(checkpoint_inicial.adaptacao)
+
+    for geracao in range(primeira_geracao, num_geracoes):
+        if gravador is not None and gravador.deve_gravar():
+            gravador.gravar(
+                geracao, [linha.tobytes() for linha in np.packbits(populacao_atual, axis=1, bitorder="little")],
+                [None] * tam_populacao,
+                (melhor_solucao_geral_lista, melhor_valor_geral, melhor_peso_geral, melhor_fitness_geral) if melhor_fitness_geral != -1 else None,
+                (criterios_parada.melhor_fitness, criterios_parada.geracoes_sem_melhoria), rng.bit_generator.state,
+                adaptativas.estado() if adaptativas is not None else None
+            )
+        if medir:
+            if instrumentacao.ao_iniciar_geracao is not None:
+                instrumentacao.ao_iniciar_geracao(geracao)
+            tempos = dict.fromkeys(FASES_GERACAO, 0.0)
+            inicio_fase = time.perf_counter()
+        fitness, valores, pesos = avaliar_populacao(populacao_atual, pesos_valores, capacidade_maxima)
+        num_avaliacoes += tam_populacao
+        if reparar_inviaveis:
+            reparar_populacao(populacao_atual, pesos_valores, capacidade_maxima, ordem_razao, pesos, valores)
+            fitness = np.where(pesos > capacidade_maxima, 0, valores)
+        if medir:
+            fim_fase = time.perf_counter()
+            tempos["avaliacao"] = fim_fase - inicio_fase
+            inicio_fase = fim_fase
+        # Seleção parcial do melhor e dos elites, na mesma ordem do sort estável do motor Python
+        ordem = indices_maiores(fitness, max(contagem_elitismo, 1))
+        if medir:
+            fim_fase = time.perf_counter()
+            tempos["ordenacao"] = fim_fase - inicio_fase
+            inicio_fase = fim_fase
+        if usar_busca_local:
+            for i in ordem[:max(contagem_elitismo, 1)].tolist():
+                melhorado, peso_real, valor_real, num_movimentos = busca_local(
+                    populacao_atual[i].tolist(), int(pesos[i]), int(valores[i]), pesos_itens, valores_itens,
+                    capacidade_maxima, ordem_razao_lista, busca_local_movimentos
+                )
+                busca_local_resumo["chamadas"] += 1
+                if (peso_real, valor_real) == (pesos[i], valores[i]):
+                    continue
+                busca_local_resumo["melhorados"] += 1
+                busca_local_resumo["movimentos"] += num_movimentos
+                populacao_atual[i] = melhorado
+                pesos[i], valores[i], fitness[i] = peso_real, valor_real, valor_real
+            # Os elites só melhoram: continuam sendo os melhores, reordenados entre si
+            ordem = ordem[np.argsort(-fitness[ordem], kind="stable")]
+            if medir:
+                tempos["busca_local"] = time.perf_counter() - inicio_fase
+
+        indice_melhor = ordem[0]
+        melhorou = fitness[indice_melhor] > melhor_fitness_geral
+        if melhorou:
+            melhor_fitness_geral = int(fitness[indice_melhor])
+            melhor_valor_geral = int(valores[indice_melhor])
+            melhor_peso_geral = int(pesos[indice_melhor])
+            melhor_solucao_geral = populacao_atual[indice_melhor].copy()
+            melhor_solucao_geral_lista = melhor_solucao_geral.tolist()
+
+        estado = EstadoGeracao(
+            geracao,
+            melhor_solucao_geral_lista,
+            melhor_valor_geral if melhor_valor_geral != -1 else 0,
+            melhor_peso_geral if melhor_peso_geral != -1 else 0,
+            melhor_fitness_geral if melhor_fitness_geral != -1 else 0,
+            float(fitness.mean()),
+            int(fitness[indice_melhor]),
+            int(fitness.min()),
+            int(np.count_nonzero(pesos <= capacidade_maxima))
+        )
+        if medir and melhorou and instrumentacao.ao_encontrar_melhor is not None:
+            instrumentacao.ao_encontrar_melhor(estado)
+        yield estado
+
+        elites = populacao_atual[ordem[:contagem_elitismo]]
+
+        # Mesma regra de fallback do motor Python para populações menores que o torneio
+        if tam_populacao < max(1, tam_torneio):
+            descendentes = rng.integers(0, 2, size=(num_descendentes_necessarios, num_items), dtype=np.uint8)
+        elif num_pares > 0:
+            if medir:
+                inicio_fase = time.perf_counter()
+            k = min(tam_torneio, tam_populacao)
+            indices_pai1 = selecionar_indices_torneio(rng, fitness, num_pares, k)
+            if tam_populacao > 1:
+                k2 = min(tam_torneio, tam_populacao - 1)
+                indices_pai2 = selecionar_indices_torneio(rng, fitness, num_pares, k2, excluir=indices_pai1)
+            else:
+                indices_pai2 = indices_pai1  # Usa o mesmo pai se for o único
+            if medir:
+                fim_fase = time.perf_counter()
+                tempos["selecao"] = fim_fase - inicio_fase
+                inicio_fase = fim_fase
+
+            if adaptativas is None:
+                filhos1, filhos2 = cruzamento_ponto_unico_populacao(
+                    rng, populacao_atual[indices_pai1], populacao_atual[indices_pai2], taxa_cruzamento
+                )
+            else:
+                filhos1, filhos2, operadores, cruza = cruzamento_operadores_populacao(
+                    rng, populacao_atual[indices_pai1], populacao_atual[indices_pai2], taxa_cruzamento,
+                    adaptativas.probabilidades
+                )
+                # Sucesso do operador: filhos melhores que o melhor dos pais
+                melhor_pai = np.maximum(fitness[indices_pai1], fitness[indices_pai2])
+                sucessos = ((avaliar_populacao(filhos1, pesos_valores, capacidade_maxima)[0] > melhor_pai).astype(np.int64)
+                            + (avaliar_populacao(filhos2, pesos_valores, capacidade_maxima)[0] > melhor_pai))
+                num_avaliacoes += 2 * num_pares
+                for indice in range(len(OPERADORES_CRUZAMENTO)):
+                    pares = cruza & (operadores == indice)
+                    adaptativas.registrar_cruzamento(indice, 2 * int(np.count_nonzero(pares)), int(sucessos[pares].sum()))
+            # Intercala filho1/filho2 de cada par, na mesma ordem do motor Python
+            descendentes = np.empty((2 * num_pares, num_items), dtype=np.uint8)
+            descendentes[0::2] = filhos1
+            descendentes[1::2] = filhos2
+            descendentes = descendentes[:num_descendentes_necessarios]
+            if medir:
+                fim_fase = time.perf_counter()
+                tempos["cruzamento"] = fim_fase - inicio_fase
+                inicio_fase = fim_fase
+            if adaptativas is None:
+                mutar(rng, descendentes, taxa_mutacao)
+            else:
+                antes = descendentes.copy()
+                fitness_antes = avaliar_populacao(antes, pesos_valores, capacidade_maxima)[0]
+                mutar(rng, descendentes, adaptativas.taxa_mutacao)
+                mutados = np.any(descendentes != antes, axis=1)
+                fitness_depois = avaliar_populacao(descendentes, pesos_valores, capacidade_maxima)[0]
+                num_avaliacoes += 2 * len(descendentes)
+                adaptativas.registrar_mutacao(int(np.count_nonzero(mutados)),
+                                              int(np.count_nonzero(mutados & (fitness_depois > fitness_antes))))
+            if medir:
+                tempos["mutacao"] = time.perf_counter() - inicio_fase
+        else:
+            descendentes = np.empty((0, num_items), dtype=np.uint8)
+        if adaptativas is not None:
+            adaptativas.atualizar(geracao, diversidade_por_contagens(populacao_atual.sum(axis=0).tolist(), tam_populacao))
+
+        if medir:
+            num_selecionados = 2 * num_pares if tam_populacao >= max(1, tam_torneio) else 0
+            instrumentacao.registrar_geracao(tempos, {
+                "avaliacao": tam_populacao, "ordenacao": 1,
+                "busca_local": min(max(contagem_elitismo, 1), tam_populacao) if busca_local_movimentos > 0 else 0,
+                "selecao": num_selecionados,
+                "cruzamento": num_selecionados // 2, "mutacao": len(descendentes) if num_selecionados else 0
+            })
+            if instrumentacao.ao_finalizar_geracao is not None:
+                instrumentacao.ao_finalizar_geracao(estado)
+
+        # Verificado com a população avaliada desta geração, que fica como populacao_final se parar
+        criterio = criterios_parada.verificar(
+            melhor_fitness_geral, lambda: populacao_atual.sum(axis=0).tolist(), tam_populacao
+        )
+        if criterio is not None:
+            criterio_parada = criterio
+            break
+
+        populacao_atual = np.concatenate((elites, descendentes))
+
+    estatisticas: Dict[str, Any] = {
+        "criterio_parada": criterio_parada,
+        "avaliacoes": {"completas": num_avaliacoes, "incrementais": 0},
+    }
+    if instrumentacao is not None:
+        estatisticas["instrumentacao"] = instrumentacao.resumo()
+    if gravador is not None:
+        estatisticas["checkpoints_gravados"] = gravador.num_gravacoes
+    if adaptativas is not None:
+        estatisticas["taxas_adaptativas"] = adaptativas.resumo()
+    if busca_local_movimentos > 0:
+        estatisticas["busca_local"] = busca_local_resumo
+    return {"estatisticas": estatisticas, "populacao_final": populacao_atual.tolist() if retornar_populacao else None}
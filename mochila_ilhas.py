@@ -0,0 +1,128 @@
+"""
+Modelo de ilhas para o algoritmo genético da mochila, usando vários processos.
+
+Cada ilha é uma população independente de algoritmo_genetico_mochila_iterativo, com sua
+própria seed derivada, executada em um ProcessPoolExecutor. A cada `intervalo_migracao`
+gerações as ilhas param, e os `num_migrantes` melhores indivíduos de cada uma substituem os
+piores da ilha seguinte (topologia em anel). O histórico retornado é o da melhor solução
+global (entre todas as ilhas) até cada geração.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from mochila_ga import HistoricoAG, algoritmo_genetico_mochila_iterativo, calcular_detalhes_individuo, Item
+
+
+def _executar_etapa_ilha(items_data: List[Tuple[str, int, int]],
+                         capacidade_maxima: int,
+                         num_geracoes: int,
+                         seed: int,
+                         populacao: Optional[List[List[int]]],
+                         parametros_ag: Dict[str, Any]) -> Tuple[List[Tuple[List[int], int, int, int]], List[List[int]]]:
+    """
+    Executa `num_geracoes` gerações de uma ilha (em um processo do pool).
+    Retorna o histórico da etapa e a população final ordenada do melhor para o pior fitness,
+    para que a migração possa usar o início da lista (migrantes) e o fim (substituídos).
+    """
+    historico = algoritmo_genetico_mochila_iterativo(
+        items_data, capacidade_maxima, num_geracoes=num_geracoes, seed=seed,
+        populacao_inicial=populacao, retornar_populacao=True, **parametros_ag
+    )
+    items = [Item(nome, peso, valor) for nome, peso, valor in items_data]
+    populacao_final = historico.populacao_final or []
+    populacao_final.sort(key=lambda individuo: calcular_detalhes_individuo(individuo, items, capacidade_maxima)[0], reverse=True)
+    return list(historico), populacao_final
+
+
+def algoritmo_genetico_ilhas(
+    items_data: List[Tuple[str, int, int]],
+    capacidade_maxima: int,
+    num_ilhas: int = 4,
+    num_geracoes: int = 200,
+    intervalo_migracao: int = 20,
+    num_migrantes: int = 2,
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    **parametros_ag: Any
+) -> HistoricoAG:
+    """
+    Resolve o problema da mochila com `num_ilhas` populações em paralelo, trocando migrantes
+    em anel a cada `intervalo_migracao` gerações. Os demais parâmetros (tam_populacao,
+    taxa_mutacao, motor, ...) são repassados a algoritmo_genetico_mochila_iterativo.
+    Retorna o histórico da melhor solução global até cada geração, no mesmo formato do AG,
+    com o número de ilhas e de migrações em `historico.estatisticas["ilhas"]`.
+    """
+    if num_ilhas <= 0:
+        raise ValueError("O número de ilhas deve ser positivo.")
+    if intervalo_migracao <= 0:
+        raise ValueError("O intervalo de migração deve ser positivo.")
+    for parametro in ("num_geracoes", "seed", "populacao_inicial", "retornar_populacao"):
+        if parametro in parametros_ag:
+            raise ValueError(f"O parâmetro '{parametro}' é controlado pelo modelo de ilhas.")
+    # Cada etapa é uma execução separada do AG: os critérios de parada antecipada não
+    # acompanhariam a execução inteira, e as ilhas ficariam com históricos de tamanhos diferentes
+    for parametro in ("max_geracoes_sem_melhoria", "diversidade_minima", "tempo_maximo", "parar_no_limite_superior"):
+        if parametros_ag.get(parametro):
+            raise ValueError(f"O critério de parada '{parametro}' não é suportado pelo modelo de ilhas.")
+
+    # Seeds das ilhas em cada etapa derivadas de um único gerador, para reprodutibilidade
+    gerador_seeds = random.Random(seed)
+    if max_workers is None:
+        max_workers = min(num_ilhas, os.cpu_count() or 1)
+
+    populacoes: List[Optional[List[List[int]]]] = [None] * num_ilhas
+    historico_global = HistoricoAG()
+    melhor_global: Optional[Tuple[List[int], int, int, int]] = None
+    num_migracoes = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        geracoes_restantes = num_geracoes
+        while geracoes_restantes > 0:
+            geracoes_etapa = min(intervalo_migracao, geracoes_restantes)
+            futuros = [
+                executor.submit(_executar_etapa_ilha, items_data, capacidade_maxima, geracoes_etapa,
+                                gerador_seeds.getrandbits(64), populacoes[ilha], parametros_ag)
+                for ilha in range(num_ilhas)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+            historicos = [historico for historico, _ in resultados]
+            populacoes = [populacao for _, populacao in resultados]
+            if not all(historicos):
+                break  # Instância vazia ou população inválida: nada a executar
+
+            # Melhor solução global acumulada, geração a geração
+            for geracao in range(geracoes_etapa):
+                melhor_etapa = max((historico[geracao] for historico in historicos), key=lambda registro: registro[3])
+                if melhor_global is None or melhor_etapa[3] > melhor_global[3]:
+                    melhor_global = melhor_etapa
+                historico_global.append(melhor_global)
+
+            geracoes_restantes -= geracoes_etapa
+            if geracoes_restantes > 0 and num_ilhas > 1 and num_migrantes > 0:
+                # Migração em anel: os melhores da ilha i substituem os piores da ilha i + 1
+                migrantes = [[individuo[:] for individuo in populacao[:num_migrantes]] for populacao in populacoes]
+                for ilha, populacao in enumerate(populacoes):
+                    recebidos = migrantes[ilha - 1][:max(len(populacao) - 1, 0)]
+                    if recebidos:
+                        populacao[-len(recebidos):] = recebidos
+                num_migracoes += 1
+
+    historico_global.estatisticas["ilhas"] = {"num_ilhas": num_ilhas, "migracoes": num_migracoes}
+    return historico_global
+
+
+if __name__ == "__main__":
+    config_itens_ex1 = [
+        ("Lanterna", 2, 15), ("Saco de Dormir", 5, 30), ("Comida Enlatada", 10, 50),
+        ("Corda", 3, 20), ("Mapa", 1, 10), ("Bússola", 1, 15),
+        ("Kit Primeiros Socorros", 4, 25), ("Cantil", 2, 20), ("Faca", 1, 18),
+        ("Repelente", 1, 12), ("Câmera", 3, 40), ("Livro", 2, 5),
+        ("Barraca", 15, 70), ("Fogareiro", 6, 35), ("Panelas", 4, 22),
+        ("Rádio Solar", 3, 28), ("Bateria Extra", 2, 22), ("Chocolate", 1, 16)
+    ]
+    historico = algoritmo_genetico_ilhas(config_itens_ex1, 35, num_ilhas=4, num_geracoes=150, seed=42)
+    final_solucao, final_valor, final_peso, final_fitness = historico[-1]
+    print(f"Melhor Solução (cromossomo): {final_solucao}")
+    print(f"Valor Total: {final_valor} | Peso Total: {final_peso}/35 | {historico.estatisticas['ilhas']}")
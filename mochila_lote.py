@@ -0,0 +1,313 @@
+"""
+Resolução em lote de muitas instâncias do problema da mochila.
+
+Com o motor "numpy", as instâncias com o mesmo número de itens são empilhadas e
+resolvidas juntas: as populações de todas elas formam um único array
+(num_instancias, tam_populacao, num_items) e cada geração avalia, seleciona, cruza e muta
+todas as instâncias de uma vez. Os buffers da população são alocados uma vez por grupo e
+reaproveitados a cada geração, e um único gerador de números aleatórios atende o grupo
+inteiro. Assim o custo fixo por instância (criar Item, listas, gerador) deixa de dominar
+quando as instâncias são pequenas.
+
+Os demais motores executam algoritmo_genetico_mochila_iterativo para cada instância.
+Em ambos os casos o trabalho pode ser distribuído em um ProcessPoolExecutor, e os
+resultados voltam na ordem das instâncias de entrada.
+"""
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from mochila_ga import MODOS_MUTACAO, MOTORES, HistoricoAG, _normalizar_parametros, algoritmo_genetico_mochila_iterativo
+
+# Instância: (items_data, capacidade_maxima), no mesmo formato de algoritmo_genetico_mochila_iterativo
+Instancia = Tuple[List[Tuple[str, int, int]], int]
+
+
+def _selecionar_indices_torneio_lote(rng, pontuacoes_fitness, num_selecoes: int, tam_torneio: int, excluir=None):
+    """
+    Equivalente a selecionar_indices_torneio para um lote: `pontuacoes_fitness` tem forma
+    (num_instancias, tam_populacao) e o resultado (num_instancias, num_selecoes).
+    """
+    import numpy as np
+
+    num_instancias, tam_populacao = pontuacoes_fitness.shape
+    if excluir is None:
+        contendores = rng.integers(0, tam_populacao, size=(num_instancias, num_selecoes, tam_torneio))
+    else:
+        # Sorteia entre tam_populacao - 1 posições e "pula" o índice excluído
+        contendores = rng.integers(0, tam_populacao - 1, size=(num_instancias, num_selecoes, tam_torneio))
+        contendores += contendores >= excluir[:, :, None]
+    linhas = np.arange(num_instancias)[:, None, None]
+    vencedores = np.argmax(pontuacoes_fitness[linhas, contendores], axis=2)
+    return np.take_along_axis(contendores, vencedores[:, :, None], axis=2)[:, :, 0]
+
+
+def _indices_maiores_lote(pontuacoes_fitness, quantidade: int):
+    """
+    Equivalente a indices_maiores (mochila_ga_numpy) linha a linha: para `pontuacoes_fitness`
+    de forma (num_instancias, tam_populacao), retorna (num_instancias, quantidade) índices com
+    os mesmos valores de np.argsort(-pontuacoes_fitness, axis=1, kind="stable")[:, :quantidade],
+    usando np.partition em cada linha em vez de ordenar a população inteira.
+    """
+    import numpy as np
+
+    num_instancias, tam_populacao = pontuacoes_fitness.shape
+    quantidade = min(quantidade, tam_populacao)
+    if quantidade <= 0:
+        return np.empty((num_instancias, 0), dtype=np.intp)
+    if quantidade == 1:
+        return np.argmax(pontuacoes_fitness, axis=1)[:, None]  # argmax retorna o primeiro máximo
+    limiar = np.partition(pontuacoes_fitness, tam_populacao - quantidade, axis=1)[:, tam_populacao - quantidade, None]
+    maiores = pontuacoes_fitness > limiar
+    empatados = pontuacoes_fitness == limiar
+    # Completa cada linha com os primeiros empatados no limiar, como faria a ordenação estável
+    faltando = quantidade - np.count_nonzero(maiores, axis=1)
+    selecionados = maiores | (empatados & (np.cumsum(empatados, axis=1) <= faltando[:, None]))
+    indices = np.nonzero(selecionados)[1].reshape(num_instancias, quantidade)
+    linhas = np.arange(num_instancias)[:, None]
+    return np.take_along_axis(indices, np.argsort(-pontuacoes_fitness[linhas, indices], axis=1, kind="stable"), axis=1)
+
+
+def algoritmo_genetico_lote_numpy(
+    pesos_valores,
+    capacidades,
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    modo_mutacao: str = "bit_flip",
+    reparar_inviaveis: bool = False
+) -> List[HistoricoAG]:
+    """
+    Executa o AG do motor "numpy" em várias instâncias com o mesmo número de itens ao mesmo tempo.
+    `pesos_valores` é um array (num_instancias, num_items, 2) com pesos na coluna 0 e valores
+    na coluna 1, e `capacidades` um array (num_instancias,). Retorna um HistoricoAG por
+    instância, na mesma ordem, com o mesmo formato de algoritmo_genetico_mochila_iterativo.
+    """
+    import numpy as np
+    from mochila_ga_numpy import mutacao_binomial_populacao, mutacao_bit_flip_populacao, reparar_populacao
+    from mochila_ga import ordenar_por_razao
+
+    pesos_valores = np.asarray(pesos_valores, dtype=np.int64)
+    capacidades = np.asarray(capacidades, dtype=np.int64)
+    num_instancias, num_items, _ = pesos_valores.shape
+    if num_items == 0 or tam_populacao <= 0 or num_instancias == 0:
+        return [HistoricoAG() for _ in range(num_instancias)]
+    contagem_elitismo, tam_torneio = _normalizar_parametros(tam_populacao, contagem_elitismo, tam_torneio)
+    rng = np.random.default_rng(seed)
+    mutar = mutacao_binomial_populacao if modo_mutacao == "geometrica" else mutacao_bit_flip_populacao
+    ordens_razao = [
+        np.array(ordenar_por_razao(pesos_valores[b, :, 0].tolist(), pesos_valores[b, :, 1].tolist()), dtype=np.intp)
+        for b in range(num_instancias)
+    ] if reparar_inviaveis else []
+
+    num_descendentes_necessarios = tam_populacao - contagem_elitismo
+    num_pares = (num_descendentes_necessarios + 1) // 2
+    linhas = np.arange(num_instancias)
+
+    # Buffers alocados uma única vez: população atual, próxima e descendentes (pares completos)
+    populacao_atual = rng.integers(0, 2, size=(num_instancias, tam_populacao, num_items), dtype=np.uint8)
+    proxima_populacao = np.empty_like(populacao_atual)
+    descendentes = np.empty((num_instancias, 2 * num_pares, num_items), dtype=np.uint8)
+    posicoes_genes = np.arange(num_items)
+
+    # Histórico guardado em arrays (geração, instância); os cromossomos só quando a melhor solução muda
+    historico_fitness = np.empty((num_geracoes, num_instancias), dtype=np.int64)
+    historico_valores = np.empty((num_geracoes, num_instancias), dtype=np.int64)
+    historico_pesos = np.empty((num_geracoes, num_instancias), dtype=np.int64)
+    historico_versoes = np.empty((num_geracoes, num_instancias), dtype=np.int64)
+    melhores_cromossomos: List[List[List[int]]] = [[] for _ in range(num_instancias)]
+    melhor_fitness = np.full(num_instancias, -1, dtype=np.int64)
+    melhor_valor = np.zeros(num_instancias, dtype=np.int64)
+    melhor_peso = np.zeros(num_instancias, dtype=np.int64)
+
+    for geracao in range(num_geracoes):
+        totais = np.matmul(populacao_atual, pesos_valores)
+        pesos = totais[:, :, 0]
+        valores = totais[:, :, 1]
+        if reparar_inviaveis:
+            for b in np.flatnonzero((pesos > capacidades[:, None]).any(axis=1)):
+                reparar_populacao(populacao_atual[b], pesos_valores[b], capacidades[b], ordens_razao[b], pesos[b], valores[b])
+        fitness = np.where(pesos > capacidades[:, None], 0, valores)
+        # Seleção parcial do melhor e dos elites, na mesma ordem do sort estável do motor Python
+        ordem = _indices_maiores_lote(fitness, max(contagem_elitismo, 1))
+
+        indices_melhores = ordem[:, 0]
+        fitness_melhores = fitness[linhas, indices_melhores]
+        melhorou = fitness_melhores > melhor_fitness
+        for b in np.flatnonzero(melhorou):
+            melhores_cromossomos[b].append(populacao_atual[b, indices_melhores[b]].tolist())
+        melhor_fitness = np.where(melhorou, fitness_melhores, melhor_fitness)
+        melhor_valor = np.where(melhorou, valores[linhas, indices_melhores], melhor_valor)
+        melhor_peso = np.where(melhorou, pesos[linhas, indices_melhores], melhor_peso)
+        historico_fitness[geracao] = melhor_fitness
+        historico_valores[geracao] = melhor_valor
+        historico_pesos[geracao] = melhor_peso
+        historico_versoes[geracao] = [len(cromossomos) - 1 for cromossomos in melhores_cromossomos]
+
+        proxima_populacao[:, :contagem_elitismo] = populacao_atual[linhas[:, None], ordem[:, :contagem_elitismo]]
+
+        # Mesma regra de fallback do motor Python para populações menores que o torneio
+        if tam_populacao < max(1, tam_torneio):
+            proxima_populacao[:, contagem_elitismo:] = rng.integers(
+                0, 2, size=(num_instancias, num_descendentes_necessarios, num_items), dtype=np.uint8
+            )
+        elif num_pares > 0:
+            k = min(tam_torneio, tam_populacao)
+            indices_pai1 = _selecionar_indices_torneio_lote(rng, fitness, num_pares, k)
+            if tam_populacao > 1:
+                k2 = min(tam_torneio, tam_populacao - 1)
+                indices_pai2 = _selecionar_indices_torneio_lote(rng, fitness, num_pares, k2, excluir=indices_pai1)
+            else:
+                indices_pai2 = indices_pai1  # Usa o mesmo pai se for o único
+            pais1 = populacao_atual[linhas[:, None], indices_pai1]
+            pais2 = populacao_atual[linhas[:, None], indices_pai2]
+
+            if num_items >= 2:
+                cruza = rng.random((num_instancias, num_pares)) < taxa_cruzamento
+                pontos = rng.integers(1, num_items, size=(num_instancias, num_pares))
+                # mascara[b, i, j] é True quando o gene j do filho1 do par i vem do pai1
+                mascara = (posicoes_genes < pontos[:, :, None]) | ~cruza[:, :, None]
+            else:
+                mascara = np.ones(pais1.shape, dtype=bool)
+            # Intercala filho1/filho2 de cada par, na mesma ordem do motor Python
+            np.copyto(descendentes[:, 0::2], np.where(mascara, pais1, pais2))
+            np.copyto(descendentes[:, 1::2], np.where(mascara, pais2, pais1))
+            mutar(rng, descendentes, taxa_mutacao)
+            proxima_populacao[:, contagem_elitismo:] = descendentes[:, :num_descendentes_necessarios]
+
+        populacao_atual, proxima_populacao = proxima_populacao, populacao_atual
+
+    historicos = []
+    for b in range(num_instancias):
+        cromossomos = melhores_cromossomos[b]
+        historicos.append(HistoricoAG(zip(
+            [cromossomos[versao] for versao in historico_versoes[:, b].tolist()],
+            historico_valores[:, b].tolist(),
+            historico_pesos[:, b].tolist(),
+            historico_fitness[:, b].tolist()
+        )))
+    return historicos
+
+
+def _resolver_grupo_numpy(pesos_valores, capacidades, seed: int, parametros_ag: Dict[str, Any]) -> List[HistoricoAG]:
+    """Resolve um grupo de instâncias do mesmo tamanho (em um processo do pool, se houver)."""
+    return algoritmo_genetico_lote_numpy(pesos_valores, capacidades, seed=seed, **parametros_ag)
+
+
+def _resolver_instancia(instancia: Instancia, seed: int, parametros_ag: Dict[str, Any]) -> HistoricoAG:
+    """Resolve uma única instância com algoritmo_genetico_mochila_iterativo."""
+    items_data, capacidade_maxima = instancia
+    return algoritmo_genetico_mochila_iterativo(items_data, capacidade_maxima, seed=seed, **parametros_ag)
+
+
+def resolver_lote(
+    instancias: List[Instancia],
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    motor: str = "numpy",
+    modo_mutacao: str = "bit_flip",
+    max_workers: Optional[int] = None,
+    **parametros_ag: Any
+) -> List[HistoricoAG]:
+    """
+    Resolve uma lista de instâncias (items_data, capacidade_maxima) e retorna um HistoricoAG
+    por instância, na ordem de entrada.
+
+    Com motor="numpy" as instâncias são agrupadas pelo número de itens e cada grupo é resolvido
+    de forma vetorizada por algoritmo_genetico_lote_numpy; além dos parâmetros explícitos, só
+    `reparar_inviaveis` é aceito em `parametros_ag`. Com os outros motores cada instância passa
+    por algoritmo_genetico_mochila_iterativo, que recebe também os `parametros_ag`.
+
+    Com `max_workers` maior que 1 o trabalho é dividido em um ProcessPoolExecutor (os grupos do
+    motor "numpy" em até max_workers partes cada). As seeds de cada grupo, parte ou instância
+    são derivadas de `seed`, então o resultado é reprodutível para a mesma seed e o mesmo
+    max_workers.
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconhecido: '{motor}'. Opções: {', '.join(MOTORES)}.")
+    if modo_mutacao not in MODOS_MUTACAO:
+        raise ValueError(f"Modo de mutação desconhecido: '{modo_mutacao}'. Opções: {', '.join(MODOS_MUTACAO)}.")
+    if "seed" in parametros_ag:
+        raise ValueError("O parâmetro 'seed' é controlado pelo lote.")
+    if motor == "numpy":
+        nao_suportados = set(parametros_ag) - {"reparar_inviaveis"}
+        if nao_suportados:
+            raise ValueError(f"Parâmetros não suportados pelo lote vetorizado: {', '.join(sorted(nao_suportados))}.")
+
+    gerador_seeds = random.Random(seed)
+    num_processos = max_workers if max_workers is not None else 1
+    parametros = dict(parametros_ag, tam_populacao=tam_populacao, num_geracoes=num_geracoes,
+                      taxa_mutacao=taxa_mutacao, taxa_cruzamento=taxa_cruzamento,
+                      contagem_elitismo=contagem_elitismo, tam_torneio=tam_torneio, modo_mutacao=modo_mutacao)
+
+    if motor != "numpy":
+        parametros["motor"] = motor
+        seeds = [gerador_seeds.getrandbits(64) for _ in instancias]
+        if num_processos > 1:
+            with ProcessPoolExecutor(max_workers=num_processos) as executor:
+                return list(executor.map(_resolver_instancia, instancias, seeds, [parametros] * len(instancias)))
+        return [_resolver_instancia(instancia, s, parametros) for instancia, s in zip(instancias, seeds)]
+
+    import numpy as np
+
+    # Agrupa as instâncias pelo número de itens, preservando a ordem de entrada dentro do grupo
+    grupos: Dict[int, List[int]] = {}
+    for indice, (items_data, _) in enumerate(instancias):
+        grupos.setdefault(len(items_data), []).append(indice)
+
+    resultados: List[Optional[HistoricoAG]] = [None] * len(instancias)
+    tarefas = []  # (índices das instâncias, pesos_valores, capacidades, seed)
+    for num_items, indices in grupos.items():
+        tamanho_parte = math.ceil(len(indices) / num_processos)
+        for inicio in range(0, len(indices), tamanho_parte):
+            parte = indices[inicio:inicio + tamanho_parte]
+            pesos_valores = np.array(
+                [[(peso, valor) for _, peso, valor in instancias[i][0]] for i in parte], dtype=np.int64
+            ).reshape(len(parte), num_items, 2)
+            capacidades = np.array([instancias[i][1] for i in parte], dtype=np.int64)
+            tarefas.append((parte, pesos_valores, capacidades, gerador_seeds.getrandbits(64)))
+
+    if num_processos > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=min(num_processos, len(tarefas), os.cpu_count() or 1)) as executor:
+            futuros = [executor.submit(_resolver_grupo_numpy, pesos_valores, capacidades, s, parametros)
+                       for _, pesos_valores, capacidades, s in tarefas]
+            historicos_tarefas = [futuro.result() for futuro in futuros]
+    else:
+        historicos_tarefas = [_resolver_grupo_numpy(pesos_valores, capacidades, s, parametros)
+                              for _, pesos_valores, capacidades, s in tarefas]
+
+    for (parte, _, _, _), historicos in zip(tarefas, historicos_tarefas):
+        for indice, historico in zip(parte, historicos):
+            resultados[indice] = historico
+    return resultados
+
+
+if __name__ == "__main__":
+    import time
+
+    random.seed(0)
+    instancias_exemplo = []
+    for _ in range(2000):
+        num_items = random.choice((10, 15, 20))
+        items = [(f"Item {i}", random.randint(1, 20), random.randint(1, 50)) for i in range(num_items)]
+        instancias_exemplo.append((items, sum(peso for _, peso, _ in items) // 2))
+
+    inicio = time.perf_counter()
+    historicos_lote = resolver_lote(instancias_exemplo, tam_populacao=50, num_geracoes=100, seed=42)
+    print(f"Lote vetorizado: {len(historicos_lote)} instâncias em {time.perf_counter() - inicio:.2f}s")
+
+    inicio = time.perf_counter()
+    for items, capacidade in instancias_exemplo[:200]:
+        algoritmo_genetico_mochila_iterativo(items, capacidade, tam_populacao=50, num_geracoes=100, seed=42, motor="numpy")
+    print(f"Uma chamada por instância: 200 instâncias em {time.perf_counter() - inicio:.2f}s")
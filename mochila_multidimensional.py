@@ -0,0 +1,261 @@
+"""
+Mochila multidimensional (MKP) e múltiplas mochilas, com NumPy.
+
+Cada item tem um vetor de pesos (por exemplo peso, volume e custo) em vez de um único peso:
+`items_data` traz tuplas (nome, pesos, valor) com `pesos` de tamanho num_restricoes, e
+`capacidades` é o vetor (num_restricoes,) de limites. Com várias mochilas, `capacidades` é uma
+matriz (num_mochilas, num_restricoes) e o cromossomo usa genes inteiros: 0 deixa o item de fora
+e k (1..num_mochilas) o coloca na mochila k. Com uma mochila, os genes são os mesmos bits 0/1
+do AG da mochila simples.
+
+A avaliação calcula as cargas de todas as mochilas em todas as restrições de uma vez (um
+produto de matrizes por mochila) e verifica a viabilidade com uma única comparação. O reparo
+usa a razão substituta valor / Σ_j peso_j / capacidade_j (relaxação substituta com
+multiplicadores 1/capacidade, como em Chu e Beasley): retira os itens de menor razão das
+mochilas com alguma restrição violada e depois completa com os de maior razão que couberem.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mochila_ga import HistoricoAG, _normalizar_parametros
+from mochila_ga_numpy import cruzamento_ponto_unico_populacao, indices_maiores, selecionar_indices_torneio
+
+# Os genes são guardados em uint8
+MAX_MOCHILAS = 255
+
+
+def preparar_instancia(items_data: List[Tuple[str, Sequence[int], int]],
+                       capacidades: Sequence) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converte a instância em arrays int64: pesos (num_items, num_restricoes), valores (num_items,)
+    e capacidades (num_mochilas, num_restricoes). Pesos e capacidades devem ser não negativos.
+    """
+    capacidades = np.array(capacidades, dtype=np.int64)
+    if capacidades.ndim == 1:
+        capacidades = capacidades[None, :]
+    if capacidades.ndim != 2 or capacidades.shape[1] == 0:
+        raise ValueError("`capacidades` deve ser um vetor de restrições ou uma matriz mochilas × restrições.")
+    num_mochilas, num_restricoes = capacidades.shape
+    if not 1 <= num_mochilas <= MAX_MOCHILAS:
+        raise ValueError(f"O número de mochilas deve estar entre 1 e {MAX_MOCHILAS}.")
+    pesos = np.array([pesos_item for _, pesos_item, _ in items_data], dtype=np.int64).reshape(-1, num_restricoes)
+    if len(pesos) != len(items_data):
+        raise ValueError(f"Cada item deve ter {num_restricoes} pesos, um por restrição.")
+    valores = np.array([valor for _, _, valor in items_data], dtype=np.int64)
+    if (pesos < 0).any() or (capacidades < 0).any():
+        raise ValueError("Pesos e capacidades da mochila multidimensional devem ser não negativos.")
+    return pesos, valores, capacidades
+
+
+def razoes_substitutas(pesos: np.ndarray, valores: np.ndarray, capacidades: np.ndarray) -> np.ndarray:
+    """
+    Razão valor / peso substituto de cada item, com o peso substituto Σ_j peso_j / C_j e C_j a
+    capacidade total da restrição j somada em todas as mochilas. Itens sem peso têm razão infinita.
+    """
+    multiplicadores = 1.0 / np.maximum(capacidades.sum(axis=0), 1)
+    peso_substituto = pesos @ multiplicadores
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(peso_substituto > 0, valores / peso_substituto, np.inf)
+
+
+def calcular_detalhes_mkp(individuo: Sequence[int],
+                          pesos: np.ndarray,
+                          valores: np.ndarray,
+                          capacidades: np.ndarray) -> Tuple[int, int, np.ndarray]:
+    """
+    Equivalente a calcular_detalhes_individuo para um indivíduo da mochila multidimensional.
+    Retorna: (pontuacao_fitness, valor_total_real, cargas), com cargas (num_mochilas, num_restricoes).
+    """
+    fitness, valores_totais, cargas = avaliar_populacao_mkp(np.array([individuo], dtype=np.uint8), pesos, valores, capacidades)
+    return int(fitness[0]), int(valores_totais[0]), cargas[0]
+
+
+def avaliar_populacao_mkp(populacao: np.ndarray,
+                          pesos: np.ndarray,
+                          valores: np.ndarray,
+                          capacidades: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Avalia todos os indivíduos de uma vez.
+    Retorna: (pontuacoes_fitness, valores_totais, cargas), com cargas (tam_populacao, num_mochilas,
+    num_restricoes). O fitness é 0 se alguma restrição de alguma mochila for violada.
+    """
+    cargas = np.stack([(populacao == mochila + 1) @ pesos for mochila in range(len(capacidades))], axis=1)
+    valores_totais = (populacao > 0) @ valores
+    viaveis = (cargas <= capacidades).all(axis=(1, 2))
+    return np.where(viaveis, valores_totais, 0), valores_totais, cargas
+
+
+def reparar_populacao_mkp(populacao: np.ndarray,
+                          pesos: np.ndarray,
+                          valores: np.ndarray,
+                          capacidades: np.ndarray,
+                          ordem_razao: np.ndarray,
+                          cargas: np.ndarray,
+                          valores_totais: np.ndarray) -> None:
+    """
+    Repara (no próprio array) as linhas com alguma restrição violada, seguindo `ordem_razao`
+    (itens em ordem decrescente de razão substituta): retira itens do fim da ordem enquanto a
+    mochila deles estiver acima da capacidade em alguma restrição e depois coloca, do começo
+    da ordem, cada item fora da solução na primeira mochila em que couber. `cargas` e
+    `valores_totais` são atualizados junto com a população.
+    """
+    inviaveis = np.flatnonzero((cargas > capacidades).any(axis=(1, 2)))
+    if inviaveis.size == 0:
+        return
+    cargas_inviaveis = cargas[inviaveis]
+
+    # Retira itens do fim da ordem (menor razão) enquanto a mochila ainda excede alguma
+    # capacidade: o item é retirado se o peso já retirado antes dele não cobre o excesso
+    # em alguma restrição. Cada mochila é tratada de uma vez, com somas acumuladas.
+    ordem_inversa = ordem_razao[::-1]
+    genes = populacao[np.ix_(inviaveis, ordem_inversa)]
+    pesos_ordem = pesos[ordem_inversa]
+    for mochila in range(len(capacidades)):
+        excesso = cargas_inviaveis[:, mochila] - capacidades[mochila]
+        com_excesso = (excesso > 0).any(axis=1)
+        if not com_excesso.any():
+            continue
+        na_mochila = genes[com_excesso] == mochila + 1
+        peso_selecionado = na_mochila[:, :, None] * pesos_ordem
+        retirado_antes = np.cumsum(peso_selecionado, axis=1) - peso_selecionado
+        retirar = na_mochila & (retirado_antes < excesso[com_excesso][:, None, :]).any(axis=2)
+        genes_excesso = genes[com_excesso]
+        genes_excesso[retirar] = 0
+        genes[com_excesso] = genes_excesso
+        cargas_inviaveis[com_excesso, mochila] -= (peso_selecionado * retirar[:, :, None]).sum(axis=1)
+    genes = genes[:, ::-1]  # De volta à ordem decrescente de razão
+
+    # Completa, do maior para o menor razão, colocando cada item fora da solução na
+    # primeira mochila em que ele couber. As folgas só diminuem, então os itens que não
+    # cabem na maior folga de agora nunca vão caber e são descartados antes do laço.
+    pesos_ordem = pesos[ordem_razao]
+    folga_maxima = (capacidades - cargas_inviaveis).max(axis=(0, 1))
+    for j in np.flatnonzero((pesos_ordem <= folga_maxima).all(axis=1)):
+        peso_item = pesos_ordem[j]
+        livre = genes[:, j] == 0
+        for mochila in range(len(capacidades)):
+            cabe = livre & (cargas_inviaveis[:, mochila] + peso_item <= capacidades[mochila]).all(axis=1)
+            genes[cabe, j] = mochila + 1
+            cargas_inviaveis[cabe, mochila] += peso_item
+            livre &= ~cabe
+
+    populacao[np.ix_(inviaveis, ordem_razao)] = genes
+    cargas[inviaveis] = cargas_inviaveis
+    valores_totais[inviaveis] = (populacao[inviaveis] > 0) @ valores
+
+
+def mutacao_mochilas_populacao(rng: np.random.Generator,
+                               populacao: np.ndarray,
+                               taxa_mutacao: float,
+                               num_mochilas: int) -> None:
+    """
+    Mutação (no próprio array): cada gene, com probabilidade taxa_mutacao, passa para outro
+    valor de 0..num_mochilas sorteado uniformemente. Com uma mochila é o bit-flip.
+    """
+    if taxa_mutacao <= 0:
+        return
+    mutar = rng.random(populacao.shape) < taxa_mutacao
+    deslocamentos = rng.integers(1, num_mochilas + 1, size=np.count_nonzero(mutar))
+    populacao[mutar] = (populacao[mutar] + deslocamentos) % (num_mochilas + 1)
+
+
+def algoritmo_genetico_mkp(
+    items_data: List[Tuple[str, Sequence[int], int]],
+    capacidades: Sequence,
+    tam_populacao: int = 100,
+    num_geracoes: int = 200,
+    taxa_mutacao: float = 0.02,
+    taxa_cruzamento: float = 0.85,
+    contagem_elitismo: int = 2,
+    tam_torneio: int = 5,
+    seed: Optional[int] = None,
+    reparar_inviaveis: bool = True
+) -> HistoricoAG:
+    """
+    Resolve a mochila multidimensional (ou várias mochilas multidimensionais) com o mesmo AG
+    geracional do motor "numpy": torneio, cruzamento de ponto único, mutação e elitismo.
+    Retorna um HistoricoAG (com genes_inteiros) de tuplas (cromossomo, valor_real, cargas,
+    fitness) por geração, com cargas como tupla de tuplas (num_mochilas × num_restricoes).
+
+    O reparo vem ligado por padrão: com várias restrições, quase nenhum indivíduo aleatório é
+    viável, e sem reparo a população começa toda com fitness 0.
+    """
+    pesos, valores, capacidades_mochilas = preparar_instancia(items_data, capacidades)
+    num_mochilas = len(capacidades_mochilas)
+    historico = HistoricoAG(genes_inteiros=True)
+    num_items = len(valores)
+    if num_items == 0 or tam_populacao <= 0:
+        return historico
+    contagem_elitismo, tam_torneio = _normalizar_parametros(tam_populacao, contagem_elitismo, tam_torneio)
+
+    rng = np.random.default_rng(seed)
+    ordem_razao = np.argsort(-razoes_substitutas(pesos, valores, capacidades_mochilas), kind="stable")
+    populacao_atual = rng.integers(0, num_mochilas + 1, size=(tam_populacao, num_items), dtype=np.uint8)
+
+    melhor_tupla: Optional[Tuple[List[int], int, Tuple[Tuple[int, ...], ...], int]] = None
+    num_descendentes_necessarios = tam_populacao - contagem_elitismo
+    num_pares = (num_descendentes_necessarios + 1) // 2
+
+    for _ in range(num_geracoes):
+        fitness, valores_totais, cargas = avaliar_populacao_mkp(populacao_atual, pesos, valores, capacidades_mochilas)
+        if reparar_inviaveis:
+            reparar_populacao_mkp(populacao_atual, pesos, valores, capacidades_mochilas, ordem_razao, cargas, valores_totais)
+            fitness = np.where((cargas <= capacidades_mochilas).all(axis=(1, 2)), valores_totais, 0)
+
+        ordem = indices_maiores(fitness, max(contagem_elitismo, 1))
+        indice_melhor = ordem[0]
+        if melhor_tupla is None or fitness[indice_melhor] > melhor_tupla[3]:
+            melhor_tupla = (
+                populacao_atual[indice_melhor].tolist(), int(valores_totais[indice_melhor]),
+                tuple(map(tuple, cargas[indice_melhor].tolist())), int(fitness[indice_melhor])
+            )
+        historico.append(melhor_tupla)
+
+        elites = populacao_atual[ordem[:contagem_elitismo]]
+        # Mesma regra de fallback do motor "numpy" para populações menores que o torneio
+        if tam_populacao < max(1, tam_torneio):
+            descendentes = rng.integers(0, num_mochilas + 1, size=(num_descendentes_necessarios, num_items), dtype=np.uint8)
+        elif num_pares > 0:
+            indices_pai1 = selecionar_indices_torneio(rng, fitness, num_pares, min(tam_torneio, tam_populacao))
+            if tam_populacao > 1:
+                indices_pai2 = selecionar_indices_torneio(
+                    rng, fitness, num_pares, min(tam_torneio, tam_populacao - 1), excluir=indices_pai1
+                )
+            else:
+                indices_pai2 = indices_pai1
+            filhos1, filhos2 = cruzamento_ponto_unico_populacao(
+                rng, populacao_atual[indices_pai1], populacao_atual[indices_pai2], taxa_cruzamento
+            )
+            descendentes = np.empty((2 * num_pares, num_items), dtype=np.uint8)
+            descendentes[0::2] = filhos1
+            descendentes[1::2] = filhos2
+            descendentes = descendentes[:num_descendentes_necessarios]
+            mutacao_mochilas_populacao(rng, descendentes, taxa_mutacao, num_mochilas)
+        else:
+            descendentes = np.empty((0, num_items), dtype=np.uint8)
+
+        populacao_atual = np.concatenate((elites, descendentes))
+
+    historico.estatisticas["mkp"] = {"num_mochilas": num_mochilas, "num_restricoes": capacidades_mochilas.shape[1]}
+    return historico
+
+
+if __name__ == "__main__":
+    # Itens com (peso, volume, custo)
+    config_itens_mkp = [
+        ("Lanterna", (2, 3, 10), 15), ("Saco de Dormir", (5, 12, 40), 30), ("Comida Enlatada", (10, 6, 25), 50),
+        ("Corda", (3, 4, 8), 20), ("Mapa", (1, 1, 2), 10), ("Bússola", (1, 1, 15), 15),
+        ("Kit Primeiros Socorros", (4, 5, 20), 25), ("Cantil", (2, 4, 6), 20), ("Faca", (1, 1, 12), 18),
+        ("Repelente", (1, 1, 5), 12), ("Câmera", (3, 3, 90), 40), ("Livro", (2, 2, 4), 5),
+        ("Barraca", (15, 30, 120), 70), ("Fogareiro", (6, 8, 35), 35), ("Panelas", (4, 9, 18), 22),
+    ]
+    historico = algoritmo_genetico_mkp(config_itens_mkp, (25, 40, 150), num_geracoes=100, seed=42)
+    solucao, valor, cargas, _ = historico[-1]
+    print(f"Uma mochila: valor {valor}, cargas {cargas[0]} de (25, 40, 150)")
+
+    historico = algoritmo_genetico_mkp(config_itens_mkp, ((15, 25, 100), (15, 25, 100)), num_geracoes=100, seed=42)
+    solucao, valor, cargas, _ = historico[-1]
+    print(f"Duas mochilas: valor {valor}, cargas {cargas}")
+    for mochila in (1, 2):
+        print(f"  Mochila {mochila}: {[nome for (nome, _, _), gene in zip(config_itens_mkp, solucao) if gene == mochila]}")
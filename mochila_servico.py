@@ -0,0 +1,451 @@
+"""
+Serviço HTTP local para resolver mochilas com o algoritmo genético, só com a biblioteca padrão.
+
+As tarefas são executadas em um pool limitado de processos; a fila de espera também é
+limitada (503 quando cheia). Tarefas idênticas a uma já concluída são respondidas pelo
+CacheResultados, sem executar o AG; idênticas a uma ainda na fila ou em execução recebem
+essa mesma tarefa (mesmo id), e o AG executa uma vez só.
+
+    POST   /tarefas               {"itens": [[nome, peso, valor], ...], "capacidade": 35,
+                                   "parametros": {"seed": 42, "num_geracoes": 200, ...}}
+                                  -> 202 {"id": ...}
+    GET    /tarefas/<id>          estado e, ao terminar, o resultado
+    GET    /tarefas/<id>/eventos  progresso por server-sent events ("progresso" e um "fim")
+    DELETE /tarefas/<id>          cancela a tarefa (na fila ou em execução)
+    GET    /metricas              profundidade da fila, tarefas por estado, latências e vazão
+
+Os processos publicam o progresso no máximo a cada `intervalo_progresso` segundos, e é nesse
+momento que verificam se a tarefa foi cancelada.
+
+    python mochila_servico.py --porta 8765 --processos 4
+"""
+import argparse
+import inspect
+import itertools
+import json
+import multiprocessing
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from mochila_cache_resultados import CacheResultados, chave_execucao
+from mochila_ga import HistoricoAG, algoritmo_genetico_mochila_geracoes
+
+# Parâmetros do AG aceitos em JSON: os que não são objetos Python nem caminhos de arquivo
+PARAMETROS_SERVICO = tuple(
+    nome for nome in inspect.signature(algoritmo_genetico_mochila_geracoes).parameters
+    if nome not in ("items_data", "capacidade_maxima", "populacao_inicial", "instrumentacao",
+                    "arquivo_checkpoint", "intervalo_checkpoint", "checkpoint_inicial")
+)
+
+ESTADOS_FINAIS = ("concluida", "cancelada", "erro")
+
+# Amostras guardadas para as métricas de latência
+TAMANHO_AMOSTRAS = 1000
+
+
+def _executar_tarefa(id_tarefa: str, items_data: List[Tuple[str, int, int]], capacidade_maxima: int,
+                     parametros: Dict[str, Any], progresso: Any, cancelamentos: Any,
+                     intervalo_progresso: float) -> Optional[Tuple[HistoricoAG, float]]:
+    """
+    Executa uma tarefa em um processo do pool; retorna o histórico e a duração da execução em
+    segundos, ou None se ela for cancelada.
+    """
+    progresso.put((id_tarefa, "inicio", None))
+    inicio = time.perf_counter()
+    geracoes = algoritmo_genetico_mochila_geracoes(items_data, capacidade_maxima, **parametros)
+    historico = HistoricoAG()
+    ultimo_envio = inicio
+    while True:
+        try:
+            estado = next(geracoes)
+        except StopIteration as fim:
+            resumo = fim.value or {}
+            historico.estatisticas.update(resumo.get("estatisticas", {}))
+            return historico, time.perf_counter() - inicio
+        historico.append(estado.como_tupla())
+        agora = time.perf_counter()
+        if agora - ultimo_envio >= intervalo_progresso:
+            ultimo_envio = agora
+            if id_tarefa in cancelamentos:
+                geracoes.close()
+                return None
+            progresso.put((id_tarefa, "progresso", {
+                "geracao": estado.geracao, "valor": estado.valor, "peso": estado.peso,
+                "fitness": estado.fitness, "fitness_medio": estado.fitness_medio,
+            }))
+
+
+def resultado_json(historico: HistoricoAG) -> Dict[str, Any]:
+    """Resultado de uma tarefa em JSON: a melhor solução final e os trechos do histórico."""
+    if not historico:
+        return {"cromossomo": [], "valor": 0, "peso": 0, "fitness": 0, "geracoes": 0, "trechos": [],
+                "estatisticas": historico.estatisticas}
+    cromossomo, valor, peso, fitness = historico[-1]
+    return {
+        "cromossomo": cromossomo, "valor": valor, "peso": peso, "fitness": fitness, "geracoes": len(historico),
+        # Uma entrada [primeira_geracao, valor, peso, fitness] por melhoria da solução
+        "trechos": [[inicio, tupla[1], tupla[2], tupla[3]] for inicio, tupla in historico.trechos()],
+        "estatisticas": historico.estatisticas,
+    }
+
+
+class Tarefa:
+    """
+    Estado de uma tarefa no servidor. Os ouvintes de eventos esperam em `condicao`, que também
+    protege as mudanças de estado: um estado final nunca é trocado.
+    """
+
+    def __init__(self, id_tarefa: str, chave: Optional[str]):
+        self.id = id_tarefa
+        self.chave = chave
+        self.estado = "na_fila"
+        self.criada_em = time.perf_counter()
+        self.iniciada_em: Optional[float] = None
+        self.concluida_em: Optional[float] = None
+        self.progresso: Optional[Dict[str, Any]] = None
+        self.versao = 0  # Incrementada a cada mudança, para os ouvintes de eventos
+        self.resultado: Optional[Dict[str, Any]] = None
+        self.erro: Optional[str] = None
+        self.futuro: Optional[Future] = None
+        self.condicao = threading.Condition()
+
+    def como_json(self) -> Dict[str, Any]:
+        dados = {"id": self.id, "estado": self.estado, "progresso": self.progresso}
+        if self.resultado is not None:
+            dados["resultado"] = self.resultado
+        if self.erro is not None:
+            dados["erro"] = self.erro
+        return dados
+
+
+class ServicoMochila:
+    """
+    Fila de tarefas sobre um ProcessPoolExecutor com `num_processos` processos. Aceita no
+    máximo `tamanho_fila` tarefas esperando; guarda as `max_tarefas_guardadas` últimas
+    tarefas terminadas para consulta.
+    """
+
+    def __init__(self, num_processos: int = 2, tamanho_fila: int = 100, intervalo_progresso: float = 0.1,
+                 max_tarefas_guardadas: int = 1000, cache: Optional[CacheResultados] = None):
+        if num_processos <= 0 or tamanho_fila <= 0:
+            raise ValueError("O número de processos e o tamanho da fila devem ser positivos.")
+        self.tamanho_fila = tamanho_fila
+        self.intervalo_progresso = intervalo_progresso
+        self.max_tarefas_guardadas = max_tarefas_guardadas
+        self.cache = cache if cache is not None else CacheResultados()
+        self._gerenciador = multiprocessing.Manager()
+        self._progresso = self._gerenciador.Queue()
+        self._cancelamentos = self._gerenciador.dict()
+        # "spawn": o servidor tem várias threads, e fork com threads ativas não é seguro
+        self._pool = ProcessPoolExecutor(num_processos, mp_context=multiprocessing.get_context("spawn"))
+        self._trava = threading.Lock()
+        self._tarefas: "OrderedDict[str, Tarefa]" = OrderedDict()
+        self._em_andamento: Dict[str, Tarefa] = {}  # Chave -> tarefa na fila ou em execução
+        self._contador = itertools.count(1)
+        self._contagens = {"recebidas": 0, "rejeitadas": 0, "do_cache": 0, "mescladas": 0}
+        self._espera_fila: deque = deque(maxlen=TAMANHO_AMOSTRAS)
+        self._tempo_execucao: deque = deque(maxlen=TAMANHO_AMOSTRAS)
+        self._latencia_total: deque = deque(maxlen=TAMANHO_AMOSTRAS)
+        self._conclusoes: deque = deque(maxlen=TAMANHO_AMOSTRAS)  # Instantes de conclusão, para a vazão
+        self._inicio = time.perf_counter()
+        self._ouvinte = threading.Thread(target=self._ouvir_progresso, daemon=True)
+        self._ouvinte.start()
+
+    # --- Tarefas ---
+
+    def submeter(self, items_data: List[Tuple[str, int, int]], capacidade_maxima: int,
+                 parametros: Dict[str, Any]) -> Tarefa:
+        """
+        Cria uma tarefa; levanta OverflowError se a fila estiver cheia. Um pedido idêntico a uma
+        tarefa na fila ou em execução recebe essa tarefa, como CacheResultados.obter_ou_calcular:
+        cancelá-la a cancela para todos que a receberam.
+        """
+        desconhecidos = set(parametros) - set(PARAMETROS_SERVICO)
+        if desconhecidos:
+            raise ValueError(f"Parâmetros não aceitos pelo serviço: {', '.join(sorted(desconhecidos))}.")
+        chave = chave_execucao(items_data, capacidade_maxima, **parametros)
+        historico = self.cache.obter(chave) if chave is not None else None
+        with self._trava:
+            self._contagens["recebidas"] += 1
+            pendente = self._em_andamento.get(chave) if historico is None and chave is not None else None
+            if pendente is not None:
+                self._contagens["mescladas"] += 1
+                return pendente
+            if historico is None and self._contar("na_fila") >= self.tamanho_fila:
+                self._contagens["rejeitadas"] += 1
+                raise OverflowError("A fila de tarefas está cheia.")
+            if historico is not None:
+                self._contagens["do_cache"] += 1
+            tarefa = Tarefa(f"t{next(self._contador)}", chave)
+            self._tarefas[tarefa.id] = tarefa
+            if historico is None and chave is not None:
+                self._em_andamento[chave] = tarefa
+            self._descartar_antigas()
+
+        if historico is not None:
+            tarefa.iniciada_em = tarefa.criada_em
+            self._finalizar(tarefa, "concluida", resultado=resultado_json(historico))
+            return tarefa
+
+        tarefa.futuro = self._pool.submit(
+            _executar_tarefa, tarefa.id, items_data, capacidade_maxima, parametros,
+            self._progresso, self._cancelamentos, self.intervalo_progresso
+        )
+        tarefa.futuro.add_done_callback(lambda futuro: self._ao_terminar(tarefa, futuro))
+        return tarefa
+
+    def obter(self, id_tarefa: str) -> Optional[Tarefa]:
+        with self._trava:
+            return self._tarefas.get(id_tarefa)
+
+    def cancelar(self, id_tarefa: str) -> Optional[Tarefa]:
+        """Cancela a tarefa: na fila, ela nem chega a executar; em execução, para no próximo aviso de progresso."""
+        tarefa = self.obter(id_tarefa)
+        if tarefa is None or tarefa.estado in ESTADOS_FINAIS:
+            return tarefa
+        self._liberar_chave(tarefa)  # Pedidos idênticos a partir de agora executam de novo
+        if tarefa.futuro is not None and tarefa.futuro.cancel():
+            return tarefa  # _ao_terminar registra o cancelamento
+        self._cancelamentos[tarefa.id] = True
+        return tarefa
+
+    def _liberar_chave(self, tarefa: Tarefa) -> None:
+        with self._trava:
+            if tarefa.chave is not None and self._em_andamento.get(tarefa.chave) is tarefa:
+                del self._em_andamento[tarefa.chave]
+
+    def _contar(self, estado: str) -> int:
+        return sum(1 for tarefa in self._tarefas.values() if tarefa.estado == estado)
+
+    def _descartar_antigas(self) -> None:
+        terminadas = [id_tarefa for id_tarefa, tarefa in self._tarefas.items() if tarefa.estado in ESTADOS_FINAIS]
+        for id_tarefa in terminadas[:max(0, len(terminadas) - self.max_tarefas_guardadas)]:
+            del self._tarefas[id_tarefa]
+
+    def _notificar(self, tarefa: Tarefa) -> None:
+        with tarefa.condicao:
+            tarefa.versao += 1
+            tarefa.condicao.notify_all()
+
+    def _ouvir_progresso(self) -> None:
+        while True:
+            try:
+                id_tarefa, tipo, dados = self._progresso.get()
+            except (EOFError, OSError):
+                return  # Gerenciador encerrado
+            tarefa = self.obter(id_tarefa)
+            if tarefa is None:
+                continue
+            with tarefa.condicao:
+                # O futuro pode ter terminado antes de a mensagem ser lida: uma tarefa finalizada fica como está
+                if tarefa.estado in ESTADOS_FINAIS:
+                    continue
+                if tipo == "inicio":
+                    tarefa.iniciada_em = time.perf_counter()
+                    tarefa.estado = "executando"
+                else:
+                    tarefa.progresso = dados
+                self._notificar(tarefa)
+
+    def _ao_terminar(self, tarefa: Tarefa, futuro: Future) -> None:
+        try:
+            resultado = futuro.result()
+        except CancelledError:
+            self._finalizar(tarefa, "cancelada")
+        except Exception as erro:
+            self._finalizar(tarefa, "erro", erro=f"{type(erro).__name__}: {erro}")
+        else:
+            if resultado is None:
+                self._finalizar(tarefa, "cancelada")
+            else:
+                historico, duracao = resultado
+                if tarefa.chave is not None:
+                    self.cache.guardar(tarefa.chave, historico)
+                self._finalizar(tarefa, "concluida", resultado=resultado_json(historico), duracao=duracao)
+        self._cancelamentos.pop(tarefa.id, None)
+
+    def _finalizar(self, tarefa: Tarefa, estado: str, resultado: Optional[Dict[str, Any]] = None,
+                   erro: Optional[str] = None, duracao: Optional[float] = None) -> None:
+        """
+        Leva a tarefa ao estado final `estado`, se ela ainda não estiver em um. `duracao` é o
+        tempo de execução medido pelo processo do pool.
+        """
+        agora = time.perf_counter()
+        with tarefa.condicao:
+            if tarefa.estado in ESTADOS_FINAIS:
+                return
+            if duracao is not None:
+                # O aviso de "inicio" vem por outra fila e pode ainda não ter sido lido
+                tarefa.iniciada_em = max(tarefa.criada_em, agora - duracao)
+            elif tarefa.iniciada_em is None:
+                tarefa.iniciada_em = agora  # Não chegou a executar
+            tarefa.resultado = resultado
+            tarefa.erro = erro
+            tarefa.concluida_em = agora
+            tarefa.estado = estado
+            self._notificar(tarefa)
+        self._liberar_chave(tarefa)  # Depois de guardar no cache: pedidos idênticos passam a vir de lá
+        if estado == "concluida":
+            with self._trava:
+                self._espera_fila.append(tarefa.iniciada_em - tarefa.criada_em)
+                self._tempo_execucao.append(agora - tarefa.iniciada_em)
+                self._latencia_total.append(agora - tarefa.criada_em)
+                self._conclusoes.append(agora)
+
+    # --- Métricas ---
+
+    def metricas(self) -> Dict[str, Any]:
+        """Profundidade da fila, tarefas por estado, latências (segundos) e tarefas por segundo."""
+        with self._trava:
+            por_estado = {estado: self._contar(estado) for estado in ("na_fila", "executando") + ESTADOS_FINAIS}
+            agora = time.perf_counter()
+            ultimo_minuto = sum(1 for instante in self._conclusoes if agora - instante <= 60.0)
+            return {
+                "profundidade_fila": por_estado["na_fila"],
+                "tamanho_fila": self.tamanho_fila,
+                "tarefas": por_estado,
+                "contagens": dict(self._contagens),
+                "latencia_fila": _resumir(self._espera_fila),
+                "tempo_execucao": _resumir(self._tempo_execucao),
+                "latencia_total": _resumir(self._latencia_total),
+                "tarefas_por_segundo_ultimo_minuto": ultimo_minuto / min(60.0, max(agora - self._inicio, 1e-9)),
+                "cache": self.cache.estatisticas(),
+            }
+
+    def encerrar(self) -> None:
+        for tarefa in list(self._tarefas.values()):
+            self.cancelar(tarefa.id)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._gerenciador.shutdown()
+
+
+def _resumir(amostras: deque) -> Optional[Dict[str, float]]:
+    if not amostras:
+        return None
+    ordenadas = sorted(amostras)
+    return {
+        "media": statistics.fmean(ordenadas),
+        "p50": ordenadas[len(ordenadas) // 2],
+        "p95": ordenadas[min(len(ordenadas) - 1, int(0.95 * len(ordenadas)))],
+        "maximo": ordenadas[-1],
+        "amostras": len(ordenadas),
+    }
+
+
+# --- HTTP ---
+
+class ManipuladorServico(BaseHTTPRequestHandler):
+    """Rotas HTTP do serviço; `server.servico` é o ServicoMochila."""
+
+    def log_message(self, formato: str, *args: Any) -> None:
+        pass  # Sem uma linha no terminal por requisição
+
+    def _responder(self, status: int, dados: Any) -> None:
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _partes(self) -> List[str]:
+        return [parte for parte in self.path.split("?", 1)[0].split("/") if parte]
+
+    def do_POST(self) -> None:
+        if self._partes() != ["tarefas"]:
+            self._responder(404, {"erro": "Rota não encontrada."})
+            return
+        try:
+            pedido = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            items_data = [(str(nome), int(peso), int(valor)) for nome, peso, valor in pedido["itens"]]
+            tarefa = self.server.servico.submeter(items_data, int(pedido["capacidade"]), dict(pedido.get("parametros", {})))
+        except OverflowError as erro:
+            self._responder(503, {"erro": str(erro)})
+        except (ValueError, KeyError, TypeError) as erro:
+            self._responder(400, {"erro": f"Pedido inválido: {erro}"})
+        else:
+            self._responder(202, {"id": tarefa.id, "estado": tarefa.estado})
+
+    def do_GET(self) -> None:
+        partes = self._partes()
+        if partes == ["metricas"]:
+            self._responder(200, self.server.servico.metricas())
+            return
+        tarefa = self.server.servico.obter(partes[1]) if len(partes) >= 2 and partes[0] == "tarefas" else None
+        if tarefa is None:
+            self._responder(404, {"erro": "Tarefa ou rota não encontrada."})
+        elif len(partes) == 2:
+            self._responder(200, tarefa.como_json())
+        elif partes[2:] == ["eventos"]:
+            self._transmitir_eventos(tarefa)
+        else:
+            self._responder(404, {"erro": "Rota não encontrada."})
+
+    def do_DELETE(self) -> None:
+        partes = self._partes()
+        tarefa = self.server.servico.cancelar(partes[1]) if len(partes) == 2 and partes[0] == "tarefas" else None
+        if tarefa is None:
+            self._responder(404, {"erro": "Tarefa não encontrada."})
+        else:
+            self._responder(202, {"id": tarefa.id, "estado": tarefa.estado})
+
+    def _transmitir_eventos(self, tarefa: Tarefa) -> None:
+        """Server-sent events: o progresso mais recente a cada mudança e um evento "fim"."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        versao_enviada = -1
+        try:
+            while True:
+                with tarefa.condicao:
+                    tarefa.condicao.wait_for(lambda: tarefa.versao != versao_enviada, timeout=15.0)
+                    versao_enviada = tarefa.versao
+                if tarefa.estado in ESTADOS_FINAIS:
+                    self._enviar_evento("fim", tarefa.como_json())
+                    return
+                if tarefa.progresso is not None:
+                    self._enviar_evento("progresso", dict(tarefa.progresso, estado=tarefa.estado))
+                else:
+                    self.wfile.write(b": aguardando\n\n")  # Comentário SSE: mantém a conexão viva
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # O cliente desconectou
+
+    def _enviar_evento(self, tipo: str, dados: Any) -> None:
+        self.wfile.write(f"event: {tipo}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+def criar_servidor(servico: ServicoMochila, host: str = "127.0.0.1", porta: int = 8765) -> ThreadingHTTPServer:
+    """Servidor HTTP (uma thread por conexão) para o serviço; chame serve_forever() para atender."""
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorServico)
+    servidor.daemon_threads = True
+    servidor.servico = servico
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP local do algoritmo genético da mochila.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--processos", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--tamanho-fila", type=int, default=100)
+    parser.add_argument("--diretorio-cache", default=None)
+    args = parser.parse_args()
+
+    servico = ServicoMochila(args.processos, args.tamanho_fila, cache=CacheResultados(diretorio=args.diretorio_cache))
+    servidor = criar_servidor(servico, args.host, args.porta)
+    print(f"Serviço da mochila em http://{args.host}:{args.porta} com {args.processos} processos")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servico.encerrar()
@@ -0,0 +1,318 @@
+"""
+Varredura de parâmetros do algoritmo genético da mochila: em vez de testar os controles da
+interface um a um, avalia muitas combinações em paralelo e ordena o resultado.
+
+Os pontos da varredura (dicionários de parâmetros de algoritmo_genetico_mochila_geracoes) vêm
+de uma grade (pontos_grade) ou de um sorteio (sortear_pontos) sobre um espaço como:
+
+    espaco = {"tam_populacao": [50, 100, 200], "taxa_mutacao": (0.001, 0.1), "tam_torneio": (2, 8)}
+
+Cada ponto é executado com várias seeds. A eliminação é por successive halving: a cada rodada
+fica apenas 1/`reducao` dos melhores (pelo fitness médio), e o orçamento cresce `reducao` vezes.
+O orçamento é o mesmo para todos os pontos da rodada e é medido em avaliações (gerações ×
+tam_populacao), limitado às gerações de cada ponto: a eliminação compara os pontos pelo mesmo
+custo, e uma população pequena roda mais gerações que uma grande. Na última rodada o orçamento
+é o maior entre os pontos, então cada um roda as suas gerações completas.
+
+As execuções rodam em um ProcessPoolExecutor cujo inicializador carrega a instância uma única
+vez por processo: as tarefas levam só os parâmetros e a seed. Um catálogo (mochila_catalogo)
+é reaberto em cada processo a partir do diretório, com as colunas mapeadas em memória.
+
+    python mochila_varredura.py --num-items 200 --modo aleatorio --pontos 60 --processos 4
+"""
+import argparse
+import inspect
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mochila_benchmark import TIPOS_INSTANCIA, calcular_referencia, gerar_instancia
+from mochila_ga import algoritmo_genetico_mochila_geracoes
+
+_PARAMETROS_PADRAO = {
+    nome: parametro.default
+    for nome, parametro in inspect.signature(algoritmo_genetico_mochila_geracoes).parameters.items()
+    if nome not in ("items_data", "capacidade_maxima")
+}
+
+# Espaços usados pela linha de comando: valores da grade e faixas do sorteio
+GRADE_PADRAO = {
+    "tam_populacao": [50, 100, 200],
+    "num_geracoes": [100, 200],
+    "taxa_mutacao": [0.005, 0.02, 0.05],
+    "taxa_cruzamento": [0.7, 0.9],
+    "contagem_elitismo": [1, 3],
+    "tam_torneio": [2, 5],
+}
+FAIXAS_PADRAO = {
+    "tam_populacao": (20, 200),
+    "num_geracoes": (50, 300),
+    "taxa_mutacao": (0.001, 0.1),
+    "taxa_cruzamento": (0.5, 1.0),
+    "contagem_elitismo": (0, 5),
+    "tam_torneio": (2, 8),
+}
+
+
+def _validar_nomes(nomes) -> None:
+    desconhecidos = set(nomes) - set(_PARAMETROS_PADRAO)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos do algoritmo genético: {', '.join(sorted(desconhecidos))}.")
+    if "seed" in nomes:
+        raise ValueError("A seed é controlada pela varredura (parâmetro `seeds`).")
+
+
+def pontos_grade(espaco: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Todas as combinações dos valores de cada parâmetro (listas), na ordem do espaço."""
+    _validar_nomes(espaco)
+    for nome, valores in espaco.items():
+        if isinstance(valores, tuple):
+            raise ValueError(f"Na grade, '{nome}' deve ser uma lista de valores, não uma faixa.")
+    nomes = list(espaco)
+    return [dict(zip(nomes, combinacao)) for combinacao in itertools.product(*(espaco[nome] for nome in nomes))]
+
+
+def sortear_pontos(espaco: Dict[str, Any], num_pontos: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Sorteia `num_pontos` pontos. Uma lista é sorteada entre os seus valores; uma tupla
+    (minimo, maximo) é uma faixa: inteira se os dois forem int, senão contínua, e log-uniforme
+    quando for positiva e cobrir pelo menos uma ordem de grandeza (como as taxas de mutação).
+    """
+    _validar_nomes(espaco)
+    gerador = random.Random(seed)
+
+    def sortear(valores):
+        if not isinstance(valores, tuple):
+            return gerador.choice(list(valores))
+        minimo, maximo = valores
+        if isinstance(minimo, int) and isinstance(maximo, int):
+            return gerador.randint(minimo, maximo)
+        if minimo > 0 and maximo >= 10 * minimo:
+            return math.exp(gerador.uniform(math.log(minimo), math.log(maximo)))
+        return gerador.uniform(minimo, maximo)
+
+    return [{nome: sortear(valores) for nome, valores in espaco.items()} for _ in range(num_pontos)]
+
+
+# --- Processos ---
+
+_INSTANCIA: Optional[Tuple[Any, int]] = None  # (items_data, capacidade_maxima) deste processo
+
+
+def _carregar_instancia(items_data: Any, diretorio_catalogo: Optional[str], capacidade_maxima: int) -> None:
+    """Inicializador dos processos: guarda a instância (ou abre o catálogo) uma vez por processo."""
+    global _INSTANCIA
+    if diretorio_catalogo is not None:
+        from mochila_catalogo import CatalogoItens
+        items_data = CatalogoItens.abrir(diretorio_catalogo)
+    _INSTANCIA = (items_data, capacidade_maxima)
+
+
+def _executar(parametros: Dict[str, Any], seed: int, num_geracoes: int, alvo: float) -> Dict[str, Any]:
+    """Uma execução de um ponto com uma seed e `num_geracoes` gerações, na instância do processo."""
+    items_data, capacidade_maxima = _INSTANCIA
+    geracao_alvo = None
+    tempo_alvo = None
+    fitness_final = 0
+    num_executadas = 0
+    inicio = time.perf_counter()
+    for estado in algoritmo_genetico_mochila_geracoes(
+            items_data, capacidade_maxima, **dict(parametros, seed=seed, num_geracoes=num_geracoes)):
+        num_executadas += 1
+        fitness_final = estado.fitness
+        if geracao_alvo is None and fitness_final >= alvo:
+            geracao_alvo = estado.geracao
+            tempo_alvo = time.perf_counter() - inicio
+    tam_populacao = _parametro(parametros, "tam_populacao")
+    return {
+        "seed": seed,
+        "fitness_final": fitness_final,
+        "geracoes": num_executadas,
+        "tempo_total": time.perf_counter() - inicio,
+        "geracao_alvo": geracao_alvo,
+        "tempo_alvo": tempo_alvo,
+        "avaliacoes_alvo": (geracao_alvo + 1) * tam_populacao if geracao_alvo is not None else None,
+    }
+
+
+def _parametro(ponto: Dict[str, Any], nome: str) -> Any:
+    return ponto.get(nome, _PARAMETROS_PADRAO[nome])
+
+
+def _resumir(parametros: Dict[str, Any], rodada: int, num_geracoes: int, execucoes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    no_alvo = [execucao for execucao in execucoes if execucao["tempo_alvo"] is not None]
+    return {
+        "parametros": parametros,
+        "rodada": rodada,
+        "geracoes": num_geracoes,
+        "fitness_medio": statistics.fmean(execucao["fitness_final"] for execucao in execucoes),
+        "fitness_melhor": max(execucao["fitness_final"] for execucao in execucoes),
+        "taxa_sucesso": len(no_alvo) / len(execucoes),
+        # Médias só entre as execuções que atingiram o alvo
+        "tempo_ate_alvo": statistics.fmean(execucao["tempo_alvo"] for execucao in no_alvo) if no_alvo else None,
+        "avaliacoes_ate_alvo": statistics.fmean(execucao["avaliacoes_alvo"] for execucao in no_alvo) if no_alvo else None,
+        "execucoes": execucoes,
+    }
+
+
+def _ordem(resumo: Dict[str, Any]) -> Tuple:
+    tempo = resumo["tempo_ate_alvo"] if resumo["tempo_ate_alvo"] is not None else math.inf
+    return (-resumo["rodada"], -resumo["taxa_sucesso"], tempo, -resumo["fitness_medio"])
+
+
+def varrer(items_data: Any,
+           capacidade_maxima: int,
+           pontos: List[Dict[str, Any]],
+           seeds: Sequence[int] = (0, 1, 2),
+           alvo: Optional[float] = None,
+           tolerancia_alvo: float = 0.01,
+           reducao: int = 3,
+           num_rodadas: int = 3,
+           max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Executa os pontos com cada uma das `seeds` e retorna um resumo por ponto, do melhor para
+    o pior: primeiro os que chegaram mais longe no successive halving (`num_rodadas` rodadas,
+    mantendo 1/`reducao` dos pontos em cada uma, com o mesmo orçamento de avaliações para
+    todos os pontos da rodada), depois pela fração das seeds que atingiram o
+    alvo, pelo tempo médio até o alvo e pelo fitness final médio.
+
+    O alvo é um fitness absoluto; sem ele, é (1 - tolerancia_alvo) × a referência de
+    mochila_benchmark.calcular_referencia (ótimo exato ou limite fracionário). Com `max_workers`
+    maior que 1 as execuções rodam em um ProcessPoolExecutor; `items_data` também pode ser um
+    catálogo aberto de um diretório, que cada processo reabre com mapeamento em memória.
+    """
+    if not pontos:
+        raise ValueError("A varredura precisa de pelo menos um ponto.")
+    if not seeds:
+        raise ValueError("A varredura precisa de pelo menos uma seed.")
+    if reducao < 2 or num_rodadas < 1:
+        raise ValueError("A redução deve ser pelo menos 2 e o número de rodadas pelo menos 1.")
+    for ponto in pontos:
+        _validar_nomes(ponto)
+    if alvo is None:
+        alvo = (1 - tolerancia_alvo) * calcular_referencia(items_data, capacidade_maxima)[0]
+
+    caminho_nomes = getattr(items_data, "caminho_nomes", None)
+    diretorio_catalogo = os.path.dirname(caminho_nomes) if caminho_nomes is not None else None
+    argumentos_instancia = (None if diretorio_catalogo is not None else items_data, diretorio_catalogo, capacidade_maxima)
+
+    executor = None
+    if max_workers is not None and max_workers > 1:
+        executor = ProcessPoolExecutor(max_workers, initializer=_carregar_instancia, initargs=argumentos_instancia)
+    else:
+        _carregar_instancia(*argumentos_instancia)
+
+    # Orçamento completo: o maior número de avaliações (gerações × população) entre os pontos
+    orcamento_completo = max(_parametro(ponto, "num_geracoes") * _parametro(ponto, "tam_populacao") for ponto in pontos)
+    resumos: List[Dict[str, Any]] = []
+    vivos = list(pontos)
+    try:
+        for rodada in range(num_rodadas):
+            orcamento = orcamento_completo * reducao ** (rodada - num_rodadas + 1)  # Completo só na última rodada
+            geracoes = [
+                max(1, min(_parametro(ponto, "num_geracoes"), math.ceil(orcamento / _parametro(ponto, "tam_populacao"))))
+                for ponto in vivos
+            ]
+            tarefas = [(ponto, seed, num_geracoes) for ponto, num_geracoes in zip(vivos, geracoes) for seed in seeds]
+            if executor is not None:
+                execucoes = list(executor.map(_executar, *zip(*tarefas), itertools.repeat(alvo)))
+            else:
+                execucoes = [_executar(ponto, seed, num_geracoes, alvo) for ponto, seed, num_geracoes in tarefas]
+
+            rodada_atual = [
+                _resumir(ponto, rodada, num_geracoes, execucoes[i * len(seeds):(i + 1) * len(seeds)])
+                for i, (ponto, num_geracoes) in enumerate(zip(vivos, geracoes))
+            ]
+            if rodada == num_rodadas - 1:
+                resumos.extend(rodada_atual)
+                break
+            # Eliminação pelo fitness médio com o orçamento da rodada; empates pelo tempo até o alvo
+            rodada_atual.sort(key=lambda resumo: (-resumo["fitness_medio"], _ordem(resumo)[2]))
+            num_mantidos = max(1, math.ceil(len(rodada_atual) / reducao))
+            resumos.extend(rodada_atual[num_mantidos:])
+            vivos = [resumo["parametros"] for resumo in rodada_atual[:num_mantidos]]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    resumos.sort(key=_ordem)
+    return resumos
+
+
+def formatar_tabela(resumos: List[Dict[str, Any]], max_linhas: Optional[int] = 20) -> str:
+    """Tabela de texto com a classificação da varredura (os parâmetros que variam entre os pontos)."""
+    nomes = sorted({nome for resumo in resumos for nome in resumo["parametros"]})
+    nomes = [nome for nome in nomes if len({repr(resumo["parametros"].get(nome)) for resumo in resumos}) > 1] or nomes
+
+    def formatar(valor, formato: str = ".4g") -> str:
+        if valor is None:
+            return "-"
+        return format(valor, formato) if isinstance(valor, float) else str(valor)
+
+    cabecalho = ["#", "rodada", "geracoes", "sucesso", "tempo_alvo(s)", "aval_alvo", "fitness_medio", "fitness_melhor"] + nomes
+    linhas = [cabecalho]
+    for posicao, resumo in enumerate(resumos[:max_linhas] if max_linhas is not None else resumos, start=1):
+        linhas.append([
+            str(posicao), str(resumo["rodada"] + 1), str(resumo["geracoes"]), f"{resumo['taxa_sucesso']:.0%}",
+            formatar(resumo["tempo_ate_alvo"], ".3f"), formatar(resumo["avaliacoes_ate_alvo"], ".0f"),
+            formatar(resumo["fitness_medio"], ".1f"), str(resumo["fitness_melhor"]),
+        ] + [formatar(resumo["parametros"].get(nome)) for nome in nomes])
+    larguras = [max(len(linha[i]) for linha in linhas) for i in range(len(cabecalho))]
+    return "\n".join("  ".join(celula.rjust(largura) for celula, largura in zip(linha, larguras)) for linha in linhas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros do algoritmo genético da mochila.")
+    parser.add_argument("--tipo", choices=TIPOS_INSTANCIA, default="fracamente_correlacionada")
+    parser.add_argument("--num-items", type=int, default=100)
+    parser.add_argument("--catalogo", default=None, help="CSV de itens (convertido com mochila_catalogo) em vez da instância gerada.")
+    parser.add_argument("--capacidade", type=int, default=None, help="Obrigatória com --catalogo.")
+    parser.add_argument("--modo", choices=("grade", "aleatorio"), default="grade")
+    parser.add_argument("--espaco", default=None,
+                        help='JSON do espaço; no modo aleatório, {"min": a, "max": b} é uma faixa.')
+    parser.add_argument("--pontos", type=int, default=40, help="Pontos sorteados no modo aleatório.")
+    parser.add_argument("--seeds", type=int, default=3, help="Execuções (seeds 0..n-1) por ponto.")
+    parser.add_argument("--tolerancia-alvo", type=float, default=0.01)
+    parser.add_argument("--reducao", type=int, default=3)
+    parser.add_argument("--rodadas", type=int, default=3)
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="Seed da instância gerada e do sorteio dos pontos.")
+    parser.add_argument("--saida", default=None, help="Grava os resumos completos neste arquivo JSON.")
+    args = parser.parse_args()
+
+    if args.catalogo is not None:
+        from mochila_catalogo import carregar_catalogo
+        if args.capacidade is None:
+            parser.error("--capacidade é obrigatória com --catalogo.")
+        items_data, capacidade = carregar_catalogo(args.catalogo), args.capacidade
+    else:
+        items_data, capacidade = gerar_instancia(args.tipo, args.num_items, seed=args.seed)
+        if args.capacidade is not None:
+            capacidade = args.capacidade
+
+    if args.espaco is not None:
+        espaco = {
+            nome: (valores["min"], valores["max"]) if isinstance(valores, dict) else valores
+            for nome, valores in json.loads(args.espaco).items()
+        }
+    else:
+        espaco = GRADE_PADRAO if args.modo == "grade" else FAIXAS_PADRAO
+    pontos = pontos_grade(espaco) if args.modo == "grade" else sortear_pontos(espaco, args.pontos, args.seed)
+
+    print(f"{len(pontos)} pontos × {args.seeds} seeds, {args.rodadas} rodadas com redução {args.reducao}, "
+          f"{args.processos} processos")
+    inicio = time.perf_counter()
+    resumos = varrer(items_data, capacidade, pontos, seeds=range(args.seeds), tolerancia_alvo=args.tolerancia_alvo,
+                     reducao=args.reducao, num_rodadas=args.rodadas, max_workers=args.processos)
+    print(f"Varredura concluída em {time.perf_counter() - inicio:.1f} s\n")
+    print(formatar_tabela(resumos))
+    if args.saida is not None:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resumos, arquivo, indent=2, ensure_ascii=False)
+        print(f"\nResumos gravados em {args.saida}")
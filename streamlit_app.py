@@ -1,8 +1,11 @@
 import streamlit as st
+import os
 import time
 import random
 # Importa as funções e classes do seu backend
-from mochila_ga import Item, algoritmo_genetico_mochila_iterativo, calcular_detalhes_individuo
+from mochila_ga import HistoricoAG, Item, calcular_detalhes_individuo
+from mochila_cache_resultados import CacheResultados
+from mochila_execucao import ExecucaoEmSegundoPlano
 
 st.set_page_config(layout="wide", page_title="Problema da Mochila Animado")
 
@@ -105,9 +108,13 @@ st.markdown("""
         top: 0px; /* Mantém na posição inicial para iniciar a transição */
     }
     .falling-emoji.fall {
+        /* Animada pelo próprio navegador ao ser desenhada, sem pausas no script */
+        animation: cair-na-mochila 0.6s ease-in forwards;
+    }
+    @keyframes cair-na-mochila {
         /* Posição final: o fundo do .animated-knapsack-area menos a altura da mochila */
-        top: 220px; /* Cai dentro da mochila */
-        opacity: 0; /* Desaparece ao "entrar" */
+        from { top: 0px; opacity: 1; }
+        to { top: 220px; opacity: 0; } /* Cai dentro da mochila e desaparece ao "entrar" */
     }
 
     /* Estilo para os itens dentro da mochila (caixas laranjas) */
@@ -237,8 +244,18 @@ taxa_cruzamento = st.sidebar.slider("Taxa de Cruzamento:", 0.0, 1.0, 0.9, 0.05)
 taxa_mutacao = st.sidebar.slider("Taxa de Mutação:", 0.0, 0.1, 0.03, 0.005)
 contagem_elitismo = st.sidebar.slider("Elitismo (Melhores Indivíduos Preservados):", 0, 10, 3)
 tam_torneio = st.sidebar.slider("Tamanho do Torneio (Seleção):", 2, 10, 5)
+taxas_adaptativas = st.sidebar.checkbox(
+    "Taxas Adaptativas", value=False,
+    help="A taxa de mutação acima vira só o valor inicial e é ajustada a cada geração; o tipo de "
+         "cruzamento (ponto único, dois pontos ou uniforme) é escolhido pelo sucesso recente de cada um."
+)
+busca_local_movimentos = st.sidebar.slider(
+    "Busca Local nos Elites (movimentos):", 0, 20, 0,
+    help="AG memético: a cada geração os elites são melhorados por até este número de movimentos "
+         "de adicionar ou trocar itens. 0 desativa."
+)
 seed_val = st.sidebar.number_input("Seed (para reprodutibilidade):", value=42)
-animation_speed = st.sidebar.slider("Velocidade da Animação (segundos/geração):", 0.05, 2.0, 0.2, 0.05)
+quadros_por_segundo = st.sidebar.slider("Atualizações da Tela por Segundo:", 1, 30, 10)
 
 st.sidebar.markdown("---")
 st.sidebar.info("Ajuste os parâmetros e clique em 'Iniciar Simulação' para ver a mágica acontecer!")
@@ -267,6 +284,28 @@ with col_graficos:
 
 # --- Botão de Iniciar Simulação ---
 st.markdown("---")
+
+
+def html_item_mochila(item: Item) -> str:
+    return (f'<div class="knapsack-item visible" title="{item.name} (P:{item.weight}, V:${item.value})">'
+            f'{item.name}<br>({item.weight}kg, ${item.value})</div>')
+
+
+def html_mochila(itens_na_mochila, itens_novos) -> str:
+    """Mochila inteira em um único bloco HTML, com os emojis dos itens que acabaram de entrar."""
+    emojis = "".join(
+        f'<div class="falling-emoji fall">{ITEM_EMOJIS.get(item.name, "❓")}</div>' for item in itens_novos
+    )
+    return (f'<div class="animated-knapsack-area">{emojis}<div class="knapsack-base" id="mochila-base">'
+            f'{"".join(html_item_mochila(item) for item in itens_na_mochila)}</div></div>')
+
+
+@st.cache_resource
+def obter_cache_resultados() -> CacheResultados:
+    """Um único cache por servidor, compartilhado por todas as sessões."""
+    return CacheResultados(tamanho_maximo=64, diretorio=os.environ.get("MOCHILA_DIRETORIO_CACHE"))
+
+
 if st.button("🚀 Iniciar Simulação"):
     if not items_data:
         st.error("Por favor, selecione ou adicione pelo menos um item antes de iniciar a simulação.")
@@ -274,176 +313,115 @@ if st.button("🚀 Iniciar Simulação"):
 
     st.balloons()
 
-    st.write("Iniciando o Algoritmo Genético...")
-
-    historico_fitness_geral_para_grafico = []
-
-    historico_solucoes = algoritmo_genetico_mochila_iterativo(
-        items_data=items_data,
-        capacidade_maxima=capacidade_mochila,
+    parametros_ag = dict(
         tam_populacao=tam_populacao,
         num_geracoes=num_geracoes,
         taxa_mutacao=taxa_mutacao,
         taxa_cruzamento=taxa_cruzamento,
         contagem_elitismo=contagem_elitismo,
         tam_torneio=tam_torneio,
-        seed=seed_val
+        seed=seed_val,
+        taxas_adaptativas=taxas_adaptativas,
+        busca_local_movimentos=busca_local_movimentos
     )
-
     items_obj_list = [Item(name, weight, value) for name, weight, value in items_data]
 
-    last_best_solucao = None
+    # Um placeholder por item: só os cartões dos itens que entraram ou saíram são redesenhados
+    with item_details_placeholder.container():
+        st.subheader("Itens Selecionados na Melhor Solução:")
+        aviso_sem_itens = st.empty()
+        cartoes_itens = [st.empty() for _ in items_obj_list]
+    exibicao = {"itens": set(), "desenhada": False}
 
-    for geracao_idx, (solucao, valor, peso, fitness) in enumerate(historico_solucoes):
-        # Atualiza a barra de progresso
+    def exibir_geracao(geracao_idx, tupla) -> None:
+        """Atualiza o painel com a melhor solução até a geração `geracao_idx`."""
+        solucao, valor, peso, fitness = tupla
         progress_bar_placeholder.progress((geracao_idx + 1) / num_geracoes)
-
         generation_info.markdown(f"<p class='progress-info'>Geração: <strong>{geracao_idx + 1}/{num_geracoes}</strong></p>", unsafe_allow_html=True)
         best_value_info.markdown(f"<p class='progress-info'>Valor Atual: <strong>${valor}</strong></p>", unsafe_allow_html=True)
         current_weight_info.markdown(f"<p class='progress-info'>Peso Atual: <strong>{peso}/{capacidade_mochila} kg</strong></p>", unsafe_allow_html=True)
-        best_overall_info.markdown(f"<p class='progress-info'>Melhor Valor Geral: <strong>${historico_solucoes[geracao_idx][3]}</strong></p>", unsafe_allow_html=True)
-
-        items_to_animate_this_generation = []
-        if last_best_solucao is not None and solucao is not None:
-            current_items_in_sol = set([i for i, gene in enumerate(solucao) if gene == 1])
-            prev_items_in_sol = set([i for i, gene in enumerate(last_best_solucao) if gene == 1])
-
-            newly_added_indices = current_items_in_sol - prev_items_in_sol
-            
-            for idx in newly_added_indices:
-                if idx < len(items_obj_list):
-                    items_to_animate_this_generation.append(items_obj_list[idx])
-        
-        last_best_solucao = solucao # Atualiza para a próxima iteração
-
-        # --- Visualização da Mochila com Animação de Queda dos Emojis (Um de Cada Vez) ---
-        # A mochila e os itens internos serão atualizados *dentro* deste loop
-        
-        # O estado atual dos itens na mochila ANTES de qualquer nova animação de queda
-        current_items_in_knapsack_display = []
-        if solucao:
-            for i, gene in enumerate(solucao):
-                if i < len(items_obj_list) and gene == 1 and items_obj_list[i] not in items_to_animate_this_generation:
-                    current_items_in_knapsack_display.append(items_obj_list[i])
-
-        # Anima a queda de cada novo item sequencialmente
-        if items_to_animate_this_generation:
-            for item_animar in items_to_animate_this_generation:
-                emoji = ITEM_EMOJIS.get(item_animar.name, "❓")
-                
-                # Renderiza a mochila e a alça e os itens JÁ EXISTENTES + o emoji caindo
-                with mochila_display_placeholder.container():
-                    st.markdown('<div class="animated-knapsack-area">', unsafe_allow_html=True)
-                    st.markdown('<div class="knapsack-base" id="mochila-base">', unsafe_allow_html=True)
-                    
-                    # Renderiza os itens que JÁ ESTAVAM na mochila (para que o emoji caia por cima)
-                    for item_existente in current_items_in_knapsack_display:
-                        st.markdown(
-                            f"""
-                            <div class="knapsack-item visible" title="{item_existente.name} (P:{item_existente.weight}, V:${item_existente.value})">
-                                {item_existente.name}<br>({item_existente.weight}kg, ${item_existente.value})
-                            </div>
-                            """, unsafe_allow_html=True
-                        )
-                    
-                    # O emoji caindo por cima da mochila atual
-                    st.markdown(
-                        f"""
-                        <div class="falling-emoji active">
-                            {emoji}
-                        </div>
-                        """, unsafe_allow_html=True
-                    )
-                    st.markdown('</div></div>', unsafe_allow_html=True) # Fecha knapsack-base e animated-knapsack-area
-                
-                # Pequeno delay para garantir que o Streamlit renderize o emoji antes da queda
-                time.sleep(0.05) 
-                
-                # Inicia a animação de queda via JavaScript para ESTE emoji
-                # Não haverá time.sleep aqui para não bloquear a geração.
-                st.markdown(
-                    "<script>"
-                    "var emojiEl = document.querySelector('.falling-emoji.active');"
-                    "if (emojiEl) { emojiEl.classList.remove('active'); emojiEl.classList.add('fall'); }"
-                    "</script>", unsafe_allow_html=True
-                )
-                
-                # Adiciona uma pequena pausa para que o olho humano perceba a transição
-                # Mas não tão longa a ponto de afetar a velocidade da geração significativamente
-                time.sleep(0.2) # Ajuste este valor (ex: 0.1s a 0.5s) para o "flash" da queda
-
-            # Após todas as animações de "queda" (flash) para esta geração,
-            # redesenha a mochila com todos os itens, incluindo os que acabaram de "cair".
-            # Isso garante que as caixas laranjas apareçam sincronizadas.
-            with mochila_display_placeholder.container():
-                st.markdown('<div class="animated-knapsack-area">', unsafe_allow_html=True)
-                st.markdown('<div class="knapsack-base" id="mochila-base">', unsafe_allow_html=True)
-                
-                itens_selecionados_final_render = []
-                if solucao:
-                    for i, gene in enumerate(solucao):
-                        if i < len(items_obj_list) and gene == 1:
-                            item = items_obj_list[i]
-                            st.markdown(
-                                f"""
-                                <div class="knapsack-item visible" title="{item.name} (P:{item.weight}, V:${item.value})">
-                                    {item.name}<br>({item.weight}kg, ${item.value})
-                                </div>
-                                """, unsafe_allow_html=True
-                            )
-                            itens_selecionados_final_render.append(item)
-                st.markdown('</div></div>', unsafe_allow_html=True)
+        best_overall_info.markdown(f"<p class='progress-info'>Melhor Valor Geral: <strong>${fitness}</strong></p>", unsafe_allow_html=True)
+
+        # Só redesenha a mochila e os cartões quando a melhor solução muda
+        itens_exibidos = exibicao["itens"]
+        itens_atuais = {i for i, gene in enumerate(solucao) if gene == 1}
+        if itens_atuais == itens_exibidos and exibicao["desenhada"]:
+            return
+        itens_novos = itens_atuais - itens_exibidos if exibicao["desenhada"] else set()
+        mochila_display_placeholder.markdown(html_mochila(
+            [items_obj_list[i] for i in sorted(itens_atuais)], [items_obj_list[i] for i in sorted(itens_novos)]
+        ), unsafe_allow_html=True)
+        for i in itens_exibidos - itens_atuais:
+            cartoes_itens[i].empty()
+        for i in itens_atuais - itens_exibidos:
+            item = items_obj_list[i]
+            cartoes_itens[i].markdown(f"""
+                <div class="item-card">
+                    <h5>{item.name}</h5>
+                    <p>Peso: {item.weight} kg | Valor: ${item.value}</p>
+                </div>
+            """, unsafe_allow_html=True)
+        if itens_atuais:
+            aviso_sem_itens.empty()
         else:
-            # Se não houve itens para animar, apenas redesenha a mochila normalmente
-            with mochila_display_placeholder.container():
-                st.markdown('<div class="animated-knapsack-area">', unsafe_allow_html=True)
-                st.markdown('<div class="knapsack-base" id="mochila-base">', unsafe_allow_html=True)
-                
-                itens_selecionados_final_render = []
-                if solucao:
-                    for i, gene in enumerate(solucao):
-                        if i < len(items_obj_list) and gene == 1:
-                            item = items_obj_list[i]
-                            st.markdown(
-                                f"""
-                                <div class="knapsack-item visible" title="{item.name} (P:{item.weight}, V:${item.value})">
-                                    {item.name}<br>({item.weight}kg, ${item.value})
-                                </div>
-                                """, unsafe_allow_html=True
-                            )
-                            itens_selecionados_final_render.append(item)
-                st.markdown('</div></div>', unsafe_allow_html=True)
-
-
-        # Detalhes dos itens na mochila (fora da área animada)
-        with item_details_placeholder.container():
-            st.subheader("Itens Selecionados na Melhor Solução:")
-            if itens_selecionados_final_render:
-                for item in itens_selecionados_final_render:
-                    st.markdown(f"""
-                        <div class="item-card">
-                            <h5>{item.name}</h5>
-                            <p>Peso: {item.weight} kg | Valor: ${item.value}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-            else:
-                st.info("Nenhum item válido selecionado ainda nesta solução.")
-
-
-        # Atualizar gráfico de evolução do fitness
-        historico_fitness_geral_para_grafico.append(historico_solucoes[geracao_idx][3])
-        chart_data_placeholder.line_chart(historico_fitness_geral_para_grafico)
-
-
-        time.sleep(animation_speed) # Controla a velocidade da animação da GERAÇÃO
+            aviso_sem_itens.info("Nenhum item válido selecionado ainda nesta solução.")
+        exibicao["itens"] = itens_atuais
+        exibicao["desenhada"] = True
+
+    def executar_com_progresso() -> HistoricoAG:
+        """Executa o AG mostrando o progresso; chamada pelo cache quando não há resultado guardado."""
+        st.write("Iniciando o Algoritmo Genético...")
+        historico = HistoricoAG()
+
+        # O AG roda em segundo plano; a tela é atualizada a uma taxa fixa, juntando as gerações
+        # calculadas desde o último quadro, e nunca atrasa a busca
+        execucao = ExecucaoEmSegundoPlano(items_data, capacidade_mochila, **parametros_ag).iniciar()
+        historico_fitness_geral_para_grafico = []
+        intervalo_quadro = 1.0 / quadros_por_segundo
+        proximo_quadro = time.perf_counter()
+        try:
+            while not execucao.terminada:
+                proximo_quadro += intervalo_quadro
+                time.sleep(max(0.0, proximo_quadro - time.perf_counter()))
+                estados = execucao.coletar()
+                if not estados:
+                    continue
+                historico.extend(estado.como_tupla() for estado in estados)
+                historico_fitness_geral_para_grafico.extend(estado.fitness for estado in estados)
+                exibir_geracao(estados[-1].geracao, estados[-1].como_tupla())
+                chart_data_placeholder.line_chart(historico_fitness_geral_para_grafico)
+        finally:
+            # Um novo clique ou a interrupção do script não deixam o AG rodando à toa
+            execucao.cancelar()
+
+        if execucao.erro is not None:
+            st.error(f"Erro durante a execução do algoritmo genético: {execucao.erro}")
+            st.stop()  # Levanta uma exceção: o resultado incompleto não vai para o cache
+        historico.estatisticas.update(execucao.resumo.get("estatisticas", {}))
+        return historico
+
+    # Sessões que pedem a mesma execução ao mesmo tempo esperam a primeira em vez de repetir a busca
+    aviso_espera = st.empty()
+    historico, veio_do_cache = obter_cache_resultados().obter_ou_calcular(
+        items_data, capacidade_mochila, calcular=executar_com_progresso,
+        ao_aguardar=lambda: aviso_espera.info("Aguardando uma execução idêntica que está em andamento em outra sessão..."),
+        **parametros_ag
+    )
+    aviso_espera.empty()
+    if veio_do_cache:
+        # Mesma instância e mesmos parâmetros de uma execução anterior (desta ou de outra sessão)
+        st.info("Resultado reaproveitado de uma execução idêntica anterior.")
+        if historico:
+            exibir_geracao(len(historico) - 1, historico[-1])
+            chart_data_placeholder.line_chart([fitness for _, _, _, fitness in historico])
 
     st.success("Simulação Completa! 🎉")
     st.snow()
 
     st.markdown("---")
     st.subheader("✅ Melhor Solução Final Encontrada:")
-    if historico_solucoes:
-        final_solucao, final_valor, final_peso, final_fitness = historico_solucoes[-1]
+    if historico:
+        final_solucao, final_valor, final_peso, final_fitness = historico[-1]
         if final_solucao:
             final_itens_selecionados_obj = [items_obj_list[i] for i, gene in enumerate(final_solucao) if gene == 1 and i < len(items_obj_list)]
             final_itens_selecionados_nomes = [item.name for item in final_itens_selecionados_obj]
@@ -456,4 +434,12 @@ if st.button("🚀 Iniciar Simulação"):
         else:
             st.warning("Nenhuma solução válida foi encontrada.")
     else:
-        st.warning("Não foi possível encontrar uma solução.")
\ No newline at end of file
+        st.warning("Não foi possível encontrar uma solução.")
+
+    if "taxas_adaptativas" in historico.estatisticas:
+        registro = historico.estatisticas["taxas_adaptativas"]["registro"]
+        st.subheader("🎛️ Taxas Adaptativas por Geração")
+        st.write("**Taxa de Mutação:**")
+        st.line_chart(registro["taxa_mutacao"])
+        st.write("**Probabilidade de cada Cruzamento:**")
+        st.line_chart(registro["probabilidades"])